@@ -1,10 +1,85 @@
-def run_simulations(game, n=1000):
-    """Corre N simulaciones para cualquier juego que implemente BaseGame."""
-    all_draws = [game.draw() for _ in range(n)]
+import time
+import numpy as np
+from multiprocessing import Pool
+from tombola.base_game import indices_aleatorios
+
+# Sorteos generados por lote: acota la memoria (~lote × rango × 16 bytes)
+BATCH_SIZE = 100_000
+
+
+def _count_frequencies(rng, n, range_size, picks, batch_size):
+    """Cuenta las apariciones (por índice del rango) en n sorteos generados con rng."""
+    counts = np.zeros(range_size, dtype=np.int64)
+    remaining = n
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        idx = indices_aleatorios(rng, batch, range_size, picks)
+        counts += np.bincount(idx.ravel(), minlength=range_size)
+        remaining -= batch
+    return counts
+
+
+def _simulate_stream(args):
+    """Tarea de un worker: su propio generador derivado de un SeedSequence hijo."""
+    seed_seq, n, range_size, picks, batch_size = args
+    return _count_frequencies(np.random.default_rng(seed_seq), n, range_size, picks, batch_size)
+
+
+def _split(n, parts):
+    """Reparte n sorteos en `parts` cantidades deterministas (las primeras reciben el resto)."""
+    base, extra = divmod(n, parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
 
-    freq = {}
-    for draw in all_draws:
-        for num in draw:
-            freq[num] = freq.get(num, 0) + 1
 
-    return freq
+def simulate_frequencies(game, n, batch_size=BATCH_SIZE, rng=None, seed=None, workers=1):
+    """
+    Simula n sorteos vectorizados y cuenta las apariciones de cada número con bincount.
+
+    Con seed o workers > 1 la simulación usa un stream independiente por worker,
+    derivado con SeedSequence(seed).spawn(workers), y suma los histogramas parciales.
+    Para un mismo (seed, workers) el resultado es idéntico bit a bit.
+
+    Devuelve un dict con:
+    - frecuencias: {numero: apariciones}
+    - n, seed, workers, segundos y sorteos_por_segundo (throughput)
+    """
+    if workers < 1:
+        raise ValueError("workers debe ser al menos 1")
+    if batch_size < 1:
+        raise ValueError("batch_size debe ser al menos 1")
+    if n < 0:
+        raise ValueError("La cantidad de sorteos no puede ser negativa")
+    values = np.asarray(game.num_range())
+    picks = game.picks()
+
+    start = time.perf_counter()
+    if seed is None and workers <= 1:
+        rng = rng if rng is not None else np.random.default_rng()
+        counts = _count_frequencies(rng, n, len(values), picks, batch_size)
+    else:
+        streams = np.random.SeedSequence(seed).spawn(workers)
+        tasks = [
+            (stream, part, len(values), picks, batch_size)
+            for stream, part in zip(streams, _split(n, workers))
+        ]
+        if workers > 1:
+            with Pool(workers) as pool:
+                partials = pool.map(_simulate_stream, tasks)
+        else:
+            partials = [_simulate_stream(task) for task in tasks]
+        counts = np.sum(partials, axis=0)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'frecuencias': {int(v): int(c) for v, c in zip(values, counts)},
+        'n': n,
+        'seed': seed,
+        'workers': workers,
+        'segundos': elapsed,
+        'sorteos_por_segundo': n / elapsed if elapsed > 0 else float('inf')
+    }
+
+
+def run_simulations(game, n=1000):
+    """Corre N simulaciones para cualquier juego que implemente BaseGame."""
+    return simulate_frequencies(game, n)['frecuencias']
@@ -1,9 +1,10 @@
 # app.py - Flask Web Application for Tombola Analytics
-from flask import Flask, render_template, jsonify, request, send_from_directory, send_file
+from flask import Flask, render_template, jsonify, request, send_from_directory, send_file, Response
 from flask_cors import CORS
 import os
 import json
 from datetime import datetime
+import numpy as np
 
 # Import existing modules
 from tombola.telekino import procesar_estadisticas as telekino_stats
@@ -16,6 +17,7 @@ from auth import require_api_key
 
 app = Flask(__name__)
 CORS(app)
+app.config['MAX_CONTENT_LENGTH'] = config.MAX_UPLOAD_MB * 1024 * 1024
 
 # Configuration
 VISUALIZACIONES_DIR = config.VISUALIZACIONES_DIR
@@ -46,12 +48,16 @@ def api_telekino_stats():
     Get Telekino statistics.
     Query params:
         - fecha: YYYY-MM-DD (optional) - filter stats up to this date
+        - ventana: N (optional) - only the last N draws before that date
     """
     try:
         fecha_limite = request.args.get('fecha', None)
+        ventana = request.args.get('ventana', None, type=int)
+        if ventana is not None and ventana < 1:
+            return jsonify({'success': False, 'error': 'La ventana debe ser de al menos 1 sorteo'}), 400
         
         # Try to load from cache
-        cached = load_cached_stats('telekino', fecha_limite)
+        cached = load_cached_stats('telekino', fecha_limite, ventana)
         if cached:
             return jsonify({
                 'success': True,
@@ -59,23 +65,23 @@ def api_telekino_stats():
                 'data': cached['stats']
             })
         
-        # Calculate stats (this will also cache them)
-        # We need to capture the output, so we'll call the functions directly
-        from tombola.telekino import load_data, calcular_frecuencias, calcular_omision, calcular_coocurrencia, calcular_demora_maxima
+        # Sliding-window stats (cached per window size)
+        if ventana is not None:
+            from tombola.ventana_stats import estadisticas_ventana
+            from tombola.stats_cache import save_stats_to_cache
+            stats_data = estadisticas_ventana('telekino', ventana, fecha_limite)
+            save_stats_to_cache('telekino', fecha_limite, stats_data, ventana)
+            return jsonify({
+                'success': True,
+                'cached': False,
+                'data': stats_data
+            })
+        
+        # Calculate stats
+        from tombola.telekino import load_data, calcular_estadisticas
         
         sorteos, numeros_por_sorteo = load_data(fecha_limite)
-        frec = calcular_frecuencias(numeros_por_sorteo)
-        omision = calcular_omision(sorteos, numeros_por_sorteo)
-        cooc = calcular_coocurrencia(numeros_por_sorteo)
-        demora_max = calcular_demora_maxima(sorteos, numeros_por_sorteo)
-        
-        stats_data = {
-            'sorteos_count': len(sorteos),
-            'frecuencias': dict(frec.most_common()),
-            'omision': omision,
-            'coocurrencia': {f"{a}-{b}": v for (a, b), v in cooc.most_common()},
-            'demora_maxima': demora_max
-        }
+        stats_data = calcular_estadisticas(sorteos, numeros_por_sorteo)
         
         # Save to cache
         from tombola.stats_cache import save_stats_to_cache
@@ -228,7 +234,12 @@ def api_telekino_excluded_dates():
 
 @app.route('/api/telekino/check-combination', methods=['POST'])
 def api_telekino_check_combination():
-    """Check if a Telekino combination has appeared in history."""
+    """
+    Check if a Telekino combination has appeared in history.
+    JSON body:
+        - numeros: the 15 numbers
+        - top: N (optional, default 10) - also return the N most similar historical draws
+    """
     try:
         data = request.get_json()
         numeros = data.get('numeros')
@@ -236,26 +247,26 @@ def api_telekino_check_combination():
         if not numeros or not isinstance(numeros, list) or len(numeros) != 15:
             return jsonify({'success': False, 'error': 'Se requieren exactamente 15 números'}), 400
         
-        # Normalize input
-        target_tuple = tuple(sorted([int(n) for n in numeros]))
-        
-        # Load data
-        from tombola.telekino import load_data
-        sorteos, numeros_por_sorteo = load_data(fecha_limite=None)
-        
-        occurrences = []
-        for i, row in enumerate(sorteos):
-            nums = tuple(sorted(numeros_por_sorteo[i]))
-            if nums == target_tuple:
-                occurrences.append({
-                    "fecha": row['fecha'],
-                    "sorteo": row['sorteo']
-                })
+        # Exact matches and nearest draws from the in-memory bitmask index
+        from tombola.consultas import sorteos_cercanos, indice_sorteos
+        try:
+            exactos, cercanos = sorteos_cercanos('telekino', [int(n) for n in numeros], int(data.get('top', 10)))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        indice = indice_sorteos('telekino')
+        occurrences = [
+            {"fecha": str(indice['fecha'][fila]), "sorteo": str(indice['sorteo'][fila])}
+            for fila, _ in exactos
+        ]
+        for cercano in cercanos:
+            del cercano['modalidad']
         
         return jsonify({
             'success': True,
             'found': len(occurrences) > 0,
-            'occurrences': occurrences
+            'occurrences': occurrences,
+            'nearest': cercanos
         })
         
     except Exception as e:
@@ -383,46 +394,55 @@ def api_quini6_stats():
     Get Quini 6 statistics.
     Query params:
         - fecha: YYYY-MM-DD (optional) - filter stats up to this date
+        - ventana: N (optional) - only the last N draws before that date
+        - modalidad: tradicional|segunda|revancha|siempre_sale (optional) - stats of a
+          single modality, read from the per-modality slices of the full payload
     """
     try:
+        from tombola.quini6_modalidades import filtrar_modalidad, MODALIDADES
+        
         fecha_limite = request.args.get('fecha', None)
+        ventana = request.args.get('ventana', None, type=int)
+        if ventana is not None and ventana < 1:
+            return jsonify({'success': False, 'error': 'La ventana debe ser de al menos 1 sorteo'}), 400
+        modalidad = request.args.get('modalidad', None)
+        if modalidad and modalidad not in MODALIDADES:
+            return jsonify({
+                'success': False,
+                'error': f"Modalidad '{modalidad}' no válida. Disponibles: {', '.join(MODALIDADES)}"
+            }), 400
         
-        # Try to load from cache
-        cached = load_cached_stats('quini6', fecha_limite)
-        if cached:
+        def respuesta(stats_data, cached):
             return jsonify({
                 'success': True,
-                'cached': True,
-                'data': cached['stats']
+                'cached': cached,
+                'data': filtrar_modalidad(stats_data, modalidad) if modalidad else stats_data
             })
         
+        # Try to load from cache (caches from before per-modality slices are recomputed)
+        cached = load_cached_stats('quini6', fecha_limite, ventana)
+        if cached and (not modalidad or filtrar_modalidad(cached['stats'], modalidad)):
+            return respuesta(cached['stats'], True)
+        
+        # Sliding-window stats (cached per window size)
+        if ventana is not None:
+            from tombola.ventana_stats import estadisticas_ventana
+            from tombola.stats_cache import save_stats_to_cache
+            stats_data = estadisticas_ventana('quini6', ventana, fecha_limite)
+            save_stats_to_cache('quini6', fecha_limite, stats_data, ventana)
+            return respuesta(stats_data, False)
+        
         # Calculate stats
-        from tombola.quini6 import load_data, calcular_frecuencias, calcular_omision, calcular_coocurrencia, calcular_demora_maxima
+        from tombola.quini6 import load_data, calcular_estadisticas
         
         sorteos, numeros_por_sorteo = load_data(fecha_limite)
-        frec = calcular_frecuencias(numeros_por_sorteo)
-        omision = calcular_omision(numeros_por_sorteo)
-        cooc = calcular_coocurrencia(numeros_por_sorteo)
-        demora_max = calcular_demora_maxima(numeros_por_sorteo)
-        
-        stats_data = {
-            'sorteos_count': len(sorteos),
-            'subsorteos_count': len(numeros_por_sorteo),
-            'frecuencias': dict(frec.most_common()),
-            'omision': omision,
-            'coocurrencia': {f"{a}-{b}": v for (a, b), v in cooc.most_common()},
-            'demora_maxima': demora_max
-        }
+        stats_data = calcular_estadisticas(sorteos, numeros_por_sorteo)
         
         # Save to cache
         from tombola.stats_cache import save_stats_to_cache
         save_stats_to_cache('quini6', fecha_limite, stats_data)
         
-        return jsonify({
-            'success': True,
-            'cached': False,
-            'data': stats_data
-        })
+        return respuesta(stats_data, False)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -561,7 +581,12 @@ def api_quini6_excluded_dates():
 
 @app.route('/api/quini6/check-combination', methods=['POST'])
 def api_quini6_check_combination():
-    """Check if a Quini 6 combination has appeared in history."""
+    """
+    Check if a Quini 6 combination has appeared in history (any modality).
+    JSON body:
+        - numeros: the 6 numbers
+        - top: N (optional, default 10) - also return the N most similar historical sub-draws
+    """
     try:
         data = request.get_json()
         numeros = data.get('numeros')
@@ -569,36 +594,32 @@ def api_quini6_check_combination():
         if not numeros or not isinstance(numeros, list) or len(numeros) != 6:
             return jsonify({'success': False, 'error': 'Se requieren exactamente 6 números'}), 400
         
-        # Normalize input
-        target_tuple = tuple(sorted([int(n) for n in numeros]))
-        
-        # Load data
-        from tombola.quini6 import load_data
-        sorteos, _ = load_data(fecha_limite=None)
+        # Exact matches and nearest sub-draws from the in-memory bitmask index
+        from tombola.consultas import sorteos_cercanos, indice_sorteos
+        try:
+            exactos, cercanos = sorteos_cercanos('quini6', [int(n) for n in numeros], int(data.get('top', 10)))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
         modalities = ["Tradicional", "La Segunda", "Revancha", "Siempre Sale"]
-        occurrences = []
-        
-        for row in sorteos:
-            # Extract the 4 combinations
-            combs = []
-            combs.append(tuple(sorted([int(row[f"t{i}"]) for i in range(1, 7)])))
-            combs.append(tuple(sorted([int(row[f"s{i}"]) for i in range(1, 7)])))
-            combs.append(tuple(sorted([int(row[f"r{i}"]) for i in range(1, 7)])))
-            combs.append(tuple(sorted([int(row[f"ss{i}"]) for i in range(1, 7)])))
-            
-            for i, nums in enumerate(combs):
-                if nums == target_tuple:
-                    occurrences.append({
-                        "fecha": row['fecha'],
-                        "sorteo": row['sorteo'],
-                        "modalidad": modalities[i]
-                    })
+        modality_keys = ["tradicional", "segunda", "revancha", "siempre_sale"]
+        indice = indice_sorteos('quini6')
+        occurrences = [
+            {
+                "fecha": str(indice['fecha'][fila]),
+                "sorteo": str(indice['sorteo'][fila]),
+                "modalidad": modalities[m]
+            }
+            for fila, m in exactos
+        ]
+        for cercano in cercanos:
+            cercano['modalidad'] = modalities[modality_keys.index(cercano['modalidad'])]
         
         return jsonify({
             'success': True,
             'found': len(occurrences) > 0,
-            'occurrences': occurrences
+            'occurrences': occurrences,
+            'nearest': cercanos
         })
         
     except Exception as e:
@@ -606,9 +627,15 @@ def api_quini6_check_combination():
 
 @app.route('/api/quini6/verificar', methods=['GET'])
 def api_quini6_verificar():
-    """Verify Quini 6 plays against latest draw."""
+    """
+    Verify Quini 6 plays against latest draw.
+    Query params:
+        - historico: true|false (optional, default false) - expected-vs-observed hits
+          over the whole history instead of the latest draw
+    """
     try:
         from tombola.quini6_verificar import cargar_mis_jugadas, cargar_ultimo_sorteo, contar_aciertos
+        from tombola.probabilidades import comparar_jugadas
         
         jugadas = cargar_mis_jugadas()
         sorteo = cargar_ultimo_sorteo()
@@ -647,13 +674,29 @@ def api_quini6_verificar():
                 'ganadores': ganadores
             }
         
+        # Esperado vs observado de todas las jugadas contra las 4 modalidades del sorteo
+        # (con ?historico=true, contra todo el histórico). Sin jugadas, o con jugadas
+        # que no son 6 números del rango, se omite: la verificación de arriba no cambia.
+        comparacion = None
+        if jugadas:
+            try:
+                numeros_jugadas = np.array([jugada['numeros'] for jugada in jugadas])
+                if request.args.get('historico', 'false').lower() == 'true':
+                    comparacion = comparar_jugadas('quini6', numeros_jugadas)
+                else:
+                    matriz = np.array([[numeros for _, numeros in modalidades]])
+                    comparacion = comparar_jugadas('quini6', numeros_jugadas, matriz=matriz)
+            except ValueError:
+                comparacion = None
+        
         return jsonify({
             'success': True,
             'sorteo': {
                 'numero': sorteo['sorteo'],
                 'fecha': sorteo['fecha']
             },
-            'resultados': resultados
+            'resultados': resultados,
+            'esperado_vs_observado': comparacion
         })
         
     except Exception as e:
@@ -662,6 +705,77 @@ def api_quini6_verificar():
             'error': str(e)
         }), 500
 
+@app.route('/api/quini6/verificar/upload', methods=['POST'])
+def api_quini6_verificar_upload():
+    """
+    Verify an uploaded ticket file (jugada_id,n1..n6) against the latest draw.
+    The file is spooled to disk, processed in fixed-size chunks and winners are streamed back,
+    so memory stays flat regardless of file size (uploads above MAX_UPLOAD_MB get a 413).
+    Form fields:
+        - archivo: CSV file (required)
+        - formato: csv|jsonl (optional, default jsonl)
+    """
+    try:
+        import tempfile
+        from werkzeug.exceptions import RequestEntityTooLarge
+        from tombola.quini6_verificar import cargar_ultimo_sorteo
+        from tombola.quini6_streaming import iterar_ganadores, iterar_lineas_salida
+        
+        archivo = request.files.get('archivo')
+        if not archivo:
+            return jsonify({'success': False, 'error': 'Se requiere el archivo de jugadas (campo "archivo")'}), 400
+        
+        formato = request.form.get('formato', 'jsonl')
+        if formato not in ('csv', 'jsonl'):
+            return jsonify({'success': False, 'error': 'Formato inválido. Usa csv o jsonl'}), 400
+        
+        sorteo = cargar_ultimo_sorteo()
+        if not sorteo:
+            return jsonify({
+                'success': False,
+                'error': 'No hay sorteos guardados'
+            }), 404
+        
+        # Spool the upload to disk: the request files are closed once this view returns
+        fd, entrada_path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        
+        def borrar_entrada():
+            if os.path.exists(entrada_path):
+                os.remove(entrada_path)
+        
+        try:
+            archivo.save(entrada_path)
+        except Exception:
+            borrar_entrada()
+            raise
+        
+        def generar():
+            # Bytes que no son UTF-8 (archivos Latin-1 o binarios) no cortan el stream:
+            # se reemplazan y esas filas se cuentan como inválidas
+            with open(entrada_path, newline='', encoding='utf-8', errors='replace') as entrada:
+                ganadores = iterar_ganadores(entrada, sorteo)
+                yield from iterar_lineas_salida(ganadores, formato)
+        
+        mimetype = 'application/x-ndjson' if formato == 'jsonl' else 'text/csv'
+        response = Response(generar(), mimetype=mimetype)
+        # Runs when the response is closed, even if the client left before iteration started
+        response.call_on_close(borrar_entrada)
+        response.headers['X-Sorteo'] = sorteo['sorteo']
+        response.headers['X-Sorteo-Fecha'] = sorteo['fecha']
+        return response
+        
+    except RequestEntityTooLarge:
+        return jsonify({
+            'success': False,
+            'error': f'El archivo supera el máximo de {config.MAX_UPLOAD_MB} MB'
+        }), 413
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 # ==================== HEATMAP ENDPOINTS ====================
 
 
@@ -832,6 +946,255 @@ def api_quini6_heatmap():
             'error': str(e)
         }), 500
 
+# ==================== API ENDPOINTS - AMBOS JUEGOS ====================
+
+@app.route('/api/<juego>/stats/series', methods=['GET'])
+def api_stats_series(juego):
+    """
+    Per-number statistics after every historical draw, in one call.
+    Query params:
+        - numeros: comma-separated numbers (optional, default all)
+        - stats: comma-separated subset of frecuencia,omision,demora_maxima (optional)
+        - paso: keep one draw every N (optional)
+        - puntos: approximate maximum number of points (optional)
+        - desde / hasta: YYYY-MM-DD date range (optional, inclusive)
+    """
+    try:
+        from tombola.series_stats import series_payload
+
+        numeros = request.args.get('numeros')
+        stats = request.args.get('stats')
+        data = series_payload(
+            juego,
+            numeros=[int(n) for n in numeros.split(',')] if numeros else None,
+            estadisticas=stats.split(',') if stats else None,
+            paso=request.args.get('paso', 1, type=int),
+            puntos=request.args.get('puntos', None, type=int),
+            desde=request.args.get('desde'),
+            hasta=request.args.get('hasta')
+        )
+        return jsonify({'success': True, 'data': data})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/<juego>/stats/grouped', methods=['GET'])
+def api_stats_grouped(juego):
+    """
+    Number frequencies grouped by weekday, month or year (one bincount over
+    (group, modality, number), cached by dataset version).
+    Query params:
+        - por: dia, mes or anio (optional, default dia)
+        - modalidad: Quini 6 modality (optional, default all)
+    """
+    try:
+        from tombola.calendario import agrupadas_payload
+
+        payload = agrupadas_payload(juego, request.args.get('por', 'dia'), request.args.get('modalidad'))
+        return jsonify({'success': True, 'data': payload})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/<juego>/temperatura', methods=['GET'])
+def api_temperatura(juego):
+    """
+    Exponentially-decayed "temperature" score of each number.
+    Query params:
+        - vida_media: half-life in draws (optional, default 20)
+        - fecha: YYYY-MM-DD (optional) - score after the last draw before this date
+    """
+    try:
+        from tombola.temperatura import temperatura_payload, VIDA_MEDIA_DEFAULT
+
+        data = temperatura_payload(
+            juego,
+            vida_media=request.args.get('vida_media', VIDA_MEDIA_DEFAULT, type=float),
+            fecha_limite=request.args.get('fecha')
+        )
+        return jsonify({'success': True, 'data': data})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/<juego>/features', methods=['GET'])
+def api_features(juego):
+    """
+    Distribution of a per-draw feature, by modality.
+    Query params:
+        - columna: suma, impares, pares, bajos, altos, corrida_max or repetidos (default suma)
+        - fecha: YYYY-MM-DD (optional) - only draws before this date
+    """
+    try:
+        from tombola.features import cargar_features, distribucion
+        from tombola.matriz_sorteos import validar_juego
+
+        info = validar_juego(juego)
+        columna = request.args.get('columna', 'suma')
+        fecha_limite = request.args.get('fecha')
+
+        sorteos, features = cargar_features(juego)
+        n = int(np.searchsorted(features['fecha'], fecha_limite)) if fecha_limite else len(sorteos)
+        features = {c: v[:n] for c, v in features.items()}
+
+        return jsonify({'success': True, 'data': {
+            'columna': columna,
+            'sorteos_count': n,
+            'distribucion': {
+                modalidad: distribucion(features, columna, i)
+                for i, modalidad in enumerate(info['modalidades'])
+            }
+        }})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/<juego>/consulta', methods=['POST'])
+def api_consulta(juego):
+    """
+    Search historical draws (per modality) by subset, overlap and feature predicates.
+    JSON body (all optional):
+        - contiene: [numbers] that must all be present
+        - jugada: [numbers] + min_coincidencias: N - at least N numbers in common
+        - filtros: {"suma": [180, 200], "impares": 8, ...} - [min, max] range or exact value
+        - modalidad, desde, hasta (YYYY-MM-DD), limite (default 100)
+    """
+    try:
+        from tombola.consultas import consultar_sorteos
+
+        data = request.get_json() or {}
+        filtros = {
+            columna: tuple(condicion) if isinstance(condicion, list) else condicion
+            for columna, condicion in (data.get('filtros') or {}).items()
+        }
+        resultado = consultar_sorteos(
+            juego,
+            contiene=data.get('contiene'),
+            jugada=data.get('jugada'),
+            min_coincidencias=data.get('min_coincidencias'),
+            filtros=filtros,
+            modalidad=data.get('modalidad'),
+            desde=data.get('desde'),
+            hasta=data.get('hasta'),
+            limite=int(data.get('limite', 100))
+        )
+        return jsonify({'success': True, **resultado})
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/<juego>/probabilidades', methods=['GET'])
+def api_probabilidades(juego):
+    """
+    Exact hypergeometric probability of each hit count for one ticket and one draw.
+    Query params:
+        - tamano: numbers per ticket (optional, default the game's picks)
+    """
+    try:
+        from tombola.probabilidades import probabilidades_payload
+
+        tamano = request.args.get('tamano', type=int)
+        return jsonify({'success': True, 'data': probabilidades_payload(juego, tamano)})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/<juego>/randomness', methods=['GET'])
+def api_randomness(juego):
+    """
+    Randomness test battery (frequencies, pairs, runs, gaps, serial overlap)
+    with Monte Carlo p-values; the null distribution is cached per history length.
+    Query params:
+        - simulaciones: simulated histories for the null (default 1000, at most 10000)
+        - fecha: YYYY-MM-DD (optional) - only draws before this date
+    """
+    try:
+        from tombola.aleatoriedad import pruebas_aleatoriedad, SIMULACIONES_DEFAULT
+
+        simulaciones = request.args.get('simulaciones', SIMULACIONES_DEFAULT, type=int)
+        resultado = pruebas_aleatoriedad(juego, request.args.get('fecha'), simulaciones)
+        return jsonify({'success': True, 'data': resultado})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/<juego>/sumas', methods=['GET'])
+def api_sumas(juego):
+    """
+    Exact distribution of the draw sum (cached DP) next to the observed histogram,
+    chart-ready: shared labels for probability, expected and observed counts.
+    Query params:
+        - modalidad: Quini 6 modality (optional, default all)
+        - fecha: YYYY-MM-DD (optional) - only draws before this date
+    """
+    try:
+        from tombola.sumas import sumas_payload
+
+        payload = sumas_payload(juego, request.args.get('fecha'), request.args.get('modalidad'))
+        return jsonify({'success': True, 'data': payload})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/<juego>/pares/atrasados', methods=['GET'])
+def api_pares_atrasados(juego):
+    """
+    Most overdue pairs: draws since each pair last came out together and its
+    historical max gap, read from the incrementally maintained pair omission state
+    (kept up to date after each saved draw; brought up to date here if it is missing
+    or older than the CSV).
+    Query params:
+        - top: number of pairs (default 20)
+    """
+    try:
+        from tombola.pares_omision import pares_atrasados
+
+        resultado = pares_atrasados(juego, request.args.get('top', 20, type=int))
+        return jsonify({'success': True, 'data': resultado})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/<juego>/similares', methods=['GET'])
+def api_similares(juego):
+    """
+    Most similar past draws (top-K neighbors by numbers in common / Jaccard),
+    computed once over all (sub-)draws in memory-bounded blocks and cached by
+    dataset version.
+    Query params:
+        - sorteo: draw number (optional, default the latest)
+        - modalidad: Quini 6 modality (optional, default tradicional)
+        - top: number of neighbors (optional, default 10, at most 50)
+    """
+    try:
+        from tombola.similitud import similares_payload, TOP_DEFAULT
+
+        payload = similares_payload(
+            juego,
+            sorteo=request.args.get('sorteo'),
+            modalidad=request.args.get('modalidad'),
+            top=request.args.get('top', TOP_DEFAULT, type=int)
+        )
+        return jsonify({'success': True, 'data': payload})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # ==================== STATIC FILES ====================
 
 @app.route('/visualizaciones/<path:filename>')
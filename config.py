@@ -1,4 +1,5 @@
 # config.py - Configuración centralizada de rutas para el proyecto Tombola
+import os
 
 # Rutas de directorios
 PERSISTENT_DIR = 'persistent'
@@ -6,4 +7,19 @@ DATA_DIR = 'persistent/data'
 OUTPUT_DIR = 'persistent/output'
 STATS_CACHE_DIR = 'persistent/output/stats_cache'
 VISUALIZACIONES_DIR = 'persistent/output/visualizaciones'
+CHECKPOINTS_DIR = 'persistent/output/checkpoints'
+BACKTEST_CACHE_DIR = 'persistent/output/backtest_cache'
+TEMPERATURA_DIR = 'persistent/output/temperatura'
+FEATURES_DIR = 'persistent/output/features'
+ESPACIO_DIR = 'persistent/output/espacio'
+ALEATORIEDAD_DIR = 'persistent/output/aleatoriedad'
+SUMAS_DIR = 'persistent/output/sumas'
+PARES_DIR = 'persistent/output/pares'
+SIMILITUD_DIR = 'persistent/output/similitud'
+VENTANAS_DIR = 'persistent/output/ventanas'
 
+# Procesos para las tareas paralelizables (verificación, simulación, etc.)
+WORKERS = int(os.getenv('TOMBOLA_WORKERS', '1'))
+
+# Tamaño máximo de un archivo de jugadas subido a la API (MB)
+MAX_UPLOAD_MB = int(os.getenv('TOMBOLA_MAX_UPLOAD_MB', '50'))
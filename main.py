@@ -10,7 +10,7 @@ warnings.filterwarnings("ignore", message=".*NotOpenSSLWarning.*")
 
 
 from tombola.telekino import Telekino, check_repeated_combinations as check_repeated_combinations_telekino
-from analysis.simulator import run_simulations
+from analysis.simulator import simulate_frequencies
 from tombola.telekino_scraper import (
     fetch_last_sorteo, save_to_csv, get_last_saved_sorteo, 
     previous_telekino_date, fetch_sorteo, get_all_saved_sorteos,
@@ -22,13 +22,23 @@ from tombola.telekino import procesar_estadisticas
 from tombola.quini6 import Quini6, procesar_estadisticas as procesar_estadisticas_quini6, check_repeated_combinations as check_repeated_combinations_quini6
 import tombola.quini6_scraper as q6_scraper
 from tombola.quini6_verificar import verificar_jugadas
+from tombola.quini6_analisis_historico import analizar_historico
 
 
-def simulate():
-    game = Telekino()
+def simulate(game_name="telekino", n=1_000_000, seed=None, workers=None):
+    from config import WORKERS
 
-    print("Simulando Telekino...")
-    stats = run_simulations(game, n=5000)
+    game = Quini6() if game_name == "quini6" else Telekino()
+    nombre = "Quini 6" if game_name == "quini6" else "Telekino"
+    workers = workers or WORKERS
+
+    print(f"Simulando {nombre} ({n:,} sorteos, seed={seed}, workers={workers})...")
+    try:
+        resultado = simulate_frequencies(game, n, seed=seed, workers=workers)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    stats = resultado['frecuencias']
 
     top10 = sorted(stats.items(), key=lambda x: x[1], reverse=True)[:10]
 
@@ -36,6 +46,8 @@ def simulate():
     for num, count in top10:
         print(f"{num}: {count}")
 
+    print(f"\n⏱️  {resultado['segundos']:.2f} s ({resultado['sorteos_por_segundo']:,.0f} sorteos/s)")
+
 
 def scrape_latest():
     print("Buscando próximo sorteo faltante...")
@@ -172,8 +184,8 @@ def scrape_quini6():
     else:
         print(f"\n⚠️  No se encontró el sorteo para {next_date}")
 
-def telekino_stats(fecha_limite=None):
-    procesar_estadisticas(fecha_limite)
+def telekino_stats(fecha_limite=None, ventana=None):
+    procesar_estadisticas(fecha_limite, ventana=ventana)
 
 def telekino_visualizar():
     from analysis.visualizacion_telekino import crear_visualizaciones as crear_visualizaciones_telekino
@@ -182,12 +194,54 @@ def telekino_visualizar():
 def telekino_check():
     check_repeated_combinations_telekino()
 
-def quini6_stats(fecha_limite=None):
-    procesar_estadisticas_quini6(fecha_limite)
+def quini6_stats(fecha_limite=None, ventana=None, modalidad=None):
+    from tombola.quini6_modalidades import MODALIDADES
+    
+    if modalidad and modalidad not in MODALIDADES:
+        print(f"❌ Modalidad '{modalidad}' no válida. Disponibles: {', '.join(MODALIDADES)}")
+        sys.exit(1)
+    procesar_estadisticas_quini6(fecha_limite, ventana=ventana, modalidad=modalidad)
 
 def quini6_verificar():
     verificar_jugadas()
 
+def quini6_verificar_archivo(entrada, salida=None, workers=None):
+    from config import WORKERS
+    from tombola.quini6_verificar import cargar_ultimo_sorteo
+    from tombola.quini6_streaming import verificar_archivo
+    
+    if not entrada:
+        print("❌ Especifica el archivo de jugadas. Ejemplo: python main.py quini6 verificar-archivo jugadas.csv")
+        sys.exit(1)
+    
+    sorteo = cargar_ultimo_sorteo()
+    if not sorteo:
+        print("❌ No hay sorteos guardados. Ejecuta 'python main.py quini6 scrape' primero.")
+        return
+    
+    salida = salida or "ganadores_quini6.csv"
+    print(f"🎲 Verificando {entrada} contra el sorteo {sorteo['sorteo']} ({sorteo['fecha']})...")
+    resumen = verificar_archivo(entrada, salida, sorteo, workers=workers or WORKERS)
+    
+    print(f"\n✅ Jugadas verificadas: {resumen['jugadas']} (inválidas: {resumen['invalidas']})")
+    print(f"💾 {resumen['ganadores']} resultado(s) con 3+ aciertos guardados en {salida}")
+    for modalidad, totales in resumen['totales'].items():
+        print(f"  {modalidad:<13} 6: {totales['6']}  5: {totales['5']}  4: {totales['4']}  3: {totales['3']}")
+
+def quini6_historico(workers=None, comprobar=False):
+    if not comprobar:
+        analizar_historico(workers=workers)
+        return
+    from config import WORKERS
+    from tombola.quini6_analisis_historico import cargar_mis_jugadas, cargar_todos_sorteos
+    from tombola.quini6_paralelo import comprobar_equivalencia
+    
+    resultados = comprobar_equivalencia(cargar_mis_jugadas(), cargar_todos_sorteos(), max(2, workers or WORKERS))
+    for nombre, ok in resultados.items():
+        print(f"{'✅' if ok else '❌'} {nombre}: {'igual' if ok else 'distinto'} a la verificación serial")
+    if not all(resultados.values()):
+        sys.exit(1)
+
 def quini6_visualizar():
     from analysis.visualizacion_quini6 import crear_visualizaciones
     crear_visualizaciones()
@@ -195,28 +249,379 @@ def quini6_visualizar():
 def quini6_check():
     check_repeated_combinations_quini6()
 
+# Opciones sin valor: '--forzar' alcanza (se acepta '--forzar si' por compatibilidad)
+BANDERAS = ('forzar', 'comprobar')
+
+def parse_opciones(argv):
+    """Separa argumentos posicionales de opciones '--nombre valor' y banderas '--nombre'."""
+    args, opciones = [], {}
+    i = 0
+    while i < len(argv):
+        if argv[i].startswith('--') and argv[i][2:] in BANDERAS:
+            opciones[argv[i][2:]] = True
+            i += 2 if i + 1 < len(argv) and argv[i + 1] == 'si' else 1
+        elif argv[i].startswith('--'):
+            if i + 1 == len(argv):
+                print(f"❌ Falta el valor de {argv[i]}")
+                sys.exit(1)
+            opciones[argv[i][2:]] = argv[i + 1]
+            i += 2
+        else:
+            args.append(argv[i])
+            i += 1
+    return args, opciones
+
+def temperatura_cmd(game_name, fecha_limite, opciones):
+    from tombola.temperatura import temperatura_payload, imprimir_temperatura, VIDA_MEDIA_DEFAULT
+    
+    try:
+        vida_media = float(opciones.get('vida-media', VIDA_MEDIA_DEFAULT))
+        imprimir_temperatura(game_name, temperatura_payload(game_name, vida_media, fecha_limite))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def itemsets_cmd(game_name, fecha_limite, opciones):
+    from tombola.itemsets import minar_itemsets, imprimir_itemsets, benchmark_itemsets, imprimir_benchmark
+    
+    try:
+        if 'benchmark' in opciones:
+            imprimir_benchmark(benchmark_itemsets(game_name, int(opciones['benchmark'])))
+            return
+        resultado = minar_itemsets(
+            game_name,
+            k=int(opciones.get('k', 3)),
+            top=int(opciones.get('top', 20)),
+            min_soporte=int(opciones.get('min-soporte', 1)),
+            fecha_limite=fecha_limite
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    imprimir_itemsets(game_name, resultado)
+
+def features_cmd(game_name, opciones):
+    from tombola.features import cargar_features, imprimir_distribucion
+    
+    sorteos, features = cargar_features(game_name)
+    try:
+        imprimir_distribucion(game_name, features, opciones.get('columna', 'suma'))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def sumas_cmd(game_name, fecha_limite, opciones):
+    from tombola.sumas import sumas_payload, imprimir_sumas
+    
+    try:
+        payload = sumas_payload(game_name, fecha_limite, opciones.get('modalidad'))
+        imprimir_sumas(game_name, payload, int(opciones.get('ancho', 10)))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def consulta_cmd(game_name, opciones):
+    from tombola.consultas import consultar_sorteos, imprimir_consulta, parsear_filtro, FILTROS
+    
+    def numeros(nombre):
+        return [int(n) for n in opciones[nombre].split(',')] if nombre in opciones else None
+    
+    try:
+        resultado = consultar_sorteos(
+            game_name,
+            contiene=numeros('contiene'),
+            jugada=numeros('jugada'),
+            min_coincidencias=int(opciones['min-coincidencias']) if 'min-coincidencias' in opciones else None,
+            filtros={c: parsear_filtro(opciones[c]) for c in FILTROS if c in opciones},
+            modalidad=opciones.get('modalidad'),
+            desde=opciones.get('desde'),
+            hasta=opciones.get('hasta'),
+            limite=int(opciones.get('limite', 20))
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    imprimir_consulta(game_name, resultado)
+
+def espacio_cmd(game_name, accion, opciones):
+    from config import WORKERS
+    from tombola.espacio import (
+        escanear_espacio, ranking_jugadas, jugadas_sin_alcanzar, imprimir_ranking, total_jugadas
+    )
+    
+    try:
+        if accion == "escanear":
+            print(f"🔎 Escaneando {total_jugadas(game_name):,} jugadas posibles...")
+            meta = escanear_espacio(
+                game_name,
+                workers=int(opciones['workers']) if 'workers' in opciones else WORKERS,
+                forzar='forzar' in opciones,
+                limite=int(opciones['limite']) if 'limite' in opciones else None
+            )
+            if meta['cache']:
+                print("📦 El histórico no cambió desde el último escaneo.")
+            else:
+                print(f"✅ {meta['jugadas']:,} jugadas × {meta['sorteos']} sorteos en {meta['segundos']:.1f} s "
+                      f"({meta['jugadas_por_segundo']:,.0f} jugadas/s)")
+        elif accion in ("mejores", "peores"):
+            mejores = accion == "mejores"
+            imprimir_ranking(game_name, ranking_jugadas(game_name, int(opciones.get('top', 10)), mejores), mejores)
+        elif accion == "nunca":
+            resultado = jugadas_sin_alcanzar(game_name, int(opciones.get('k', 1)))
+            print(f"\n{resultado['total']:,} de {resultado['de']:,} jugadas nunca tuvieron {resultado['k']}+ aciertos")
+            for jugada in resultado['ejemplos']:
+                print(f"  {' '.join(f'{n:02d}' for n in jugada)}")
+        else:
+            print("❌ Acciones válidas: escanear, mejores, peores, nunca")
+            sys.exit(1)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def colex_cmd(game_name, opciones):
+    from tombola.colex import (
+        verificar_colex, benchmark_colex, imprimir_verificacion,
+        rank_jugadas, unrank_jugadas, bitmap_sorteados, salio
+    )
+    
+    try:
+        if 'jugada' in opciones:
+            jugada = [int(n) for n in opciones['jugada'].split(',')]
+            indice = int(rank_jugadas(game_name, jugada))
+            ya_salio = salio(bitmap_sorteados(game_name), indice)
+            print(f"🔢 Índice colex: {indice:,} | {'ya salió' if ya_salio else 'nunca salió'}")
+        elif 'indice' in opciones:
+            jugada = unrank_jugadas(game_name, int(opciones['indice']))
+            print(f"🎟️  {' '.join(f'{n:02d}' for n in jugada)}")
+        else:
+            resultados = verificar_colex(game_name)
+            imprimir_verificacion(game_name, resultados, benchmark_colex(game_name))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def probabilidades_cmd(game_name, opciones):
+    from tombola.probabilidades import imprimir_probabilidades, comparar_jugadas, imprimir_comparacion
+    
+    try:
+        imprimir_probabilidades(game_name, int(opciones['tamano']) if 'tamano' in opciones else None)
+        if 'jugada' in opciones:
+            jugada = [int(n) for n in opciones['jugada'].split(',')]
+            imprimir_comparacion(comparar_jugadas(game_name, [jugada]))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def aleatoriedad_cmd(game_name, fecha_limite, opciones):
+    from tombola.aleatoriedad import pruebas_aleatoriedad, imprimir_aleatoriedad, SIMULACIONES_DEFAULT
+    
+    try:
+        simulaciones = int(opciones.get('simulaciones', SIMULACIONES_DEFAULT))
+        imprimir_aleatoriedad(game_name, pruebas_aleatoriedad(game_name, fecha_limite, simulaciones))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def pares_cmd(game_name, opciones):
+    from tombola.pares_omision import pares_atrasados, imprimir_pares_atrasados
+    
+    try:
+        imprimir_pares_atrasados(game_name, pares_atrasados(game_name, int(opciones.get('top', 20))))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def calendario_cmd(game_name, opciones):
+    from tombola.calendario import agrupadas_payload, imprimir_agrupadas
+    
+    try:
+        payload = agrupadas_payload(game_name, opciones.get('por', 'dia'), opciones.get('modalidad'))
+        imprimir_agrupadas(game_name, payload, int(opciones.get('top', 5)))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def similares_cmd(game_name, opciones):
+    from config import WORKERS
+    from tombola.similitud import similares_payload, imprimir_similares, exportar_vecinos, TOP_DEFAULT
+    
+    try:
+        top = int(opciones.get('top', TOP_DEFAULT))
+        workers = int(opciones['workers']) if 'workers' in opciones else WORKERS
+        if 'exportar' in opciones:
+            aristas = exportar_vecinos(game_name, opciones['exportar'], top, workers)
+            print(f"✔️ {aristas} aristas exportadas a {opciones['exportar']}")
+            return
+        payload = similares_payload(game_name, opciones.get('sorteo'), opciones.get('modalidad'), top, workers)
+        imprimir_similares(game_name, payload)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+def _decaimiento_opcion(opciones):
+    """--decaimiento D directo, o --vida-media H (en sorteos) convertido a factor por sorteo."""
+    if 'vida-media' in opciones:
+        from tombola.temperatura import decaimiento_vida_media
+        return decaimiento_vida_media(float(opciones['vida-media']))
+    return float(opciones['decaimiento']) if 'decaimiento' in opciones else None
+
+def backtest_cmd(game_name, estrategia, opciones):
+    from tombola.backtest import backtest, imprimir_backtest, ESTRATEGIAS
+    
+    if not estrategia:
+        print(f"❌ Especifica una estrategia: {', '.join(ESTRATEGIAS)}")
+        sys.exit(1)
+    
+    try:
+        resultado = backtest(
+            game_name,
+            estrategia,
+            k=int(opciones['k']) if 'k' in opciones else None,
+            ventana=int(opciones['ventana']) if 'ventana' in opciones else None,
+            decaimiento=_decaimiento_opcion(opciones)
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    imprimir_backtest(resultado)
+
+def _lista_opcion(opciones, nombre, tipo):
+    """Convierte '--nombre a,b,c' en lista; 0 significa 'sin' (ventana/decaimiento)."""
+    if nombre not in opciones:
+        return None
+    return [tipo(v) or None for v in opciones[nombre].split(',')]
+
+def barrido_cmd(opciones):
+    from config import WORKERS
+    from tombola.backtest_barrido import barrido, imprimir_barrido
+    
+    try:
+        resultado = barrido(
+            juegos=opciones['juegos'].split(',') if 'juegos' in opciones else ('telekino', 'quini6'),
+            estrategias=opciones['estrategias'].split(',') if 'estrategias' in opciones else None,
+            ks=_lista_opcion(opciones, 'k', int),
+            ventanas=_lista_opcion(opciones, 'ventana', int),
+            decaimientos=_lista_opcion(opciones, 'decaimiento', float),
+            workers=int(opciones['workers']) if 'workers' in opciones else WORKERS
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    imprimir_barrido(resultado)
+
 def help():
     print("""
 Comandos disponibles:
 
   TELEKINO:
   python main.py telekino scrape              → scrapea el último sorteo disponible
-  python main.py telekino stats [YYYY-MM-DD]  → calcula estadísticas del Telekino
+  python main.py telekino stats [YYYY-MM-DD] [--ventana N]
+                                              → calcula estadísticas del Telekino (opcional: últimos N sorteos)
   python main.py telekino visualizar          → genera mapas de calor y gráficos
-  python main.py telekino simulate            → corre simulación Monte Carlo
+  python main.py telekino simulate [N] [--seed S] [--workers W]
+                                              → corre simulación Monte Carlo vectorizada (N sorteos, default 1.000.000)
   python main.py telekino check               → busca combinaciones repetidas en la historia
+  python main.py telekino backtest <estrategia> [--k K] [--ventana N] [--decaimiento D | --vida-media H]
+                                              → evalúa una estrategia sobre todo el histórico
+  python main.py telekino temperatura [YYYY-MM-DD] [--vida-media H]
+                                              → números más calientes/fríos con peso que decae (vida media H sorteos)
+  python main.py telekino itemsets [YYYY-MM-DD] [--k 3|4] [--top N] [--min-soporte S] [--benchmark N]
+                                              → grupos de k números que más salieron juntos
+  python main.py telekino features [--columna suma|impares|bajos|corrida_max|repetidos|...]
+                                              → distribución de una característica de los sorteos
+  python main.py telekino sumas [YYYY-MM-DD] [--ancho 10]
+                                              → distribución exacta de la suma del sorteo vs la observada
+  python main.py telekino consulta [--contiene 7,13] [--jugada N,N,... --min-coincidencias K]
+                          [--suma 180:200] [--impares 8] [--desde F] [--hasta F] [--limite N]
+                                              → busca sorteos por números, coincidencias o características
+  python main.py telekino espacio escanear [--workers N] [--forzar] | mejores [--top N] | peores [--top N] | nunca --k K
+                                              → histograma de aciertos de TODAS las jugadas posibles
+                                                (--forzar: reescanea aunque el histórico no haya cambiado)
+  python main.py telekino colex [--jugada N,N,... | --indice I]
+                                              → índice compacto de una jugada (y si ya salió) o verificación del ranking
+  python main.py telekino probabilidades [--tamano N] [--jugada N,N,...]
+                                              → probabilidad exacta de cada cantidad de aciertos
+                                                (con --jugada: esperado vs observado en el histórico)
+  python main.py telekino aleatoriedad [YYYY-MM-DD] [--simulaciones N]
+                                              → pruebas de aleatoriedad con p-valores Monte Carlo
+  python main.py telekino pares [--top N]
+                                              → pares que hace más sorteos que no salen juntos (y su demora máxima)
+  python main.py telekino calendario [--por dia|mes|anio] [--top N]
+                                              → frecuencias por día de la semana, mes o año
+  python main.py telekino similares [--sorteo S] [--top N] [--workers N] [--exportar vecinos.csv]
+                                              → sorteos del histórico más parecidos (números en común, Jaccard)
+                                                (--exportar: grafo de vecinos para clustering)
   
   QUINI 6:
   python main.py quini6 scrape                → scrapea el último sorteo Quini 6
-  python main.py quini6 stats [YYYY-MM-DD]    → calcula estadísticas del Quini 6
+  python main.py quini6 stats [YYYY-MM-DD] [--ventana N] [--modalidad M]
+                                              → calcula estadísticas del Quini 6 (opcional: últimos N sorteos,
+                                                una sola modalidad) y el solapamiento entre modalidades
   python main.py quini6 verificar             → verifica tus jugadas contra el último sorteo
+  python main.py quini6 historico [--workers N] [--comprobar]
+                                              → busca 5 y 6 aciertos de tus jugadas en la historia
+                                                (incremental: solo verifica sorteos nuevos;
+                                                --comprobar: compara el núcleo paralelo con el serial)
+  python main.py quini6 verificar-archivo <jugadas.csv> [salida.csv|salida.jsonl] [--workers N]
+                                              → verifica un archivo grande de jugadas por bloques
   python main.py quini6 visualizar            → genera mapas de calor y gráficos
+  python main.py quini6 simulate [N] [--seed S] [--workers W]
+                                              → corre simulación Monte Carlo vectorizada
   python main.py quini6 check                 → busca combinaciones repetidas en la historia
+  python main.py quini6 backtest <estrategia> [--k K] [--ventana N] [--decaimiento D | --vida-media H]
+                                              → evalúa una estrategia sobre todo el histórico
+  python main.py quini6 temperatura [YYYY-MM-DD] [--vida-media H]
+                                              → números más calientes/fríos con peso que decae (vida media H sorteos)
+  python main.py quini6 itemsets [YYYY-MM-DD] [--k 3|4] [--top N] [--min-soporte S] [--benchmark N]
+                                              → grupos de k números que más salieron juntos
+  python main.py quini6 features [--columna suma|impares|bajos|corrida_max|repetidos|...]
+                                              → distribución de una característica de los sorteos
+  python main.py quini6 sumas [YYYY-MM-DD] [--modalidad M] [--ancho 10]
+                                              → distribución exacta de la suma del sorteo vs la observada
+  python main.py quini6 consulta [--contiene 7,13] [--jugada N,N,... --min-coincidencias K]
+                          [--suma 180:200] [--impares 8] [--desde F] [--hasta F] [--limite N]
+                                              → busca sorteos por números, coincidencias o características
+  python main.py quini6 espacio escanear [--workers N] [--forzar] | mejores [--top N] | peores [--top N] | nunca --k K
+                                              → histograma de aciertos de TODAS las jugadas posibles
+                                                (--forzar: reescanea aunque el histórico no haya cambiado)
+  python main.py quini6 colex [--jugada N,N,... | --indice I]
+                                              → índice compacto de una jugada (y si ya salió) o verificación del ranking
+  python main.py quini6 probabilidades [--tamano N] [--jugada N,N,...]
+                                              → probabilidad exacta de cada cantidad de aciertos
+                                                (con --jugada: esperado vs observado en el histórico)
+  python main.py quini6 aleatoriedad [YYYY-MM-DD] [--simulaciones N]
+                                              → pruebas de aleatoriedad con p-valores Monte Carlo
+  python main.py quini6 pares [--top N]
+                                              → pares que hace más sorteos que no salen juntos (y su demora máxima)
+  python main.py quini6 calendario [--por dia|mes|anio] [--modalidad M] [--top N]
+                                              → frecuencias por día de la semana, mes o año
+  python main.py quini6 similares [--sorteo S] [--modalidad M] [--top N] [--workers N] [--exportar vecinos.csv]
+                                              → sorteos del histórico más parecidos (números en común, Jaccard)
+                                                (--exportar: grafo de vecinos para clustering)
+  
+  BARRIDO DE PARÁMETROS (ambos juegos):
+  python main.py barrido [--juegos telekino,quini6] [--estrategias calientes,pares]
+                         [--k 6,8] [--ventana 0,20,50] [--decaimiento 0,0.99] [--workers N]
+                                              → backtest de toda la grilla, cacheado por configuración
+                                                (0 = sin ventana / sin decaimiento)
   
   📅 BACKTESTING:
   Agrega una fecha opcional a 'stats' para ver estadísticas históricas.
   Ejemplo: python main.py quini6 stats 2024-11-20
   Esto mostrará estadísticas usando solo sorteos anteriores a 2024-11-20.
+  
+  'backtest' recorre todas las fechas armando la jugada solo con los sorteos previos.
+  Estrategias: calientes, frios, omitidos, pares, repetidos.
+  Ejemplo: python main.py telekino backtest calientes --ventana 50
+  'barrido' guarda la serie de cada configuración: con un sorteo nuevo solo evalúa esa fecha.
+  
+  ⚙️  PARALELISMO:
+  --workers N reparte el trabajo en N procesos (por defecto TOMBOLA_WORKERS o 1).
+  --seed S hace la simulación reproducible: mismo seed y workers → mismo resultado.
 """)
 
 if __name__ == "__main__":
@@ -231,6 +636,10 @@ if __name__ == "__main__":
         help()
         sys.exit(0)
     
+    if game == "barrido":
+        barrido_cmd(parse_opciones(sys.argv[2:])[1])
+        sys.exit(0)
+    
     if len(sys.argv) < 3:
         print(f"❌ Error: Especifica un comando para '{game}'")
         print(f"Ejemplo: python main.py {game} scrape")
@@ -239,24 +648,56 @@ if __name__ == "__main__":
     
     command = sys.argv[2].lower()
     
+    # Separar argumentos posicionales de opciones (--workers N)
+    args, opciones = parse_opciones(sys.argv[3:])
+    
     # Verificar si hay un tercer argumento (fecha para stats)
-    fecha_arg = sys.argv[3] if len(sys.argv) > 3 else None
+    fecha_arg = args[0] if len(args) > 0 else None
+    workers = int(opciones['workers']) if 'workers' in opciones else None
+    seed = int(opciones['seed']) if 'seed' in opciones else None
+    ventana = int(opciones['ventana']) if 'ventana' in opciones else None
     
     # Telekino commands
     if game == "telekino":
         if command == "scrape":
             scrape_latest()
         elif command == "stats":
-            telekino_stats(fecha_arg)
+            telekino_stats(fecha_arg, ventana)
         elif command == "visualizar":
             telekino_visualizar()
         elif command == "simulate":
-            simulate()
+            simulate("telekino", int(fecha_arg) if fecha_arg else 1_000_000, seed, workers)
         elif command == "check":
             telekino_check()
+        elif command == "backtest":
+            backtest_cmd("telekino", fecha_arg, opciones)
+        elif command == "temperatura":
+            temperatura_cmd("telekino", fecha_arg, opciones)
+        elif command == "itemsets":
+            itemsets_cmd("telekino", fecha_arg, opciones)
+        elif command == "features":
+            features_cmd("telekino", opciones)
+        elif command == "sumas":
+            sumas_cmd("telekino", fecha_arg, opciones)
+        elif command == "consulta":
+            consulta_cmd("telekino", opciones)
+        elif command == "espacio":
+            espacio_cmd("telekino", fecha_arg, opciones)
+        elif command == "colex":
+            colex_cmd("telekino", opciones)
+        elif command == "probabilidades":
+            probabilidades_cmd("telekino", opciones)
+        elif command == "aleatoriedad":
+            aleatoriedad_cmd("telekino", fecha_arg, opciones)
+        elif command == "pares":
+            pares_cmd("telekino", opciones)
+        elif command == "calendario":
+            calendario_cmd("telekino", opciones)
+        elif command == "similares":
+            similares_cmd("telekino", opciones)
         else:
             print(f"❌ Comando '{command}' no válido para telekino")
-            print("Comandos válidos: scrape, stats [YYYY-MM-DD], visualizar, simulate, check")
+            print("Comandos válidos: scrape, stats [YYYY-MM-DD], visualizar, simulate [N], check, backtest <estrategia>, temperatura, itemsets, features, sumas, consulta, espacio, colex, probabilidades, aleatoriedad, pares, calendario, similares")
             sys.exit(1)
     
     # Quini 6 commands
@@ -264,16 +705,48 @@ if __name__ == "__main__":
         if command == "scrape":
             scrape_quini6()
         elif command == "stats":
-            quini6_stats(fecha_arg)
+            quini6_stats(fecha_arg, ventana, opciones.get('modalidad'))
         elif command == "verificar":
             quini6_verificar()
+        elif command == "historico":
+            quini6_historico(workers, 'comprobar' in opciones)
+        elif command == "verificar-archivo":
+            quini6_verificar_archivo(fecha_arg, args[1] if len(args) > 1 else None, workers)
         elif command == "visualizar":
             quini6_visualizar()
+        elif command == "simulate":
+            simulate("quini6", int(fecha_arg) if fecha_arg else 1_000_000, seed, workers)
         elif command == "check":
             quini6_check()
+        elif command == "backtest":
+            backtest_cmd("quini6", fecha_arg, opciones)
+        elif command == "temperatura":
+            temperatura_cmd("quini6", fecha_arg, opciones)
+        elif command == "itemsets":
+            itemsets_cmd("quini6", fecha_arg, opciones)
+        elif command == "features":
+            features_cmd("quini6", opciones)
+        elif command == "sumas":
+            sumas_cmd("quini6", fecha_arg, opciones)
+        elif command == "consulta":
+            consulta_cmd("quini6", opciones)
+        elif command == "espacio":
+            espacio_cmd("quini6", fecha_arg, opciones)
+        elif command == "colex":
+            colex_cmd("quini6", opciones)
+        elif command == "probabilidades":
+            probabilidades_cmd("quini6", opciones)
+        elif command == "aleatoriedad":
+            aleatoriedad_cmd("quini6", fecha_arg, opciones)
+        elif command == "pares":
+            pares_cmd("quini6", opciones)
+        elif command == "calendario":
+            calendario_cmd("quini6", opciones)
+        elif command == "similares":
+            similares_cmd("quini6", opciones)
         else:
             print(f"❌ Comando '{command}' no válido para quini6")
-            print("Comandos válidos: scrape, stats [YYYY-MM-DD], verificar, visualizar, check")
+            print("Comandos válidos: scrape, stats [YYYY-MM-DD], verificar, historico, verificar-archivo, visualizar, simulate [N], check, backtest <estrategia>, temperatura, itemsets, features, sumas, consulta, espacio, colex, probabilidades, aleatoriedad, pares, calendario, similares")
             sys.exit(1)
     
     else:
@@ -0,0 +1,66 @@
+# tests/test_colex.py
+from itertools import combinations
+from math import comb
+import numpy as np
+import pytest
+from tombola.colex import (
+    LOTE, rank, unrank, unrank_uno, tabla_binomial, rank_jugadas, unrank_jugadas
+)
+from tombola.matriz_sorteos import validar_juego
+
+JUEGOS = ('telekino', 'quini6')
+
+
+def parametros(juego):
+    info = validar_juego(juego)
+    n = info['maximo'] - info['minimo'] + 1
+    return info, n, info['picks']
+
+
+@pytest.mark.parametrize('juego', JUEGOS)
+def test_ida_y_vuelta_todo_el_espacio(juego):
+    _, n, k = parametros(juego)
+    tabla = tabla_binomial(n, k)
+    total = comb(n, k)
+    for a in range(0, total, LOTE):
+        indices = np.arange(a, min(a + LOTE, total), dtype=np.int64)
+        combinaciones = unrank(indices, n, k, tabla)
+        assert (np.diff(combinaciones, axis=1) > 0).all()
+        assert np.array_equal(rank(combinaciones, tabla), indices)
+
+
+@pytest.mark.parametrize('juego', JUEGOS)
+def test_rangos_extremos(juego):
+    info, n, k = parametros(juego)
+    ultimo = comb(n, k) - 1
+
+    primera = unrank_jugadas(juego, [0, ultimo])
+    assert primera[0].tolist() == list(range(info['minimo'], info['minimo'] + k))
+    assert primera[1].tolist() == list(range(info['maximo'] - k + 1, info['maximo'] + 1))
+    assert rank_jugadas(juego, primera).tolist() == [0, ultimo]
+    assert unrank(np.array([0, ultimo]), n, k).tolist() == [unrank_uno(0, n, k), unrank_uno(ultimo, n, k)]
+
+    with pytest.raises(ValueError):
+        unrank_jugadas(juego, [ultimo + 1])
+    with pytest.raises(ValueError):
+        unrank_jugadas(juego, [-1])
+
+
+@pytest.mark.parametrize('juego', JUEGOS)
+def test_orden_coincide_con_itertools(juego):
+    _, n, k = parametros(juego)
+    m = k + 4
+    esperado = sorted(combinations(range(m), k), key=lambda c: c[::-1])
+    obtenido = unrank(np.arange(comb(m, k)), n, k)
+    assert [tuple(c) for c in obtenido.tolist()] == esperado
+
+
+@pytest.mark.parametrize('juego', JUEGOS)
+def test_rank_jugadas_rechaza_invalidas(juego):
+    info, _, k = parametros(juego)
+    with pytest.raises(ValueError):
+        rank_jugadas(juego, [[info['minimo']] * k])
+    with pytest.raises(ValueError):
+        rank_jugadas(juego, [list(range(info['maximo'] - k + 2, info['maximo'] + 2))])
+    with pytest.raises(ValueError):
+        rank_jugadas(juego, [list(range(info['minimo'], info['minimo'] + k - 1))])
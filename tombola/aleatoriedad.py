@@ -0,0 +1,232 @@
+# tombola/aleatoriedad.py
+import os
+import numpy as np
+from config import ALEATORIEDAD_DIR
+from tombola.base_game import indices_aleatorios
+from tombola.matriz_sorteos import cargar_matriz, matriz_incidencia, validar_juego
+
+# Simulaciones de la distribución nula por defecto
+SIMULACIONES_DEFAULT = 1000
+# Tope de simulaciones por consulta (cada valor distinto corre y guarda su propio Monte Carlo)
+SIMULACIONES_MAXIMO = 10000
+# Distribuciones nulas guardadas por juego; se borran las usadas hace más tiempo
+CACHES_POR_JUEGO = 4
+# Memoria temporal por lote de historias simuladas (la co-ocurrencia usa float32)
+MEMORIA_LOTE = 64 * 1024 * 1024
+
+PRUEBAS = {
+    'frecuencias': 'Chi-cuadrado de las frecuencias de cada número contra la uniforme',
+    'pares': 'Chi-cuadrado de la co-ocurrencia de cada par contra la esperada con independencia',
+    'rachas': 'Suma de z² del test de rachas (Wald-Wolfowitz) de la secuencia de apariciones de cada número',
+    'huecos': 'Chi-cuadrado del largo de los huecos entre apariciones contra la geométrica',
+    'solapamiento': 'Números en común entre sorteos consecutivos (misma modalidad), promedio'
+}
+# Pruebas con p-valor a dos colas (desvío en cualquier dirección); el resto, cola superior
+DOS_COLAS = {'solapamiento'}
+
+
+def get_aleatoriedad_filename(juego, sorteos, simulaciones):
+    """Archivo con la distribución nula de un juego para un largo de histórico."""
+    return os.path.join(ALEATORIEDAD_DIR, f"{juego}_n{sorteos}_s{simulaciones}.npz")
+
+
+def podar_cache(juego, conservar=CACHES_POR_JUEGO):
+    """
+    Deja solo las `conservar` distribuciones nulas del juego usadas más
+    recientemente (largos de histórico viejos o consultas con fecha puntuales).
+    """
+    if not os.path.isdir(ALEATORIEDAD_DIR):
+        return
+    archivos = [
+        os.path.join(ALEATORIEDAD_DIR, nombre) for nombre in os.listdir(ALEATORIEDAD_DIR)
+        if nombre.startswith(f"{juego}_n") and nombre.endswith('.npz')
+    ]
+    archivos.sort(key=os.path.getmtime, reverse=True)
+    for archivo in archivos[conservar:]:
+        try:
+            os.remove(archivo)
+        except OSError:
+            pass
+
+
+def _incidencia_historias(juego, matriz):
+    """Incidencia (B, sorteos, modalidades, rango) de un lote de historias (B, sorteos, modalidades, picks)."""
+    info = validar_juego(juego)
+    return matriz_incidencia(matriz, juego)[..., info['minimo']:]
+
+
+def estadisticos(incidencia, picks):
+    """
+    Estadísticos de todas las pruebas para un lote de historias, vectorizado:
+    incidencia booleana (B, sorteos, modalidades, rango) → {prueba: (B,)}.
+    Quini 6 cuenta cada modalidad como un sub-sorteo, en orden temporal.
+    """
+    B, n, m, rango = incidencia.shape
+    sub = incidencia.reshape(B, n * m, rango)
+    T = n * m
+    p = picks / rango
+
+    # Frecuencias contra la uniforme
+    conteos = sub.sum(axis=1, dtype=np.float64)
+    esperado = T * p
+    frecuencias = ((conteos - esperado) ** 2 / esperado).sum(axis=1)
+
+    # Co-ocurrencia de pares contra la esperada con independencia
+    flotante = sub.astype(np.float32)
+    cooc = np.einsum('btx,bty->bxy', flotante, flotante, dtype=np.float64)
+    superior = np.triu_indices(rango, 1)
+    esperado_par = T * picks * (picks - 1) / (rango * (rango - 1))
+    pares = ((cooc[:, superior[0], superior[1]] - esperado_par) ** 2 / esperado_par).sum(axis=1)
+
+    # Rachas de la secuencia 0/1 de cada número
+    rachas_obs = 1 + (sub[:, 1:] != sub[:, :-1]).sum(axis=1, dtype=np.float64)
+    unos, ceros = conteos, T - conteos
+    media = 1 + 2 * unos * ceros / T
+    varianza = 2 * unos * ceros * (2 * unos * ceros - T) / (T ** 2 * (T - 1))
+    z = np.divide(rachas_obs - media, np.sqrt(varianza), out=np.zeros_like(media), where=varianza > 0)
+    rachas = (z ** 2).sum(axis=1)
+
+    # Huecos entre apariciones consecutivas de cada número contra la geométrica(p)
+    historia, numero, t = np.nonzero(sub.transpose(0, 2, 1))
+    clave = historia * rango + numero
+    mismo = clave[1:] == clave[:-1]
+    huecos = (t[1:] - t[:-1])[mismo]
+    de_historia = historia[1:][mismo]
+    maximo = max(2, int(np.ceil(np.log(0.01) / np.log1p(-p))))
+    categoria = np.minimum(huecos, maximo) - 1
+    histograma = np.bincount(de_historia * maximo + categoria, minlength=B * maximo).reshape(B, maximo)
+    k = np.arange(1, maximo + 1)
+    pmf = p * (1 - p) ** (k - 1)
+    pmf[-1] = (1 - p) ** (maximo - 1)
+    esperado_huecos = histograma.sum(axis=1, keepdims=True) * pmf
+    huecos_chi2 = ((histograma - esperado_huecos) ** 2 / np.maximum(esperado_huecos, 1e-12)).sum(axis=1)
+
+    # Solapamiento entre sorteos consecutivos de la misma modalidad
+    solapamiento = (incidencia[:, 1:] & incidencia[:, :-1]).sum(axis=-1).mean(axis=(1, 2))
+
+    return {
+        'frecuencias': frecuencias,
+        'pares': pares,
+        'rachas': rachas,
+        'huecos': huecos_chi2,
+        'solapamiento': solapamiento
+    }
+
+
+def distribucion_nula(juego, sorteos, simulaciones=SIMULACIONES_DEFAULT, seed=0):
+    """
+    Estadísticos de `simulaciones` historias aleatorias del mismo largo que el
+    histórico, generadas por lotes (indices_aleatorios) y cacheadas en disco por
+    (juego, sorteos, simulaciones): solo se recalculan cuando cambia el largo.
+    Se conservan las CACHES_POR_JUEGO usadas más recientemente.
+    """
+    info = validar_juego(juego)
+    archivo = get_aleatoriedad_filename(juego, sorteos, simulaciones)
+    if os.path.exists(archivo):
+        try:
+            with np.load(archivo) as guardado:
+                nula = {prueba: guardado[prueba] for prueba in PRUEBAS}
+            # La fecha de modificación marca el último uso para podar_cache
+            os.utime(archivo)
+            return nula
+        except (OSError, KeyError, ValueError):
+            pass
+
+    m = len(info['modalidades'])
+    rango = info['maximo'] - info['minimo'] + 1
+    # Bytes por celda (sub-sorteo × número) en el pico de cada etapa:
+    # - generación: uniformes float64 (8) + salida de argpartition int64 (8) + incidencia (1)
+    # - estadísticos: incidencia (1) + copia float32 (4) + los ~10 arrays int64 de los
+    #   huecos, que tienen un elemento por aparición (picks / rango de las celdas)
+    por_celda = max(8 + 8 + 1, 1 + 4 + 80 * info['picks'] / rango)
+    # Por historia: las celdas + la co-ocurrencia float64
+    por_historia = int(sorteos * m * rango * por_celda) + rango * rango * 8
+    lote = max(1, MEMORIA_LOTE // max(por_historia, 1))
+
+    rng = np.random.default_rng(seed)
+    partes = {prueba: [] for prueba in PRUEBAS}
+    for inicio in range(0, simulaciones, lote):
+        b = min(lote, simulaciones - inicio)
+        idx = indices_aleatorios(rng, b * sorteos * m, rango, info['picks'])
+        incidencia = np.zeros((b * sorteos * m, rango), dtype=bool)
+        np.put_along_axis(incidencia, idx, True, axis=1)
+        del idx
+        for prueba, valores in estadisticos(incidencia.reshape(b, sorteos, m, rango), info['picks']).items():
+            partes[prueba].append(valores)
+    nula = {prueba: np.concatenate(valores) for prueba, valores in partes.items()}
+
+    os.makedirs(ALEATORIEDAD_DIR, exist_ok=True)
+    temporal = archivo + '.tmp.npz'
+    np.savez(temporal, **nula)
+    os.replace(temporal, archivo)
+    podar_cache(juego)
+    return nula
+
+
+def p_valor(observado, nula, dos_colas=False):
+    """P-valor Monte Carlo (1 + extremos) / (1 + simulaciones)."""
+    if dos_colas:
+        centro = nula.mean()
+        extremos = np.count_nonzero(np.abs(nula - centro) >= abs(observado - centro))
+    else:
+        extremos = np.count_nonzero(nula >= observado)
+    return (1 + extremos) / (1 + len(nula))
+
+
+def pruebas_aleatoriedad(juego, fecha_limite=None, simulaciones=SIMULACIONES_DEFAULT):
+    """
+    Batería de pruebas de aleatoriedad sobre el histórico: cada estadístico se
+    compara con su distribución nula Monte Carlo (historias simuladas del mismo largo).
+
+    Además de los p-valores, devuelve los números cuya frecuencia se desvía más
+    de 2 desvíos de la esperada, para ubicar qué mueve la prueba de frecuencias.
+    """
+    info = validar_juego(juego)
+    if not 1 <= simulaciones <= SIMULACIONES_MAXIMO:
+        raise ValueError(f"Las simulaciones deben estar entre 1 y {SIMULACIONES_MAXIMO}")
+    sorteos, matriz = cargar_matriz(juego, fecha_limite)
+    if len(sorteos) < 2:
+        raise ValueError("Se necesitan al menos 2 sorteos")
+
+    incidencia = _incidencia_historias(juego, matriz[None])
+    observados = {prueba: float(v[0]) for prueba, v in estadisticos(incidencia, info['picks']).items()}
+    nula = distribucion_nula(juego, len(sorteos), simulaciones)
+
+    rango = info['maximo'] - info['minimo'] + 1
+    T = incidencia.shape[1] * incidencia.shape[2]
+    p = info['picks'] / rango
+    conteos = incidencia[0].reshape(T, rango).sum(axis=0)
+    z = (conteos - T * p) / np.sqrt(T * p * (1 - p))
+    desviados = sorted(np.flatnonzero(np.abs(z) > 2), key=lambda i: -abs(z[i]))
+
+    return {
+        'juego': juego,
+        'sorteos_count': len(sorteos),
+        'simulaciones': simulaciones,
+        'pruebas': {
+            prueba: {
+                'descripcion': descripcion,
+                'estadistico': observados[prueba],
+                'nula_media': float(nula[prueba].mean()),
+                'nula_desvio': float(nula[prueba].std()),
+                'p_valor': p_valor(observados[prueba], nula[prueba], prueba in DOS_COLAS)
+            }
+            for prueba, descripcion in PRUEBAS.items()
+        },
+        'numeros_desviados': {int(i) + info['minimo']: round(float(z[i]), 2) for i in desviados}
+    }
+
+
+def imprimir_aleatoriedad(juego, resultado):
+    """Imprime la batería de pruebas de aleatoriedad."""
+    info = validar_juego(juego)
+    print(f"\n=== PRUEBAS DE ALEATORIEDAD {info['nombre'].upper()} - {resultado['sorteos_count']} sorteos, "
+          f"{resultado['simulaciones']} simulaciones ===")
+    for prueba, r in resultado['pruebas'].items():
+        alerta = "⚠️ " if r['p_valor'] < 0.05 else "✅"
+        print(f"{alerta} {prueba:<13} {r['estadistico']:>10.2f} (nula {r['nula_media']:.2f} ± {r['nula_desvio']:.2f}) "
+              f"→ p = {r['p_valor']:.3f}")
+        print(f"   {r['descripcion']}")
+    if resultado['numeros_desviados']:
+        print("\nNúmeros con frecuencia a más de 2 desvíos: "
+              + ", ".join(f"{n:02d} (z={z:+.2f})" for n, z in resultado['numeros_desviados'].items()))
@@ -0,0 +1,279 @@
+# tombola/backtest.py
+import time
+from collections import deque
+import numpy as np
+from tombola.matriz_sorteos import cargar_matriz, matriz_incidencia, validar_juego
+
+
+class EstadoHistorico:
+    """
+    Estadísticas acumuladas con los sorteos anteriores a la fecha evaluada.
+    Se actualizan de forma incremental: agregar un sorteo cuesta O(rango²),
+    no O(historia), así el backtest no recalcula nada desde cero por fecha.
+
+    - ventana: solo cuenta los últimos `ventana` sorteos (resta el que sale)
+    - decaimiento: factor (0, 1) que multiplica el peso de lo anterior en cada sorteo
+
+    Además de frecuencias y co-ocurrencia lleva las transiciones entre sorteos
+    consecutivos (misma modalidad): cuántas veces cada número salió en un sorteo
+    (base) y cuántas de esas volvió a salir en el siguiente (reapariciones).
+    """
+
+    # Cambia cuando cambian los atributos: invalida los estados guardados en caché
+    VERSION = 2
+
+    def __init__(self, juego, ventana=None, decaimiento=None):
+        info = validar_juego(juego)
+        tam = info['maximo'] + 1
+
+        self.juego = juego
+        self.numeros = np.arange(info['minimo'], info['maximo'] + 1)
+        self.ventana = ventana
+        self.decaimiento = decaimiento
+
+        self.frecuencias = np.zeros(tam)
+        self.coocurrencia = np.zeros((tam, tam))
+        self.reapariciones = np.zeros(tam)
+        self.base_reaparicion = np.zeros(tam)
+        # Incidencia del último sorteo agregado (None = todavía ninguno)
+        self.ultimo = None
+        # Índice del último sub-sorteo en que salió cada número (-1 = nunca)
+        self.ultima_aparicion = np.full(tam, -1, dtype=np.int64)
+        self.sorteos = 0
+        self.subsorteos = 0
+        self._en_ventana = deque()
+
+    def agregar(self, incidencia_sorteo):
+        """Agrega un sorteo: incidencia (modalidades, maximo + 1) booleana."""
+        v = incidencia_sorteo.astype(np.float64)
+        # Transición desde el sorteo anterior (en el primero no hay)
+        if self.ultimo is not None:
+            reaparecen = (self.ultimo & incidencia_sorteo).sum(axis=0, dtype=np.float64)
+            base = self.ultimo.sum(axis=0, dtype=np.float64)
+        else:
+            reaparecen = base = np.zeros(len(self.frecuencias))
+
+        if self.decaimiento:
+            self.frecuencias *= self.decaimiento
+            self.coocurrencia *= self.decaimiento
+            self.reapariciones *= self.decaimiento
+            self.base_reaparicion *= self.decaimiento
+
+        self.frecuencias += v.sum(axis=0)
+        self.coocurrencia += v.T @ v
+        self.reapariciones += reaparecen
+        self.base_reaparicion += base
+
+        if self.ventana:
+            self._en_ventana.append((v, reaparecen, base))
+            if len(self._en_ventana) > self.ventana:
+                # El peso que le queda al sorteo que sale de la ventana
+                peso = (self.decaimiento or 1.0) ** self.ventana
+                viejo, viejo_reaparecen, viejo_base = self._en_ventana.popleft()
+                self.frecuencias -= viejo.sum(axis=0) * peso
+                self.coocurrencia -= (viejo.T @ viejo) * peso
+                self.reapariciones -= viejo_reaparecen * peso
+                self.base_reaparicion -= viejo_base * peso
+
+        self.ultimo = np.asarray(incidencia_sorteo, dtype=bool)
+
+        for m, fila in enumerate(incidencia_sorteo):
+            self.ultima_aparicion[fila] = self.subsorteos + m
+
+        self.sorteos += 1
+        self.subsorteos += len(incidencia_sorteo)
+
+    def omision(self):
+        """Sub-sorteos sin aparecer (igual criterio que calcular_omision)."""
+        return np.where(
+            self.ultima_aparicion >= 0,
+            self.subsorteos - 1 - self.ultima_aparicion,
+            self.subsorteos
+        )
+
+
+    def tasa_reaparicion(self):
+        """
+        Proporción de veces que cada número, habiendo salido, volvió a salir en
+        el sorteo siguiente (picks / rango, lo esperado al azar, si no hay datos).
+        """
+        info = validar_juego(self.juego)
+        esperada = info['picks'] / (info['maximo'] - info['minimo'] + 1)
+        return np.divide(
+            self.reapariciones, self.base_reaparicion,
+            out=np.full(len(self.reapariciones), esperada), where=self.base_reaparicion > 1e-9
+        )
+
+
+def top_numeros(estado, valores, k, mayores=True):
+    """Los k números válidos con mayor (o menor) valor; empates → número más chico."""
+    puntaje = valores[estado.numeros]
+    orden = np.lexsort((estado.numeros, -puntaje if mayores else puntaje))
+    return estado.numeros[orden[:k]]
+
+
+def estrategia_calientes(estado, k):
+    """Los k números con más apariciones."""
+    return top_numeros(estado, estado.frecuencias, k)
+
+
+def estrategia_frios(estado, k):
+    """Los k números con menos apariciones."""
+    return top_numeros(estado, estado.frecuencias, k, mayores=False)
+
+
+def estrategia_omitidos(estado, k):
+    """Los k números que hace más sub-sorteos que no salen."""
+    return top_numeros(estado, estado.omision(), k)
+
+
+def estrategia_pares(estado, k):
+    """Toma los números de los pares que más salieron juntos hasta completar k."""
+    nums = estado.numeros
+    a, b = np.triu_indices(len(nums), k=1)
+    conteos = estado.coocurrencia[nums[a], nums[b]]
+    orden = np.lexsort((b, a, -conteos))
+
+    elegidos = []
+    for i in orden:
+        for n in (nums[a[i]], nums[b[i]]):
+            if n not in elegidos and len(elegidos) < k:
+                elegidos.append(n)
+        if len(elegidos) == k:
+            break
+    return np.array(sorted(elegidos))
+
+
+def estrategia_repetidos(estado, k):
+    """
+    Apuesta a que se repiten números del último sorteo: primero los que
+    salieron en más modalidades del último sorteo y, entre ellos, los de mayor
+    tasa de reaparición histórica; se completa con la tasa de reaparición.
+    """
+    if estado.ultimo is None:
+        return estrategia_calientes(estado, k)
+    en_ultimo = estado.ultimo.sum(axis=0)[estado.numeros]
+    tasa = estado.tasa_reaparicion()[estado.numeros]
+    orden = np.lexsort((estado.numeros, -tasa, -en_ultimo))
+    return estado.numeros[orden[:k]]
+
+
+ESTRATEGIAS = {
+    'calientes': estrategia_calientes,
+    'frios': estrategia_frios,
+    'omitidos': estrategia_omitidos,
+    'pares': estrategia_pares,
+    'repetidos': estrategia_repetidos
+}
+
+
+def _validar_jugada(jugada, estado, k):
+    jugada = np.asarray(jugada, dtype=np.intp)
+    if (len(jugada) != k or len(np.unique(jugada)) != k
+            or jugada.min() < estado.numeros[0] or jugada.max() > estado.numeros[-1]):
+        raise ValueError(f"La estrategia debe devolver {k} números distintos del rango del juego")
+    return jugada
+
+
+def obtener_estrategia(estrategia):
+    """Devuelve (nombre, función) para un nombre de ESTRATEGIAS o una función propia."""
+    if isinstance(estrategia, str):
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"Estrategia '{estrategia}' no reconocida. Disponibles: {', '.join(ESTRATEGIAS)}")
+        return estrategia, ESTRATEGIAS[estrategia]
+    return getattr(estrategia, '__name__', 'custom'), estrategia
+
+
+def recorrer(estrategia, k, incidencia, estado, inicio=0, desde=1):
+    """
+    Avanza el estado desde el sorteo `inicio` hasta el final del histórico.
+    Para cada fecha t >= desde arma la jugada con el estado previo y la puntúa.
+    Devuelve (jugadas, aciertos) de las fechas evaluadas; el estado queda
+    actualizado con todo el histórico, listo para continuar cuando haya sorteos nuevos.
+    """
+    total = len(incidencia)
+    evaluadas = max(0, total - max(desde, inicio))
+    jugadas = np.zeros((evaluadas, k), dtype=np.int8)
+    aciertos = np.zeros((evaluadas, incidencia.shape[1]), dtype=np.int8)
+
+    i = 0
+    for t in range(inicio, total):
+        if t >= desde:
+            jugada = _validar_jugada(estrategia(estado, k), estado, k)
+            jugadas[i] = jugada
+            aciertos[i] = incidencia[t][:, jugada].sum(axis=1)
+            i += 1
+        estado.agregar(incidencia[t])
+
+    return jugadas, aciertos
+
+
+def resumir_aciertos(juego, k, aciertos, segundos=0.0):
+    """Resumen de una serie de aciertos (fechas, modalidades)."""
+    info = validar_juego(juego)
+    rango = info['maximo'] - info['minimo'] + 1
+    return {
+        'fechas_evaluadas': len(aciertos),
+        'promedio_aciertos': aciertos.mean(axis=0).tolist() if len(aciertos) else [],
+        'esperado_azar': k * info['picks'] / rango,
+        'histograma': {
+            m: np.bincount(aciertos[:, i], minlength=k + 1).tolist()
+            for i, m in enumerate(info['modalidades'])
+        },
+        'segundos': segundos
+    }
+
+
+def backtest(juego, estrategia, k=None, ventana=None, decaimiento=None, desde=1, datos=None):
+    """
+    Recorre todo el histórico: en cada fecha arma la jugada de la estrategia usando
+    solo los sorteos anteriores y la compara con el resultado real de esa fecha.
+
+    estrategia: nombre en ESTRATEGIAS o función (estado, k) -> k números.
+    datos: (sorteos, matriz) ya cargados, para no releer el CSV (ej. en barridos).
+
+    Devuelve un dict con las jugadas, los aciertos por fecha y modalidad y un resumen.
+    """
+    info = validar_juego(juego)
+    k = k or info['picks']
+    nombre, funcion = obtener_estrategia(estrategia)
+
+    sorteos, matriz = datos if datos is not None else cargar_matriz(juego)
+    incidencia = matriz_incidencia(matriz, juego)
+    desde = min(desde, len(sorteos))
+
+    inicio = time.perf_counter()
+    estado = EstadoHistorico(juego, ventana, decaimiento)
+    jugadas, aciertos = recorrer(funcion, k, incidencia, estado, desde=desde)
+    segundos = time.perf_counter() - inicio
+
+    return {
+        'juego': juego,
+        'estrategia': nombre,
+        'parametros': {'k': k, 'ventana': ventana, 'decaimiento': decaimiento},
+        'fechas': [s['fecha'] for s in sorteos[desde:]],
+        'jugadas': jugadas,
+        'aciertos': aciertos,
+        'resumen': resumir_aciertos(juego, k, aciertos, segundos)
+    }
+
+
+def imprimir_backtest(resultado):
+    """Imprime el resumen de un backtest."""
+    info = validar_juego(resultado['juego'])
+    resumen = resultado['resumen']
+    params = resultado['parametros']
+
+    print(f"\n=== BACKTEST {info['nombre'].upper()} - ESTRATEGIA '{resultado['estrategia']}' ===")
+    print(f"Parámetros: k={params['k']}, ventana={params['ventana']}, decaimiento={params['decaimiento']}")
+    print(f"Fechas evaluadas: {resumen['fechas_evaluadas']}")
+    print(f"Aciertos esperados al azar: {resumen['esperado_azar']:.2f}")
+
+    for i, modalidad in enumerate(info['modalidades']):
+        promedio = resumen['promedio_aciertos'][i] if resumen['promedio_aciertos'] else 0
+        histograma = resumen['histograma'][modalidad]
+        distribucion = ", ".join(f"{a}: {c}" for a, c in enumerate(histograma) if c)
+        print(f"\n{modalidad.replace('_', ' ').upper()}: promedio {promedio:.2f} aciertos")
+        print(f"  Distribución (aciertos: fechas) → {distribucion}")
+
+    print(f"\n⏱️  {resumen['segundos'] * 1000:.1f} ms")
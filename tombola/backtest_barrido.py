@@ -0,0 +1,183 @@
+# tombola/backtest_barrido.py
+import itertools
+import os
+import pickle
+import time
+from multiprocessing import Pool
+import numpy as np
+from config import BACKTEST_CACHE_DIR
+from tombola.backtest import (
+    ESTRATEGIAS, EstadoHistorico, obtener_estrategia, recorrer, resumir_aciertos
+)
+from tombola.matriz_sorteos import cargar_matriz, matriz_incidencia, validar_juego, version_matriz
+from tombola.paralelo import compartir_array, inicializar_worker, array_compartido, liberar
+
+# Grilla por defecto: None = sin ventana / sin decaimiento
+GRILLA_DEFAULT = {
+    'ventana': [None, 20, 50, 100],
+    'decaimiento': [None, 0.99, 0.95]
+}
+
+
+def configuraciones(juegos, estrategias=None, ks=None, ventanas=None, decaimientos=None):
+    """Producto cartesiano de parámetros: lista de (juego, estrategia, k, ventana, decaimiento)."""
+    estrategias = estrategias or list(ESTRATEGIAS)
+    ventanas = ventanas or GRILLA_DEFAULT['ventana']
+    decaimientos = decaimientos or GRILLA_DEFAULT['decaimiento']
+
+    configs = []
+    for juego in juegos:
+        info = validar_juego(juego)
+        for estrategia in estrategias:
+            obtener_estrategia(estrategia)
+            for k, ventana, decaimiento in itertools.product(ks or [info['picks']], ventanas, decaimientos):
+                configs.append((juego, estrategia, k, ventana, decaimiento))
+    return configs
+
+
+def get_cache_filename(juego, estrategia, k, ventana, decaimiento):
+    """Archivo de caché de una configuración."""
+    nombre = f"{juego}_{estrategia}_k{k}_v{ventana or 0}_d{decaimiento or 0}.pkl"
+    return os.path.join(BACKTEST_CACHE_DIR, nombre)
+
+
+def cargar_resultado(archivo):
+    """Carga la entrada de caché de una configuración (None si no existe o está corrupta)."""
+    if not os.path.exists(archivo):
+        return None
+    try:
+        with open(archivo, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def guardar_resultado(archivo, entrada):
+    """Guarda la entrada de forma atómica (archivo temporal + rename)."""
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    temporal = archivo + '.tmp'
+    with open(temporal, 'wb') as f:
+        pickle.dump(entrada, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, archivo)
+
+
+def evaluar_config(config, matriz, incidencia, desde=1):
+    """
+    Serie de aciertos de una configuración sobre todo el histórico, usando la caché.
+
+    La entrada guarda la versión del dataset (hash de los sorteos usados), la serie
+    de aciertos y el estado final de la estrategia. Si la versión coincide con el
+    prefijo del histórico actual, solo se evalúan las fechas nuevas partiendo de
+    ese estado; si el histórico cambió (ej. se insertó un sorteo viejo) o el estado
+    es de otra versión de EstadoHistorico, se recalcula.
+
+    Devuelve (config, aciertos, fechas_nuevas).
+    """
+    juego, estrategia, k, ventana, decaimiento = config
+    _, funcion = obtener_estrategia(estrategia)
+    archivo = get_cache_filename(*config)
+    total = len(matriz)
+
+    entrada = cargar_resultado(archivo)
+    if (entrada is not None and entrada['desde'] == desde and entrada['sorteos'] <= total
+            and entrada.get('version_estado') == EstadoHistorico.VERSION
+            and entrada['version'] == version_matriz(matriz, entrada['sorteos'])):
+        estado, previos, inicio = entrada['estado'], entrada['aciertos'], entrada['sorteos']
+    else:
+        estado, inicio = EstadoHistorico(juego, ventana, decaimiento), 0
+        previos = np.zeros((0, incidencia.shape[1]), dtype=np.int8)
+
+    if inicio == total:
+        return config, previos, 0
+
+    _, nuevos = recorrer(funcion, k, incidencia, estado, inicio=inicio, desde=desde)
+    aciertos = np.concatenate([previos, nuevos])
+
+    guardar_resultado(archivo, {
+        'clave': config,
+        'version': version_matriz(matriz),
+        'sorteos': total,
+        'desde': desde,
+        'aciertos': aciertos,
+        'estado': estado,
+        'version_estado': EstadoHistorico.VERSION
+    })
+    return config, aciertos, len(nuevos)
+
+
+def _tarea_barrido(config):
+    """Tarea de un worker: lee la matriz e incidencia de su juego desde memoria compartida."""
+    juego = config[0]
+    return evaluar_config(config, array_compartido(f'{juego}_matriz'), array_compartido(f'{juego}_incidencia'))
+
+
+def barrido(juegos=('telekino', 'quini6'), estrategias=None, ks=None, ventanas=None,
+            decaimientos=None, workers=1):
+    """
+    Evalúa la grilla de parámetros de las estrategias sobre el histórico de cada juego.
+
+    Cada juego se carga una vez; con workers > 1 la matriz y su incidencia se
+    comparten (solo lectura) con los procesos y cada configuración es una tarea.
+
+    Devuelve la lista de resultados ordenada por promedio de aciertos (mejor primero).
+    """
+    configs = configuraciones(juegos, estrategias, ks, ventanas, decaimientos)
+    datos = {}
+    for juego in juegos:
+        _, matriz = cargar_matriz(juego)
+        datos[juego] = (matriz, matriz_incidencia(matriz, juego))
+
+    inicio = time.perf_counter()
+    if workers > 1:
+        shms, descriptores = [], {}
+        for juego, (matriz, incidencia) in datos.items():
+            for nombre, arr in (('matriz', matriz), ('incidencia', incidencia)):
+                shm, descriptor = compartir_array(arr)
+                shms.append(shm)
+                descriptores[f'{juego}_{nombre}'] = descriptor
+        try:
+            with Pool(workers, initializer=inicializar_worker, initargs=(descriptores,)) as pool:
+                evaluados = pool.map(_tarea_barrido, configs, chunksize=1)
+        finally:
+            liberar(shms)
+    else:
+        evaluados = [evaluar_config(config, *datos[config[0]]) for config in configs]
+    segundos = time.perf_counter() - inicio
+
+    resultados = []
+    for (juego, estrategia, k, ventana, decaimiento), aciertos, nuevas in evaluados:
+        resumen = resumir_aciertos(juego, k, aciertos)
+        promedio = float(np.mean(resumen['promedio_aciertos'])) if resumen['promedio_aciertos'] else 0.0
+        resultados.append({
+            'juego': juego,
+            'estrategia': estrategia,
+            'parametros': {'k': k, 'ventana': ventana, 'decaimiento': decaimiento},
+            'promedio': promedio,
+            'ventaja': promedio - resumen['esperado_azar'],
+            'fechas_nuevas': nuevas,
+            'resumen': resumen
+        })
+
+    resultados.sort(key=lambda r: (r['juego'], -r['ventaja']))
+    return {'resultados': resultados, 'configuraciones': len(configs), 'segundos': segundos}
+
+
+def imprimir_barrido(barrido_resultado, top=10):
+    """Imprime las mejores configuraciones de cada juego."""
+    resultados = barrido_resultado['resultados']
+    nuevas = sum(r['fechas_nuevas'] for r in resultados)
+
+    print(f"\n=== BARRIDO DE PARÁMETROS ({barrido_resultado['configuraciones']} configuraciones) ===")
+    print(f"Fechas evaluadas en esta corrida: {nuevas} (el resto salió de la caché)")
+
+    for juego in dict.fromkeys(r['juego'] for r in resultados):
+        info = validar_juego(juego)
+        del_juego = [r for r in resultados if r['juego'] == juego]
+        print(f"\n{info['nombre'].upper()} - esperado al azar: {del_juego[0]['resumen']['esperado_azar']:.3f}")
+        print(f"  {'estrategia':<10} {'k':>3} {'ventana':>8} {'decaim.':>8} {'promedio':>9} {'ventaja':>8}")
+        for r in del_juego[:top]:
+            p = r['parametros']
+            print(f"  {r['estrategia']:<10} {p['k']:>3} {str(p['ventana'] or '-'):>8} "
+                  f"{str(p['decaimiento'] or '-'):>8} {r['promedio']:>9.3f} {r['ventaja']:>+8.3f}")
+
+    print(f"\n⏱️  {barrido_resultado['segundos']:.2f} s")
@@ -1,4 +1,20 @@
 from abc import ABC, abstractmethod
+import numpy as np
+from .bitmask import a_bitmask
+
+# Sorteos generados por lote en draw_many / iter_draw_many (acota la memoria temporal)
+CHUNK_SIZE = 100_000
+
+
+def indices_aleatorios(rng, n, range_size, picks):
+    """
+    Índices (n, picks) de n sorteos sin reposición sobre un rango de range_size números.
+    Cada fila elige los `picks` menores de un vector de uniformes: un subconjunto
+    uniforme del rango, obtenido con argpartition en vez de ordenar la fila.
+    """
+    keys = rng.random((n, range_size))
+    return np.argpartition(keys, picks - 1, axis=1)[:, :picks]
+
 
 class BaseGame(ABC):
     """Interfaz general para cualquier juego de lotería."""
@@ -17,3 +33,29 @@ class BaseGame(ABC):
     def picks(self):
         """Devuelve cuántos números se sortean."""
         pass
+
+    def _draw_chunk(self, rng, n):
+        """Lote de n sorteos como array (n, picks), ordenado por fila."""
+        valores = np.asarray(self.num_range(), dtype=np.int8)
+        idx = indices_aleatorios(rng, n, len(valores), self.picks())
+        return valores[np.sort(idx, axis=1)]
+
+    def draw_many(self, n, rng=None, bitmask=False, chunk_size=CHUNK_SIZE):
+        """
+        Devuelve n sorteos aleatorios de una sola vez como array de enteros
+        (n, picks), o sus bitmasks (n,) si bitmask=True.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        if n <= chunk_size:
+            sorteos = self._draw_chunk(rng, n)
+            return a_bitmask(sorteos, max(self.num_range())) if bitmask else sorteos
+        return np.concatenate(list(self.iter_draw_many(n, chunk_size, rng, bitmask)))
+
+    def iter_draw_many(self, n, chunk_size=CHUNK_SIZE, rng=None, bitmask=False):
+        """Igual que draw_many pero genera lotes de hasta chunk_size sorteos (para n muy grandes)."""
+        rng = rng if rng is not None else np.random.default_rng()
+        restantes = n
+        while restantes > 0:
+            lote = min(chunk_size, restantes)
+            yield self.draw_many(lote, rng=rng, bitmask=bitmask, chunk_size=chunk_size)
+            restantes -= lote
@@ -0,0 +1,47 @@
+# tombola/bitmask.py
+import numpy as np
+
+
+def dtype_bitmask(max_numero):
+    """Entero sin signo más chico que tiene un bit para cada número 0..max_numero."""
+    return np.uint32 if max_numero < 32 else np.uint64
+
+
+def a_bitmask(sorteos, max_numero=None):
+    """
+    Convierte un array de números (..., picks) en bitmasks (...): el bit n
+    está prendido si el número n salió. Ej: [1, 3] → 0b1010.
+    """
+    sorteos = np.asarray(sorteos)
+    if max_numero is None:
+        max_numero = int(sorteos.max()) if sorteos.size else 0
+    dtype = dtype_bitmask(max_numero)
+    bits = np.left_shift(dtype(1), sorteos.astype(dtype))
+    return np.bitwise_or.reduce(bits, axis=-1)
+
+
+# Bits prendidos de cada byte (fallback de popcount para NumPy < 2.0)
+_BITS_POR_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(arr):
+    """Cantidad de bits prendidos de cada elemento de un array de enteros sin signo."""
+    arr = np.asarray(arr)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(arr)
+    por_byte = _BITS_POR_BYTE[arr.view(np.uint8)].reshape(arr.shape + (arr.itemsize,))
+    return por_byte.sum(axis=-1, dtype=np.uint8)
+
+
+def bitsets_verticales(incidencia):
+    """
+    Tid-lists como bitsets: a partir de una incidencia booleana (transacciones, números)
+    devuelve (números, palabras) uint64 donde el bit t de la fila n indica que el
+    número n salió en la transacción t.
+    """
+    incidencia = np.asarray(incidencia, dtype=bool)
+    bits = np.packbits(incidencia.T, axis=1, bitorder='little')
+    relleno = (-bits.shape[1]) % 8
+    if relleno:
+        bits = np.pad(bits, ((0, 0), (0, relleno)))
+    return np.ascontiguousarray(bits).view(np.uint64)
@@ -0,0 +1,154 @@
+# tombola/calendario.py
+import os
+import numpy as np
+from config import DATA_DIR
+from tombola.matriz_sorteos import cargar_matriz, validar_juego
+from tombola.probabilidades import chi2_cola
+
+DIAS = ['lunes', 'martes', 'miércoles', 'jueves', 'viernes', 'sábado', 'domingo']
+MESES = ['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio',
+         'agosto', 'septiembre', 'octubre', 'noviembre', 'diciembre']
+AGRUPACIONES = ('dia', 'mes', 'anio')
+
+# Frecuencias agrupadas ya calculadas: {(juego, por): (mtime del CSV, sorteos, etiquetas, datos)}
+_AGRUPADAS = {}
+
+
+def grupos_calendario(fechas, por):
+    """
+    Grupo de cada sorteo a partir de las fechas ya parseadas (datetime64[D]):
+    día de la semana (0 = lunes), mes (0 = enero) o año (0 = el primero).
+    Devuelve (ids int array, etiquetas).
+    """
+    if por not in AGRUPACIONES:
+        raise ValueError(f"Agrupación '{por}' no válida. Disponibles: {', '.join(AGRUPACIONES)}")
+    ordinales = fechas.astype('datetime64[D]').astype(np.int64)
+    if por == 'dia':
+        # El 1970-01-01 (ordinal 0) fue jueves
+        return (ordinales + 3) % 7, DIAS
+    if por == 'mes':
+        return fechas.astype('datetime64[M]').astype(np.int64) % 12, MESES
+    anios = fechas.astype('datetime64[Y]').astype(np.int64) + 1970
+    primero = int(anios.min()) if len(anios) else 1970
+    ultimo = int(anios.max()) if len(anios) else 1969
+    return anios - primero, [str(a) for a in range(primero, ultimo + 1)]
+
+
+def calcular_agrupadas(matriz, grupos, cantidad, juego):
+    """
+    Frecuencia de cada número por grupo y modalidad con un solo bincount sobre
+    el id combinado (grupo, modalidad, número) de todos los números sorteados.
+
+    Devuelve {'frecuencia': (grupos, modalidades, maximo + 1), 'sorteos': (grupos,)}.
+    """
+    info = validar_juego(juego)
+    n, modalidades, picks = matriz.shape
+    tam = info['maximo'] + 1
+    modalidad = np.arange(modalidades)[None, :, None]
+    ids = (np.asarray(grupos)[:, None, None] * modalidades + modalidad) * tam + matriz.astype(np.int64)
+    frecuencia = np.bincount(ids.ravel(), minlength=cantidad * modalidades * tam)
+    return {
+        'frecuencia': frecuencia.reshape(cantidad, modalidades, tam),
+        'sorteos': np.bincount(grupos, minlength=cantidad)
+    }
+
+
+def obtener_agrupadas(juego, por):
+    """
+    Frecuencias agrupadas del juego, recalculadas solo si cambió el CSV (mismo
+    criterio que obtener_series). Devuelve (sorteos, etiquetas, datos).
+    """
+    validar_juego(juego)
+    if por not in AGRUPACIONES:
+        raise ValueError(f"Agrupación '{por}' no válida. Disponibles: {', '.join(AGRUPACIONES)}")
+    mtime = os.path.getmtime(os.path.join(DATA_DIR, f"{juego}.csv"))
+
+    guardado = _AGRUPADAS.get((juego, por))
+    if guardado is None or guardado[0] != mtime:
+        sorteos, matriz = cargar_matriz(juego)
+        fechas = np.array([s['fecha'] for s in sorteos], dtype='datetime64[D]')
+        grupos, etiquetas = grupos_calendario(fechas, por)
+        datos = calcular_agrupadas(matriz, grupos, len(etiquetas), juego)
+        guardado = (mtime, sorteos, etiquetas, datos)
+        _AGRUPADAS[(juego, por)] = guardado
+    return guardado[1], guardado[2], guardado[3]
+
+
+def agrupadas_payload(juego, por, modalidad=None):
+    """
+    Frecuencias por día de la semana, mes o año (solo los grupos con sorteos).
+
+    - Por grupo: sorteos, frecuencia de cada número, esperado con sorteos
+      uniformes (sub-sorteos × picks / rango) y el chi-cuadrado contra ese esperado.
+    - 'homogeneidad': chi-cuadrado de la tabla grupo × número contra las
+      proporciones de todo el histórico (¿el grupo cambia qué números salen?).
+      Los números de un sorteo no son independientes entre sí, así que el
+      p-valor es aproximado.
+
+    Quini 6: todas las modalidades juntas, o solo `modalidad` (nombre).
+    """
+    info = validar_juego(juego)
+    sorteos, etiquetas, datos = obtener_agrupadas(juego, por)
+
+    frecuencia = datos['frecuencia'][..., info['minimo']:]
+    modalidades = len(info['modalidades'])
+    if modalidad is not None:
+        if modalidad not in info['modalidades']:
+            raise ValueError(f"Modalidad '{modalidad}' no válida. Disponibles: {', '.join(info['modalidades'])}")
+        frecuencia = frecuencia[:, info['modalidades'].index(modalidad)]
+        modalidades = 1
+    else:
+        frecuencia = frecuencia.sum(axis=1)
+
+    presentes = np.flatnonzero(datos['sorteos'])
+    if not len(presentes):
+        raise ValueError("No hay sorteos para agrupar")
+    frecuencia = frecuencia[presentes].astype(np.float64)
+    subsorteos = datos['sorteos'][presentes] * modalidades
+    rango = frecuencia.shape[1]
+    numeros = range(info['minimo'], info['maximo'] + 1)
+
+    grupos = []
+    for g, fila, sub in zip(presentes, frecuencia, subsorteos):
+        esperado = sub * info['picks'] / rango
+        grupos.append({
+            'grupo': etiquetas[g],
+            'sorteos': int(datos['sorteos'][g]),
+            'subsorteos': int(sub),
+            'esperado': round(float(esperado), 4),
+            'frecuencias': {n: int(c) for n, c in zip(numeros, fila)},
+            'chi2': round(float(((fila - esperado) ** 2).sum() / esperado), 4)
+        })
+
+    total = frecuencia.sum(axis=0)
+    esperado = np.outer(subsorteos / subsorteos.sum(), total)
+    validos = esperado > 0
+    chi2 = float(((frecuencia - esperado)[validos] ** 2 / esperado[validos]).sum())
+    grados = (len(presentes) - 1) * (int(np.count_nonzero(total)) - 1)
+
+    return {
+        'por': por,
+        'modalidad': modalidad,
+        'sorteos_count': len(sorteos),
+        'grupos': grupos,
+        'homogeneidad': {
+            'chi2': round(chi2, 4),
+            'grados': grados,
+            'p_valor': chi2_cola(chi2, grados) if grados > 0 else None
+        }
+    }
+
+
+def imprimir_agrupadas(juego, payload, top=5):
+    """Imprime, por grupo, los números que más y menos salieron."""
+    info = validar_juego(juego)
+    print(f"\n=== FRECUENCIAS POR {payload['por'].upper()} ({info['nombre'].upper()}, {payload['sorteos_count']} sorteos"
+          f"{', ' + payload['modalidad'] if payload['modalidad'] else ''}) ===")
+    for g in payload['grupos']:
+        orden = sorted(g['frecuencias'].items(), key=lambda x: (-x[1], x[0]))
+        print(f"\n{g['grupo']}: {g['sorteos']} sorteos, esperado {g['esperado']:.1f} por número (χ² {g['chi2']:.1f})")
+        print("  Más: " + ", ".join(f"{n:02d} ({c})" for n, c in orden[:top]))
+        print("  Menos: " + ", ".join(f"{n:02d} ({c})" for n, c in orden[::-1][:top]))
+    h = payload['homogeneidad']
+    if h['p_valor'] is not None:
+        print(f"\nHomogeneidad entre grupos: χ² {h['chi2']:.1f} con {h['grados']} grados → p = {h['p_valor']:.3f}")
@@ -0,0 +1,187 @@
+# tombola/colex.py
+import time
+from itertools import combinations
+from math import comb
+import numpy as np
+from tombola.matriz_sorteos import cargar_matriz, validar_juego
+
+# Índices por lote en las verificaciones exhaustivas (acota la memoria temporal)
+LOTE = 1_000_000
+
+
+def tabla_binomial(n, k):
+    """Tabla C[i, j] = C(i, j) para 0 <= i <= n, 0 <= j <= k (int64)."""
+    tabla = np.zeros((n + 1, k + 1), dtype=np.int64)
+    for i in range(n + 1):
+        for j in range(min(i, k) + 1):
+            tabla[i, j] = comb(i, j)
+    return tabla
+
+
+def rank(combinaciones, tabla):
+    """
+    Rank colex de cada combinación ordenada (…, k) de números 0..n-1:
+    sum C(x_j, j + 1). Es denso: va de 0 a C(n, k) - 1 sin huecos.
+    """
+    combinaciones = np.asarray(combinaciones)
+    k = combinaciones.shape[-1]
+    return sum(tabla[combinaciones[..., j], j + 1] for j in range(k))
+
+
+def unrank(indices, n, k, tabla=None):
+    """
+    Inversa de rank, vectorizada: (…,) índices → (…, k) combinaciones ordenadas.
+    Para cada posición j (de mayor a menor) el número es el mayor x con
+    C(x, j) <= resto, que se obtiene con searchsorted sobre la columna j de la tabla.
+    """
+    tabla = tabla if tabla is not None else tabla_binomial(n, k)
+    resto = np.asarray(indices, dtype=np.int64).copy()
+    combinaciones = np.empty(resto.shape + (k,), dtype=np.int64)
+    for j in range(k, 0, -1):
+        x = np.searchsorted(tabla[:n, j], resto, side='right') - 1
+        combinaciones[..., j - 1] = x
+        resto -= tabla[x, j]
+    return combinaciones
+
+
+def unrank_uno(indice, n, k):
+    """unrank de un solo índice con aritmética de Python (referencia para verificar)."""
+    combinacion = []
+    for j in range(k, 0, -1):
+        x = j - 1
+        while x + 1 < n and comb(x + 1, j) <= indice:
+            x += 1
+        combinacion.append(x)
+        indice -= comb(x, j)
+    return combinacion[::-1]
+
+
+def _parametros(juego):
+    info = validar_juego(juego)
+    n = info['maximo'] - info['minimo'] + 1
+    return info, n, info['picks'], tabla_binomial(n, info['picks'])
+
+
+def rank_jugadas(juego, jugadas):
+    """
+    Índice denso (uint32) de jugadas del juego: array (…, picks) de números del
+    juego, en cualquier orden. C(25, 15) y C(46, 6) entran en 4 bytes.
+    """
+    info, n, k, tabla = _parametros(juego)
+    jugadas = np.sort(np.asarray(jugadas, dtype=np.int64), axis=-1) - info['minimo']
+    if jugadas.shape[-1] != k:
+        raise ValueError(f"Cada jugada debe tener {k} números")
+    if jugadas.size and (jugadas.min() < 0 or jugadas.max() >= n):
+        raise ValueError(f"Números fuera de rango ({info['minimo']}-{info['maximo']})")
+    if jugadas.size and (np.diff(jugadas, axis=-1) == 0).any():
+        raise ValueError("Una jugada tiene números repetidos")
+    return rank(jugadas, tabla).astype(np.uint32)
+
+
+def unrank_jugadas(juego, indices):
+    """Inversa de rank_jugadas: índices → jugadas (…, picks) ordenadas, con los números del juego."""
+    info, n, k, tabla = _parametros(juego)
+    indices = np.asarray(indices, dtype=np.int64)
+    if indices.size and (indices.min() < 0 or indices.max() >= comb(n, k)):
+        raise ValueError(f"Índices fuera de rango (0-{comb(n, k) - 1})")
+    return unrank(indices, n, k, tabla) + info['minimo']
+
+
+def bitmap_sorteados(juego, fecha_limite=None):
+    """
+    Bitmap de todo el espacio de jugadas (C(n, k) bits, ~1,2 MB para Quini 6):
+    el bit i está prendido si la jugada de rank i salió alguna vez (en cualquier modalidad).
+    Consultar si una jugada ya salió es leer un bit.
+    """
+    info, n, k, _ = _parametros(juego)
+    _, matriz = cargar_matriz(juego, fecha_limite)
+    marcados = np.zeros(comb(n, k), dtype=bool)
+    marcados[rank_jugadas(juego, matriz.reshape(-1, k))] = True
+    return np.packbits(marcados, bitorder='little')
+
+
+def salio(bitmap, indices):
+    """True para cada índice cuya jugada está marcada en el bitmap de bitmap_sorteados."""
+    indices = np.asarray(indices, dtype=np.int64)
+    return (bitmap[indices >> 3] >> (indices & 7)) & 1 == 1
+
+
+def verificar_colex(juego, lote=LOTE):
+    """
+    Verificación bit a bit del ranking para un juego:
+
+    - rank(unrank(i)) == i para TODO el espacio, recorrido por lotes
+    - unrank es estrictamente creciente en orden colex y cada combinación está ordenada
+    - unrank coincide con la referencia escalar (math.comb) en una muestra
+    - el orden coincide con itertools.combinations ordenado por tupla invertida
+
+    Devuelve un dict {chequeo: bool}.
+    """
+    info, n, k, tabla = _parametros(juego)
+    total = comb(n, k)
+    resultados = {'ida_y_vuelta': True, 'ordenadas': True, 'colex_creciente': True}
+
+    anterior = None
+    for a in range(0, total, lote):
+        indices = np.arange(a, min(a + lote, total), dtype=np.int64)
+        combinaciones = unrank(indices, n, k, tabla)
+        resultados['ida_y_vuelta'] &= bool(np.array_equal(rank(combinaciones, tabla), indices))
+        resultados['ordenadas'] &= bool((np.diff(combinaciones, axis=1) > 0).all())
+        # Colex: comparar de la última posición a la primera
+        bloque = combinaciones if anterior is None else np.vstack([anterior, combinaciones])
+        invertidas = bloque[:, ::-1]
+        diferencia = invertidas[1:] != invertidas[:-1]
+        primera = diferencia.argmax(axis=1)
+        filas = np.arange(len(primera))
+        resultados['colex_creciente'] &= bool(
+            diferencia.any(axis=1).all()
+            and (invertidas[1:][filas, primera] > invertidas[:-1][filas, primera]).all()
+        )
+        anterior = combinaciones[-1:]
+
+    muestra = np.random.default_rng(0).integers(0, total, 1_000)
+    resultados['referencia_escalar'] = all(
+        list(c) == unrank_uno(int(i), n, k) for i, c in zip(muestra, unrank(muestra, n, k, tabla))
+    )
+
+    # Las primeras C(m, k) combinaciones en colex son todas las de 0..m-1, ordenadas
+    # por su tupla invertida (se compara desde el número más grande)
+    m = max(x for x in range(k, n + 1) if comb(x, k) <= 50_000)
+    esperadas = sorted(combinations(range(m), k), key=lambda c: c[::-1])
+    resultados['orden_itertools'] = bool(np.array_equal(
+        unrank(np.arange(comb(m, k)), n, k, tabla), np.array(esperadas)
+    ))
+    return resultados
+
+
+def benchmark_colex(juego, n_indices=5_000_000, seed=0):
+    """Throughput de rank y unrank vectorizados (índices por segundo) sobre índices aleatorios."""
+    info, n, k, tabla = _parametros(juego)
+    indices = np.random.default_rng(seed).integers(0, comb(n, k), n_indices)
+
+    inicio = time.perf_counter()
+    combinaciones = unrank(indices, n, k, tabla)
+    unrank_seg = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    rankeados = rank(combinaciones, tabla)
+    rank_seg = time.perf_counter() - inicio
+
+    return {
+        'juego': juego,
+        'indices': n_indices,
+        'espacio': comb(n, k),
+        'rank_por_segundo': n_indices / rank_seg,
+        'unrank_por_segundo': n_indices / unrank_seg,
+        'coincide': bool(np.array_equal(rankeados, indices))
+    }
+
+
+def imprimir_verificacion(juego, resultados, benchmark):
+    """Imprime la verificación y el benchmark del ranking colex."""
+    info = validar_juego(juego)
+    print(f"\n=== RANKING COLEX {info['nombre'].upper()} - {benchmark['espacio']:,} jugadas posibles ===")
+    for chequeo, ok in resultados.items():
+        print(f"{'✅' if ok else '❌'} {chequeo.replace('_', ' ')}")
+    print(f"\n⚡ rank: {benchmark['rank_por_segundo']:,.0f}/s | unrank: {benchmark['unrank_por_segundo']:,.0f}/s "
+          f"({benchmark['indices']:,} índices)")
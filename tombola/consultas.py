@@ -0,0 +1,182 @@
+# tombola/consultas.py
+import os
+import numpy as np
+from config import DATA_DIR
+from tombola.bitmask import a_bitmask, popcount
+from tombola.features import cargar_features, COLUMNAS
+from tombola.matriz_sorteos import cargar_matriz, validar_juego
+
+# Columnas de features que se pueden usar como filtro (rango o valor exacto)
+FILTROS = tuple(c for c in COLUMNAS if c != 'decenas')
+
+# Índice en memoria por juego: {juego: (mtime del CSV, índice)}
+_INDICES = {}
+
+
+def indice_sorteos(juego):
+    """
+    Bitmasks (sorteos, modalidades) y columnas de features del histórico.
+    Se arma una vez y se reutiliza mientras el CSV no cambie: una consulta no
+    vuelve a leer el archivo.
+    """
+    validar_juego(juego)
+    csv_path = os.path.join(DATA_DIR, f"{juego}.csv")
+    mtime = os.path.getmtime(csv_path)
+
+    guardado = _INDICES.get(juego)
+    if guardado is None or guardado[0] != mtime:
+        info = validar_juego(juego)
+        sorteos, matriz = cargar_matriz(juego)
+        _, features = cargar_features(juego, (sorteos, matriz))
+        guardado = (mtime, {
+            'fecha': features['fecha'],
+            'sorteo': np.array([s['sorteo'] for s in sorteos]),
+            'matriz': matriz,
+            'bitmasks': a_bitmask(matriz, info['maximo']),
+            'features': features
+        })
+        _INDICES[juego] = guardado
+    return guardado[1]
+
+
+def _validar_numeros(numeros, info):
+    numeros = sorted({int(n) for n in numeros})
+    for n in numeros:
+        if not info['minimo'] <= n <= info['maximo']:
+            raise ValueError(f"Número {n} fuera de rango ({info['minimo']}-{info['maximo']})")
+    return numeros
+
+
+def consultar_sorteos(juego, contiene=None, jugada=None, min_coincidencias=None, filtros=None,
+                      modalidad=None, desde=None, hasta=None, limite=100):
+    """
+    Busca sub-sorteos (sorteo + modalidad) que cumplan todas las condiciones:
+
+    - contiene: números que tienen que estar todos (bitmask & q == q)
+    - jugada + min_coincidencias: al menos n números en común con la jugada (popcount)
+    - filtros: {columna: valor} o {columna: (mínimo, máximo)} sobre las features
+    - modalidad: nombre de modalidad (Quini 6); desde / hasta: fechas YYYY-MM-DD inclusive
+
+    Devuelve un dict con el total de coincidencias y hasta `limite` resultados (los más recientes primero).
+    """
+    info = validar_juego(juego)
+    indice = indice_sorteos(juego)
+    bitmasks = indice['bitmasks']
+    features = indice['features']
+    dtype = bitmasks.dtype.type
+
+    mascara = np.ones(bitmasks.shape, dtype=bool)
+
+    if contiene:
+        q = a_bitmask(_validar_numeros(contiene, info), info['maximo'])
+        mascara &= (bitmasks & dtype(q)) == dtype(q)
+
+    coincidencias = None
+    if jugada:
+        t = a_bitmask(_validar_numeros(jugada, info), info['maximo'])
+        coincidencias = popcount(bitmasks & dtype(t))
+        if min_coincidencias:
+            mascara &= coincidencias >= min_coincidencias
+
+    for columna, condicion in (filtros or {}).items():
+        if columna not in FILTROS:
+            raise ValueError(f"Filtro '{columna}' no reconocido. Disponibles: {', '.join(FILTROS)}")
+        valores = features[columna]
+        if isinstance(condicion, (list, tuple)):
+            minimo, maximo = condicion
+            if minimo is not None:
+                mascara &= valores >= minimo
+            if maximo is not None:
+                mascara &= valores <= maximo
+        else:
+            mascara &= valores == condicion
+
+    if modalidad:
+        if modalidad not in info['modalidades']:
+            raise ValueError(f"Modalidad '{modalidad}' no reconocida. Disponibles: {', '.join(info['modalidades'])}")
+        mascara[:, [m != modalidad for m in info['modalidades']]] = False
+    if desde:
+        mascara &= (indice['fecha'] >= desde)[:, None]
+    if hasta:
+        mascara &= (indice['fecha'] <= hasta)[:, None]
+
+    filas, mods = np.nonzero(mascara)
+    orden = np.lexsort((mods, -filas))[:limite] if limite else np.lexsort((mods, -filas))
+
+    resultados = []
+    for t, m in zip(filas[orden], mods[orden]):
+        resultado = {
+            'fecha': str(indice['fecha'][t]),
+            'sorteo': str(indice['sorteo'][t]),
+            'modalidad': info['modalidades'][m],
+            'numeros': sorted(int(n) for n in indice['matriz'][t, m])
+        }
+        if coincidencias is not None:
+            resultado['coincidencias'] = int(coincidencias[t, m])
+        resultados.append(resultado)
+
+    return {'total': int(len(filas)), 'resultados': resultados}
+
+
+def sorteos_cercanos(juego, jugada, top=10):
+    """
+    Los `top` sub-sorteos históricos con más números en común con la jugada
+    (más coincidencias primero; a igualdad, el más reciente). Un popcount
+    vectorizado sobre todos los bitmasks + argpartition: no ordena el histórico.
+
+    Devuelve (exactos, cercanos): índices (sorteo, modalidad) que coinciden
+    completos, en orden cronológico, y los cercanos con sus coincidencias.
+    """
+    info = validar_juego(juego)
+    numeros = _validar_numeros(jugada, info)
+    if len(numeros) != len(jugada):
+        raise ValueError("La jugada tiene números repetidos")
+
+    indice = indice_sorteos(juego)
+    bitmasks = indice['bitmasks']
+    t = bitmasks.dtype.type(a_bitmask(numeros, info['maximo']))
+    coincidencias = popcount(bitmasks & t).ravel()
+
+    exactos = [divmod(int(i), bitmasks.shape[1]) for i in np.flatnonzero(coincidencias == len(numeros))]
+
+    top = min(top, len(coincidencias))
+    if top <= 0:
+        return exactos, []
+    # Clave única: coincidencias primero y, a igualdad, el sub-sorteo más reciente
+    clave = coincidencias.astype(np.int64) * len(coincidencias) + np.arange(len(coincidencias))
+    mejores = np.argpartition(-clave, top - 1)[:top]
+    mejores = mejores[np.argsort(-clave[mejores])]
+
+    cercanos = []
+    for i in mejores:
+        fila, m = divmod(int(i), bitmasks.shape[1])
+        numeros_sorteo = sorted(int(n) for n in indice['matriz'][fila, m])
+        cercanos.append({
+            'fecha': str(indice['fecha'][fila]),
+            'sorteo': str(indice['sorteo'][fila]),
+            'modalidad': info['modalidades'][m],
+            'coincidencias': int(coincidencias[i]),
+            'numeros': numeros_sorteo,
+            'en_comun': sorted(set(numeros) & set(numeros_sorteo))
+        })
+    return exactos, cercanos
+
+
+def parsear_filtro(valor):
+    """'180:200' → (180, 200), '180:' → (180, None), '8' → 8 (valor exacto)."""
+    if ':' in valor:
+        minimo, maximo = valor.split(':', 1)
+        return (float(minimo) if minimo else None, float(maximo) if maximo else None)
+    return float(valor)
+
+
+def imprimir_consulta(juego, resultado):
+    """Imprime el resultado de una consulta."""
+    info = validar_juego(juego)
+    print(f"\n=== CONSULTA {info['nombre'].upper()}: {resultado['total']} sorteo(s) encontrado(s) ===")
+    for r in resultado['resultados']:
+        modalidad = f" [{r['modalidad'].replace('_', ' ')}]" if len(info['modalidades']) > 1 else ""
+        extra = f" → {r['coincidencias']} en común" if 'coincidencias' in r else ""
+        print(f"{r['fecha']} (#{r['sorteo']}){modalidad}: {' '.join(f'{n:02d}' for n in r['numeros'])}{extra}")
+    if resultado['total'] > len(resultado['resultados']):
+        print(f"... y {resultado['total'] - len(resultado['resultados'])} más")
@@ -0,0 +1,23 @@
+# tombola/derivados.py
+
+
+def actualizar_derivados(juego):
+    """
+    Actualiza los datos derivados que se persisten junto al CSV del juego.
+    Se llama después de guardar un sorteo; un error acá no debe impedir el guardado.
+    """
+    from tombola.temperatura import actualizar_vidas_medias
+    from tombola.features import actualizar_features
+    from tombola.pares_omision import actualizar_pares
+    from tombola.ventana_stats import actualizar_ventanas
+
+    for nombre, actualizar in (
+        ('temperaturas', actualizar_vidas_medias),
+        ('features', actualizar_features),
+        ('omisiones de pares', actualizar_pares),
+        ('ventanas móviles', actualizar_ventanas)
+    ):
+        try:
+            actualizar(juego)
+        except Exception as e:
+            print(f"⚠️  No se pudieron actualizar las {nombre} de {juego}: {e}")
@@ -0,0 +1,250 @@
+# tombola/espacio.py
+import json
+import os
+import time
+from math import comb
+from multiprocessing import Pool
+import numpy as np
+from config import ESPACIO_DIR
+from tombola.bitmask import a_bitmask, dtype_bitmask, popcount
+from tombola.colex import tabla_binomial, unrank
+from tombola.matriz_sorteos import cargar_matriz, validar_juego, version_matriz
+from tombola.paralelo import rangos
+
+# Jugadas por tarea de un worker (cada tarea escribe su tramo del memmap)
+TAREA = 500_000
+# Memoria temporal por lote dentro de una tarea: acota el uso de RAM por worker
+MEMORIA_LOTE = 64 * 1024 * 1024
+
+
+def total_jugadas(juego):
+    """Cantidad de jugadas posibles: C(25, 15) Telekino, C(46, 6) Quini 6."""
+    info = validar_juego(juego)
+    return comb(info['maximo'] - info['minimo'] + 1, info['picks'])
+
+
+def get_espacio_filenames(juego):
+    """(histogramas .npy, metadata .json) del escaneo de un juego."""
+    return (
+        os.path.join(ESPACIO_DIR, f"{juego}_histogramas.npy"),
+        os.path.join(ESPACIO_DIR, f"{juego}_meta.json")
+    )
+
+
+def jugadas_de_indices(juego, inicio, fin, tabla=None):
+    """Jugadas [inicio, fin) del espacio en orden colex como array (n, picks) de números del juego."""
+    info = validar_juego(juego)
+    rango = info['maximo'] - info['minimo'] + 1
+    indices = np.arange(inicio, fin, dtype=np.int64)
+    return unrank(indices, rango, info['picks'], tabla) + info['minimo']
+
+
+def histogramas_jugadas(jugadas_bits, sorteos_bits, picks):
+    """
+    Histograma de aciertos de cada jugada contra todos los sorteos:
+    (n,) bitmasks × (D,) bitmasks → (n, picks + 1) con cuántos sorteos tuvieron 0..picks aciertos.
+    """
+    aciertos = popcount(jugadas_bits[:, None] & sorteos_bits[None, :])
+    filas = np.arange(len(jugadas_bits), dtype=np.int64)[:, None] * (picks + 1)
+    conteo = np.bincount((filas + aciertos).ravel(), minlength=len(jugadas_bits) * (picks + 1))
+    return conteo.reshape(len(jugadas_bits), picks + 1)
+
+
+def _escanear_tramo(tarea):
+    """Tarea de un worker: calcula los histogramas de [inicio, fin) y los escribe en el memmap."""
+    juego, archivo, inicio, fin, sorteos_bits = tarea
+    info = validar_juego(juego)
+    picks = info['picks']
+    tabla = tabla_binomial(info['maximo'] - info['minimo'] + 1, picks)
+    salida = np.load(archivo, mmap_mode='r+')
+
+    # bytes por jugada: AND + popcount + índices del bincount
+    por_jugada = len(sorteos_bits) * (sorteos_bits.itemsize + 1 + 8)
+    lote = max(1, MEMORIA_LOTE // max(por_jugada, 1))
+    for a in range(inicio, fin, lote):
+        b = min(a + lote, fin)
+        jugadas = jugadas_de_indices(juego, a, b, tabla)
+        bits = a_bitmask(jugadas, info['maximo'])
+        salida[a:b] = histogramas_jugadas(bits, sorteos_bits, picks)
+    salida.flush()
+    del salida
+    return fin - inicio
+
+
+def escanear_espacio(juego, workers=1, forzar=False, limite=None):
+    """
+    Recorre todas las jugadas posibles del juego (en orden colex, por tramos) y
+    guarda en un memmap .npy el histograma de aciertos de cada una contra todo el
+    histórico (Quini 6: las 4 modalidades de cada sorteo).
+
+    Cada tramo se calcula en lotes de ~MEMORIA_LOTE bytes, así cada worker usa
+    memoria acotada sin importar el tamaño del espacio. Si el histórico no cambió
+    desde el último escaneo completo, no se recalcula (salvo forzar=True).
+
+    limite: escanear solo las primeras `limite` jugadas (pruebas / mediciones).
+    """
+    info = validar_juego(juego)
+    _, matriz = cargar_matriz(juego)
+    version = version_matriz(matriz)
+    archivo, meta_archivo = get_espacio_filenames(juego)
+    total = total_jugadas(juego) if limite is None else min(limite, total_jugadas(juego))
+
+    if not forzar and os.path.exists(meta_archivo):
+        with open(meta_archivo, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') == version and meta.get('jugadas') == total and meta.get('completo'):
+            meta['cache'] = True
+            return meta
+
+    sorteos_bits = a_bitmask(matriz.reshape(-1, info['picks']), info['maximo']).astype(dtype_bitmask(info['maximo']))
+    dtype = np.uint16 if len(sorteos_bits) < 2 ** 16 else np.uint32
+
+    os.makedirs(ESPACIO_DIR, exist_ok=True)
+    # Se invalida el escaneo anterior antes de truncar el .npy: si este se
+    # interrumpe, la metadata no puede dar por válidos histogramas a medias
+    meta = {'juego': juego, 'version': version, 'jugadas': total, 'completo': False}
+    guardar_meta(meta_archivo, meta)
+    salida = np.lib.format.open_memmap(archivo, mode='w+', dtype=dtype, shape=(total, info['picks'] + 1))
+    del salida
+
+    tareas = [
+        (juego, archivo, a, b, sorteos_bits)
+        for a, b in rangos(total, max(1, -(-total // TAREA)))
+    ]
+
+    inicio = time.perf_counter()
+    if workers > 1:
+        with Pool(workers) as pool:
+            for _ in pool.imap_unordered(_escanear_tramo, tareas):
+                pass
+    else:
+        for tarea in tareas:
+            _escanear_tramo(tarea)
+    segundos = time.perf_counter() - inicio
+
+    meta = {
+        'juego': juego,
+        'version': version,
+        'jugadas': total,
+        'sorteos': len(sorteos_bits),
+        'completo': limite is None,
+        'segundos': segundos,
+        'jugadas_por_segundo': total / segundos if segundos > 0 else None,
+        'cache': False
+    }
+    guardar_meta(meta_archivo, meta)
+    return meta
+
+
+def guardar_meta(meta_archivo, meta):
+    """Escribe la metadata del escaneo de forma atómica (archivo temporal + replace)."""
+    temporal = meta_archivo + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(temporal, meta_archivo)
+
+
+def cargar_histogramas(juego):
+    """
+    Memmap de solo lectura con los histogramas (jugadas, picks + 1) del último
+    escaneo. Solo se acepta un escaneo completo de la versión actual del
+    histórico: uno parcial (limite), interrumpido o anterior a sorteos nuevos
+    daría rankings incompletos o desactualizados.
+    """
+    archivo, meta_archivo = get_espacio_filenames(juego)
+    error = ValueError(f"No hay escaneo del espacio al día para {juego}. "
+                       f"Ejecuta 'python main.py {juego} espacio escanear'.")
+    if not os.path.exists(archivo) or not os.path.exists(meta_archivo):
+        raise error
+    try:
+        with open(meta_archivo, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        raise error
+    if not meta.get('completo') or meta.get('version') != version_matriz(cargar_matriz(juego)[1]):
+        raise error
+    return np.load(archivo, mmap_mode='r')
+
+
+def _clave(histogramas, mejores):
+    """
+    Puntaje comparable de cada jugada: prioriza los aciertos más altos
+    (más veces con picks aciertos, luego picks - 1, ...). Se arma como un
+    número en base (sorteos + 1) con los niveles más altos en las cifras más significativas.
+    """
+    niveles = histogramas.shape[1]
+    base = int(histogramas[0].sum()) + 1 if len(histogramas) else 1
+    # Solo los niveles que entran en un entero de 64 bits, empezando por el más alto
+    usables = max(1, min(niveles, int(63 // np.log2(base + 1))))
+    clave = np.zeros(len(histogramas), dtype=np.int64)
+    for h in range(niveles - 1, niveles - 1 - usables, -1):
+        clave = clave * base + histogramas[:, h].astype(np.int64)
+    return clave if mejores else -clave
+
+
+def ranking_jugadas(juego, top=10, mejores=True, tramo=2_000_000):
+    """
+    Las `top` mejores (o peores) jugadas históricas según su histograma de aciertos.
+    Recorre el memmap por tramos quedándose con los candidatos de cada uno (argpartition).
+    """
+    info = validar_juego(juego)
+    histogramas = cargar_histogramas(juego)
+
+    candidatos_idx, candidatos_clave = [], []
+    for a in range(0, len(histogramas), tramo):
+        bloque = np.asarray(histogramas[a:a + tramo])
+        clave = _clave(bloque, mejores)
+        k = min(top, len(clave))
+        parte = np.argpartition(-clave, k - 1)[:k]
+        candidatos_idx.append(parte + a)
+        candidatos_clave.append(clave[parte])
+
+    idx = np.concatenate(candidatos_idx)
+    clave = np.concatenate(candidatos_clave)
+    orden = np.lexsort((idx, -clave))[:top]
+    elegidos = idx[orden]
+
+    jugadas = unrank(elegidos, info['maximo'] - info['minimo'] + 1, info['picks']) + info['minimo']
+    return [
+        {
+            'indice': int(i),
+            'numeros': [int(n) for n in jugada],
+            'histograma': {a: int(c) for a, c in enumerate(histogramas[i]) if c}
+        }
+        for i, jugada in zip(elegidos, jugadas)
+    ]
+
+
+def jugadas_sin_alcanzar(juego, k, muestra=10, tramo=2_000_000):
+    """Cuántas jugadas nunca llegaron a k o más aciertos, y las primeras `muestra` de ellas."""
+    info = validar_juego(juego)
+    if not 0 < k <= info['picks']:
+        raise ValueError(f"k debe estar entre 1 y {info['picks']}")
+    histogramas = cargar_histogramas(juego)
+
+    total, ejemplos = 0, []
+    for a in range(0, len(histogramas), tramo):
+        bloque = np.asarray(histogramas[a:a + tramo])
+        nunca = np.flatnonzero(bloque[:, k:].sum(axis=1) == 0)
+        total += len(nunca)
+        if len(ejemplos) < muestra:
+            ejemplos.extend((nunca[:muestra - len(ejemplos)] + a).tolist())
+
+    jugadas = unrank(np.array(ejemplos, dtype=np.int64), info['maximo'] - info['minimo'] + 1,
+                                  info['picks']) + info['minimo']
+    return {
+        'k': k,
+        'total': total,
+        'de': len(histogramas),
+        'ejemplos': [[int(n) for n in j] for j in jugadas]
+    }
+
+
+def imprimir_ranking(juego, ranking, mejores=True):
+    """Imprime el ranking de jugadas del espacio."""
+    info = validar_juego(juego)
+    titulo = "MEJORES" if mejores else "PEORES"
+    print(f"\n=== {titulo} {len(ranking)} JUGADAS HISTÓRICAS ({info['nombre'].upper()}) ===")
+    for r in ranking:
+        histograma = ", ".join(f"{a}: {c}" for a, c in sorted(r['histograma'].items(), reverse=True)[:4])
+        print(f"{' '.join(f'{n:02d}' for n in r['numeros'])} → {histograma}")
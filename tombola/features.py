@@ -0,0 +1,162 @@
+# tombola/features.py
+import os
+import numpy as np
+from config import FEATURES_DIR
+from tombola.matriz_sorteos import cargar_matriz, matriz_incidencia, validar_juego, version_matriz
+
+# Columnas (sorteos, modalidades) de la tabla; 'decenas' es (sorteos, modalidades, decenas)
+COLUMNAS = ('suma', 'media', 'impares', 'pares', 'bajos', 'altos', 'corrida_max', 'repetidos', 'decenas')
+
+
+def get_features_filename(juego):
+    """Archivo con la tabla de features persistida de un juego."""
+    return os.path.join(FEATURES_DIR, f"{juego}_features.npz")
+
+
+def calcular_features(matriz, juego, previa=None):
+    """
+    Tabla columnar de features de cada sorteo y modalidad (sub-sorteo):
+
+    - suma, media: suma y promedio de los números
+    - impares, pares: cantidad de números impares / pares
+    - bajos, altos: números en la mitad baja (<= (mínimo + máximo) // 2) / alta del rango
+    - decenas: cuántos números caen en cada decena (0-9, 10-19, ...)
+    - corrida_max: largo de la secuencia más larga de números consecutivos
+    - repetidos: números repetidos del sorteo anterior en la misma modalidad
+      (0 en el primer sorteo, salvo que se pase `previa`: la fila anterior de la matriz)
+
+    Devuelve {columna: array}; todas las columnas tienen primero las dimensiones (sorteos, modalidades).
+    """
+    info = validar_juego(juego)
+    nums = np.sort(matriz.astype(np.int16), axis=-1)
+    picks = nums.shape[-1]
+    mitad = (info['minimo'] + info['maximo']) // 2
+
+    suma = nums.sum(axis=-1, dtype=np.int16)
+    impares = np.count_nonzero(nums % 2, axis=-1).astype(np.int8)
+    bajos = np.count_nonzero(nums <= mitad, axis=-1).astype(np.int8)
+
+    decenas = np.zeros(nums.shape[:-1] + (info['maximo'] // 10 + 1,), dtype=np.int8)
+    for d in range(decenas.shape[-1]):
+        decenas[..., d] = np.count_nonzero(nums // 10 == d, axis=-1)
+
+    # Corrida más larga: recorre las posiciones una vez para todas las filas a la vez
+    consecutivos = np.diff(nums, axis=-1) == 1
+    corrida = np.ones(nums.shape[:-1], dtype=np.int8)
+    corrida_max = corrida.copy()
+    for j in range(picks - 1):
+        corrida = np.where(consecutivos[..., j], corrida + 1, 1).astype(np.int8)
+        corrida_max = np.maximum(corrida_max, corrida)
+
+    incidencia = matriz_incidencia(matriz, juego)
+    anterior = np.zeros_like(incidencia)
+    anterior[1:] = incidencia[:-1]
+    if previa is not None and len(incidencia):
+        anterior[0] = matriz_incidencia(previa[None], juego)[0]
+    repetidos = np.count_nonzero(incidencia & anterior, axis=-1).astype(np.int8)
+
+    return {
+        'suma': suma,
+        'media': suma / picks,
+        'impares': impares,
+        'pares': (picks - impares).astype(np.int8),
+        'bajos': bajos,
+        'altos': (picks - bajos).astype(np.int8),
+        'corrida_max': corrida_max,
+        'repetidos': repetidos,
+        'decenas': decenas
+    }
+
+
+def _features_guardadas(juego, matriz):
+    """Tabla persistida si sigue siendo un prefijo válido del histórico (misma versión), o None."""
+    archivo = get_features_filename(juego)
+    if not os.path.exists(archivo):
+        return None
+    try:
+        with np.load(archivo) as guardado:
+            n = len(guardado['suma'])
+            if n <= len(matriz) and str(guardado['version']) == version_matriz(matriz, n):
+                return {c: guardado[c] for c in COLUMNAS}
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
+def _extender_features(juego, matriz, features):
+    """Agrega a la tabla los sorteos de la matriz que le faltan. Devuelve (features, cambió)."""
+    inicio = 0 if features is None else len(features['suma'])
+    if features is not None and inicio == len(matriz):
+        return features, False
+    previa = matriz[inicio - 1] if inicio > 0 else None
+    nuevas = calcular_features(matriz[inicio:], juego, previa)
+    if inicio == 0:
+        return nuevas, True
+    return {c: np.concatenate([features[c], nuevas[c]]) for c in COLUMNAS}, True
+
+
+def actualizar_features(juego, datos=None):
+    """
+    Carga la tabla persistida y calcula solo los sorteos nuevos (misma lógica de
+    versión del dataset que las temperaturas: si el histórico cambió, se recalcula).
+    Se llama desde actualizar_derivados al guardar cada sorteo.
+
+    Devuelve (sorteos, features); features incluye además 'fecha' (sorteos,).
+    """
+    validar_juego(juego)
+    sorteos, matriz = datos if datos is not None else cargar_matriz(juego)
+    features, cambio = _extender_features(juego, matriz, _features_guardadas(juego, matriz))
+
+    if cambio:
+        archivo = get_features_filename(juego)
+        os.makedirs(FEATURES_DIR, exist_ok=True)
+        temporal = archivo + '.tmp.npz'
+        np.savez(temporal, version=version_matriz(matriz), **features)
+        os.replace(temporal, archivo)
+
+    features['fecha'] = np.array([s['fecha'] for s in sorteos])
+    return sorteos, features
+
+
+def cargar_features(juego, datos=None):
+    """
+    Tabla para las consultas: lee la persistida y, si le faltan sorteos, los
+    calcula en el momento sin escribir nada (la extiende actualizar_features).
+
+    Devuelve (sorteos, features) como actualizar_features.
+    """
+    validar_juego(juego)
+    sorteos, matriz = datos if datos is not None else cargar_matriz(juego)
+    features, _ = _extender_features(juego, matriz, _features_guardadas(juego, matriz))
+    features['fecha'] = np.array([s['fecha'] for s in sorteos])
+    return sorteos, features
+
+
+def distribucion(features, columna, modalidad=None):
+    """
+    Distribución de una columna: {valor: cantidad de sub-sorteos}.
+    modalidad: índice de modalidad (None = todas).
+    """
+    if columna not in COLUMNAS or columna in ('media', 'decenas'):
+        raise ValueError(f"Columna '{columna}' no válida para distribución. "
+                         f"Disponibles: {', '.join(c for c in COLUMNAS if c not in ('media', 'decenas'))}")
+    valores = features[columna]
+    valores = valores[:, modalidad] if modalidad is not None else valores.ravel()
+    conteo = np.bincount(valores.astype(np.intp))
+    return {int(v): int(c) for v, c in enumerate(conteo) if c}
+
+
+def imprimir_distribucion(juego, features, columna):
+    """Imprime la distribución de una columna por modalidad."""
+    info = validar_juego(juego)
+    distribucion(features, columna)  # valida la columna antes de imprimir
+    print(f"\n=== DISTRIBUCIÓN DE '{columna.upper()}' ({info['nombre'].upper()}, {len(features['fecha'])} sorteos) ===")
+    if not len(features['fecha']):
+        print("No hay sorteos.")
+        return
+    for i, modalidad in enumerate(info['modalidades']):
+        valores = features[columna][:, i]
+        dist = distribucion(features, columna, i)
+        print(f"\n{modalidad.replace('_', ' ').upper()}: promedio {valores.mean():.2f}, "
+              f"mín {valores.min()}, máx {valores.max()}")
+        print("  " + ", ".join(f"{v}: {c}" for v, c in dist.items()))
@@ -0,0 +1,217 @@
+# tombola/itemsets.py
+import time
+from collections import Counter
+from itertools import combinations
+from math import comb
+import numpy as np
+from tombola.bitmask import bitsets_verticales, popcount
+from tombola.colex import tabla_binomial, rank, unrank
+from tombola.matriz_sorteos import cargar_matriz, validar_juego
+
+# Transacciones (sub-sorteos) procesadas por lote: acota la memoria temporal
+# a ~lote × C(picks, k) enteros
+LOTE = 20_000
+
+
+def transacciones(matriz, juego):
+    """Sub-sorteos como array (T, picks) ordenado por fila, con números desde 0."""
+    info = validar_juego(juego)
+    sub = matriz.reshape(-1, matriz.shape[-1]).astype(np.int64) - info['minimo']
+    return np.sort(sub, axis=1)
+
+
+def contar_itemsets(trans, rango, k, lote=LOTE):
+    """
+    Soporte de todos los k-itemsets: cada transacción aporta sus C(picks, k)
+    subconjuntos, se convierten a su índice combinatorio y se cuentan con bincount.
+    Devuelve un array de largo C(rango, k).
+    """
+    picks = trans.shape[1]
+    posiciones = np.array(list(combinations(range(picks), k)), dtype=np.intp)
+    tabla = tabla_binomial(rango, k)
+
+    soporte = np.zeros(comb(rango, k), dtype=np.int64)
+    for inicio in range(0, len(trans), lote):
+        subconjuntos = trans[inicio:inicio + lote][:, posiciones]
+        soporte += np.bincount(rank(subconjuntos, tabla).ravel(), minlength=len(soporte))
+    return soporte
+
+
+def contar_itemsets_vertical(trans, rango, k, min_soporte=1):
+    """
+    Mismo resultado que contar_itemsets usando tid-lists verticales: cada número
+    es un bitset de las transacciones donde salió y el soporte de un itemset es
+    el popcount del AND de sus bitsets. Se recorre en profundidad extendiendo
+    prefijos ordenados; el último nivel se calcula vectorizado contra todos los
+    números mayores y un prefijo con soporte < min_soporte no se extiende
+    (ningún superconjunto puede superarlo).
+
+    Los itemsets con un prefijo podado quedan con soporte 0 (todos están por
+    debajo de min_soporte).
+    """
+    incidencia = np.zeros((len(trans), rango), dtype=bool)
+    np.put_along_axis(incidencia, trans, True, axis=1)
+    bits = bitsets_verticales(incidencia)
+    tabla = tabla_binomial(rango, k)
+    soporte = np.zeros(comb(rango, k), dtype=np.int64)
+
+    def extender(prefijo, prefijo_bits, nivel):
+        ultimo = prefijo[-1] if prefijo else -1
+        siguientes = np.arange(ultimo + 1, rango - (k - nivel))
+        if len(siguientes) == 0:
+            return
+        conteos = popcount(prefijo_bits & bits[siguientes]).sum(axis=1, dtype=np.int64)
+        if nivel == k:
+            base = sum(int(tabla[x, j + 1]) for j, x in enumerate(prefijo))
+            soporte[base + tabla[siguientes, k]] = conteos
+            return
+        for x, c in zip(siguientes, conteos):
+            if c >= min_soporte:
+                extender(prefijo + [int(x)], prefijo_bits & bits[x], nivel + 1)
+
+    extender([], np.full(bits.shape[1], np.iinfo(np.uint64).max, dtype=np.uint64), 1)
+    return soporte
+
+
+def metodo_conveniente(picks, rango, k):
+    """
+    'conteo' genera C(picks, k) índices por transacción; 'vertical' hace
+    ~C(rango, k) popcounts de T / 64 palabras. Elige el de menos trabajo.
+    """
+    return 'vertical' if comb(picks, k) * 16 > comb(rango, k) else 'conteo'
+
+
+def top_itemsets(soporte, rango, k, top=20, min_soporte=1, minimo=0):
+    """Los `top` itemsets con soporte >= min_soporte (mayor soporte primero, luego menor índice)."""
+    candidatos = np.flatnonzero(soporte >= min_soporte)
+    if top and len(candidatos) > top:
+        # Clave única (soporte, -índice) para que los empates en el corte respeten el orden
+        clave = soporte[candidatos] * len(soporte) + (len(soporte) - 1 - candidatos)
+        candidatos = candidatos[np.argpartition(-clave, top - 1)[:top]]
+    orden = candidatos[np.lexsort((candidatos, -soporte[candidatos]))]
+    return [
+        ([int(n) + minimo for n in itemset], int(soporte[i]))
+        for i, itemset in zip(orden, unrank(orden, rango, k))
+    ]
+
+
+def minar_itemsets(juego, k=3, top=20, min_soporte=1, fecha_limite=None, matriz=None, metodo=None):
+    """
+    Tríos (k=3), cuartetos (k=4), etc. que más salieron juntos en el histórico.
+    Quini 6 cuenta sub-sorteos, igual que calcular_coocurrencia.
+
+    metodo: 'conteo' (índice combinatorio + bincount) o 'vertical' (tid-lists);
+    por defecto el que menos trabajo hace para el juego y k.
+
+    Devuelve un dict con los itemsets más frecuentes y el tiempo de cálculo.
+    """
+    info = validar_juego(juego)
+    if not 2 <= k <= info['picks']:
+        raise ValueError(f"k debe estar entre 2 y {info['picks']}")
+    if matriz is None:
+        _, matriz = cargar_matriz(juego, fecha_limite)
+
+    rango = info['maximo'] - info['minimo'] + 1
+    metodo = metodo or metodo_conveniente(info['picks'], rango, k)
+    inicio = time.perf_counter()
+    trans = transacciones(matriz, juego)
+    if metodo == 'vertical':
+        soporte = contar_itemsets_vertical(trans, rango, k, min_soporte)
+    else:
+        soporte = contar_itemsets(trans, rango, k)
+    itemsets = top_itemsets(soporte, rango, k, top, min_soporte, info['minimo'])
+    segundos = time.perf_counter() - inicio
+
+    return {
+        'k': k,
+        'metodo': metodo,
+        'transacciones': len(trans),
+        'posibles': len(soporte),
+        'con_soporte': int(np.count_nonzero(soporte >= max(min_soporte, 1))),
+        'itemsets': itemsets,
+        'segundos': segundos
+    }
+
+
+def _contar_ingenuo(trans, k):
+    """Conteo de referencia con combinations + Counter (el enfoque de calcular_coocurrencia)."""
+    conteo = Counter()
+    for nums in trans.tolist():
+        conteo.update(combinations(nums, k))
+    return conteo
+
+
+def benchmark_itemsets(juego, n=50_000, ks=(3, 4), muestra_ingenua=2_000, seed=0):
+    """
+    Mide el conteo vectorizado sobre un histórico sintético de n sorteos
+    (generado con draw_many) y lo compara con el conteo ingenuo sobre una
+    muestra, extrapolado a n. Corre los dos métodos y verifica que los tres
+    den los mismos soportes.
+    """
+    from tombola.telekino import Telekino
+    from tombola.quini6 import Quini6
+
+    info = validar_juego(juego)
+    game = Telekino() if juego == 'telekino' else Quini6()
+    matriz = game.draw_many(n, rng=np.random.default_rng(seed)).reshape(n, -1, info['picks'])
+    trans = transacciones(matriz, juego)
+    rango = info['maximo'] - info['minimo'] + 1
+
+    resultados = []
+    for k in ks:
+        tiempos = {}
+        for metodo, contar in (('conteo', contar_itemsets), ('vertical', contar_itemsets_vertical)):
+            inicio = time.perf_counter()
+            soporte = contar(trans, rango, k)
+            tiempos[metodo] = time.perf_counter() - inicio
+            if metodo == 'conteo':
+                referencia = soporte
+            else:
+                coincide_metodos = np.array_equal(soporte, referencia)
+
+        muestra = trans[:muestra_ingenua]
+        inicio = time.perf_counter()
+        ingenuo = _contar_ingenuo(muestra, k)
+        ingenuo_seg = (time.perf_counter() - inicio) * len(trans) / len(muestra)
+
+        esperado = contar_itemsets(muestra, rango, k)
+        tabla = tabla_binomial(rango, k)
+        coincide = all(esperado[rank(np.array(c), tabla)] == v for c, v in ingenuo.items())
+        coincide = coincide and sum(ingenuo.values()) == esperado.sum() and coincide_metodos
+
+        mejor = min(tiempos.values())
+        resultados.append({
+            'k': k,
+            'conteo_seg': tiempos['conteo'],
+            'vertical_seg': tiempos['vertical'],
+            'metodo_elegido': metodo_conveniente(info['picks'], rango, k),
+            'ingenuo_seg_estimado': ingenuo_seg,
+            'aceleracion': ingenuo_seg / mejor if mejor > 0 else float('inf'),
+            'coincide': coincide
+        })
+
+    return {'juego': juego, 'sorteos': n, 'transacciones': len(trans), 'resultados': resultados}
+
+
+def imprimir_itemsets(juego, resultado):
+    """Imprime los itemsets más frecuentes."""
+    info = validar_juego(juego)
+    print(f"\n=== TOP {len(resultado['itemsets'])} - GRUPOS DE {resultado['k']} NÚMEROS MÁS FRECUENTES "
+          f"({info['nombre'].upper()}) ===")
+    print(f"Método: {resultado['metodo']} | transacciones: {resultado['transacciones']} | grupos posibles: {resultado['posibles']} "
+          f"| con soporte: {resultado['con_soporte']}")
+    for itemset, soporte in resultado['itemsets']:
+        print(f"{'-'.join(f'{n:02d}' for n in itemset)} → {soporte} veces")
+    print(f"\n⏱️  {resultado['segundos'] * 1000:.1f} ms")
+
+
+def imprimir_benchmark(resultado):
+    """Imprime el benchmark del conteo de itemsets."""
+    info = validar_juego(resultado['juego'])
+    print(f"\n=== BENCHMARK ITEMSETS {info['nombre'].upper()} - {resultado['sorteos']:,} sorteos sintéticos "
+          f"({resultado['transacciones']:,} transacciones) ===")
+    for r in resultado['resultados']:
+        estado = "✅" if r['coincide'] else "❌"
+        print(f"k={r['k']}: conteo {r['conteo_seg']:.2f} s | vertical {r['vertical_seg']:.2f} s "
+              f"| ingenuo ~{r['ingenuo_seg_estimado']:.2f} s (estimado) | x{r['aceleracion']:.1f} "
+              f"| elegido: {r['metodo_elegido']} | {estado} mismos soportes")
@@ -0,0 +1,78 @@
+# tombola/matriz_sorteos.py
+import hashlib
+import numpy as np
+
+# Parámetros de cada juego. Telekino se modela con una sola "modalidad" para que
+# ambos juegos compartan la forma (sorteos, modalidades, picks).
+JUEGOS = {
+    'telekino': {
+        'nombre': 'Telekino',
+        'minimo': 1,
+        'maximo': 25,
+        'picks': 15,
+        'modalidades': ['telekino']
+    },
+    'quini6': {
+        'nombre': 'Quini 6',
+        'minimo': 0,
+        'maximo': 45,
+        'picks': 6,
+        'modalidades': ['tradicional', 'segunda', 'revancha', 'siempre_sale']
+    }
+}
+
+
+def validar_juego(juego):
+    """Lanza ValueError si el juego no existe."""
+    if juego not in JUEGOS:
+        raise ValueError(f"Juego '{juego}' no reconocido. Juegos disponibles: {', '.join(JUEGOS)}")
+    return JUEGOS[juego]
+
+
+def numeros_juego(juego):
+    """Array con todos los números válidos del juego (ej. 1..25 para Telekino)."""
+    info = validar_juego(juego)
+    return np.arange(info['minimo'], info['maximo'] + 1)
+
+
+def cargar_matriz(juego, fecha_limite=None):
+    """
+    Carga el histórico del juego una sola vez como array.
+
+    Devuelve:
+    - lista de sorteos (dicts, en el orden del CSV: del más viejo al más nuevo)
+    - matriz int8 (sorteos, modalidades, picks): (N, 1, 15) Telekino, (N, 4, 6) Quini 6
+    """
+    info = validar_juego(juego)
+
+    if juego == 'telekino':
+        from tombola.telekino import load_data
+    else:
+        from tombola.quini6 import load_data
+
+    sorteos, numeros_por_sorteo = load_data(fecha_limite)
+    matriz = np.array(numeros_por_sorteo, dtype=np.int8).reshape(
+        len(sorteos), len(info['modalidades']), info['picks']
+    )
+    return sorteos, matriz
+
+
+def matriz_incidencia(matriz, juego):
+    """
+    Matriz booleana (..., maximo + 1) indexada directamente por número:
+    incidencia[..., n] es True si el número n salió.
+    """
+    info = validar_juego(juego)
+    incidencia = np.zeros(matriz.shape[:-1] + (info['maximo'] + 1,), dtype=bool)
+    np.put_along_axis(incidencia, matriz.astype(np.intp), True, axis=-1)
+    return incidencia
+
+
+def version_matriz(matriz, n=None):
+    """
+    Versión del dataset: hash de los primeros n sorteos de la matriz (todos por defecto).
+    Agregar un sorteo nuevo al final no cambia la versión del prefijo anterior,
+    lo que permite reutilizar resultados calculados sobre ese prefijo.
+    """
+    n = len(matriz) if n is None else n
+    return hashlib.sha1(np.ascontiguousarray(matriz[:n]).tobytes()).hexdigest()[:16]
@@ -0,0 +1,71 @@
+# tombola/paralelo.py
+import numpy as np
+from collections import deque
+from multiprocessing import shared_memory
+
+# Arrays compartidos adjuntados en cada proceso worker: {nombre: (shm, array)}
+_COMPARTIDOS = {}
+
+
+def compartir_array(arr):
+    """
+    Copia un array a memoria compartida.
+    Devuelve (shm, descriptor); el descriptor es lo único que viaja a los workers.
+    El llamador debe hacer shm.close() y shm.unlink() al terminar.
+    """
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    destino = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    destino[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def adjuntar_array(descriptor):
+    """Adjunta (solo lectura) un array compartido a partir de su descriptor."""
+    nombre, shape, dtype = descriptor
+    shm = shared_memory.SharedMemory(name=nombre)
+    arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    arr.flags.writeable = False
+    return shm, arr
+
+
+def inicializar_worker(descriptores):
+    """Initializer del Pool: adjunta los arrays compartidos una sola vez por proceso."""
+    for clave, descriptor in descriptores.items():
+        _COMPARTIDOS[clave] = adjuntar_array(descriptor)
+
+
+def array_compartido(clave):
+    """Devuelve un array compartido adjuntado por inicializar_worker."""
+    return _COMPARTIDOS[clave][1]
+
+
+def liberar(shms):
+    """Cierra y elimina los bloques de memoria compartida creados por compartir_array."""
+    for shm in shms:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def rangos(total, partes):
+    """Divide [0, total) en hasta `partes` rangos contiguos (inicio, fin) de tamaño parecido."""
+    partes = max(1, min(partes, total))
+    limites = np.linspace(0, total, partes + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+
+
+def imap_acotado(pool, funcion, iterable, en_vuelo):
+    """
+    Como Pool.imap (resultados en orden) pero con como mucho `en_vuelo` tareas
+    pendientes: Pool.imap consume el iterable completo de entrada, esto no.
+    """
+    pendientes = deque()
+    for item in iterable:
+        pendientes.append(pool.apply_async(funcion, (item,)))
+        if len(pendientes) >= en_vuelo:
+            yield pendientes.popleft().get()
+    while pendientes:
+        yield pendientes.popleft().get()
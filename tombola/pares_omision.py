@@ -0,0 +1,185 @@
+# tombola/pares_omision.py
+import os
+from itertools import combinations
+import numpy as np
+from config import DATA_DIR, PARES_DIR
+from tombola.matriz_sorteos import cargar_matriz, validar_juego, version_matriz
+
+
+def get_pares_filename(juego):
+    """Archivo con la omisión de pares persistida de un juego."""
+    return os.path.join(PARES_DIR, f"{juego}_pares.npz")
+
+
+def estado_vacio(juego):
+    """
+    Estado de la omisión de pares, matrices (maximo + 1, maximo + 1) indexadas
+    por número (solo se usa el triángulo a < b):
+
+    - ultima: último sub-sorteo en que el par salió junto (-1 = nunca)
+    - demora_maxima: máximo de sub-sorteos seguidos sin salir juntos, entre dos
+      apariciones (mismo criterio que calcular_demora_maxima para números)
+    - subsorteos: cuántos sub-sorteos se procesaron
+    """
+    info = validar_juego(juego)
+    tam = info['maximo'] + 1
+    return {
+        'ultima': np.full((tam, tam), -1, dtype=np.int32),
+        'demora_maxima': np.zeros((tam, tam), dtype=np.int32),
+        'subsorteos': 0
+    }
+
+
+def extender_pares(matriz, estado):
+    """
+    Agrega los sorteos de la matriz (sorteos, modalidades, picks) al estado.
+    Cada sub-sorteo toca solo sus C(picks, 2) pares (105 Telekino, 15 Quini 6):
+    cierra el hueco de cada par y actualiza su último índice.
+    """
+    picks = matriz.shape[-1]
+    posiciones = np.array(list(combinations(range(picks), 2)), dtype=np.intp)
+    sub = np.sort(matriz.reshape(-1, picks).astype(np.intp), axis=1)
+    ultima, demora = estado['ultima'], estado['demora_maxima']
+
+    s = estado['subsorteos']
+    for nums in sub:
+        a, b = nums[posiciones[:, 0]], nums[posiciones[:, 1]]
+        previa = ultima[a, b]
+        hueco = np.where(previa >= 0, s - previa - 1, 0)
+        demora[a, b] = np.maximum(demora[a, b], hueco)
+        ultima[a, b] = s
+        s += 1
+    estado['subsorteos'] = s
+    return estado
+
+
+def actualizar_pares(juego, datos=None):
+    """
+    Carga la omisión de pares persistida y agrega solo los sorteos nuevos
+    (misma lógica de versión del dataset que las temperaturas y las features:
+    si el histórico cambió, se recalcula desde cero).
+
+    Guarda también la fecha de modificación del CSV, para que pares_atrasados
+    pueda comprobar que el estado está al día sin volver a leerlo.
+
+    Devuelve (sorteos, estado).
+    """
+    info = validar_juego(juego)
+    mtime = mtime_csv(juego)
+    sorteos, matriz = datos if datos is not None else cargar_matriz(juego)
+    archivo = get_pares_filename(juego)
+    modalidades = len(info['modalidades'])
+
+    estado, procesados, al_dia = None, 0, False
+    if os.path.exists(archivo):
+        try:
+            with np.load(archivo) as guardado:
+                n = int(guardado['sorteos'])
+                if n <= len(matriz) and str(guardado['version']) == version_matriz(matriz, n):
+                    estado = {
+                        'ultima': guardado['ultima'],
+                        'demora_maxima': guardado['demora_maxima'],
+                        'subsorteos': n * modalidades
+                    }
+                    procesados = n
+                    al_dia = 'mtime' in guardado and float(guardado['mtime']) == mtime
+        except (OSError, KeyError, ValueError):
+            estado = None
+
+    if estado is not None and procesados == len(matriz) and al_dia:
+        return sorteos, estado
+
+    if estado is None:
+        estado, procesados = estado_vacio(juego), 0
+    extender_pares(matriz[procesados:], estado)
+
+    os.makedirs(PARES_DIR, exist_ok=True)
+    temporal = archivo + '.tmp.npz'
+    np.savez(temporal, ultima=estado['ultima'], demora_maxima=estado['demora_maxima'],
+             sorteos=len(matriz), version=version_matriz(matriz), mtime=mtime)
+    os.replace(temporal, archivo)
+    return sorteos, estado
+
+
+def mtime_csv(juego):
+    """Fecha de modificación del CSV del juego (mismo criterio que indice_sorteos)."""
+    return os.path.getmtime(os.path.join(DATA_DIR, f"{juego}.csv"))
+
+
+def cargar_pares(juego):
+    """
+    Lee la omisión de pares persistida sin tocar el CSV si se guardó con la
+    fecha de modificación actual del CSV (el caso normal: actualizar_derivados
+    la extiende al guardar cada sorteo). Si no está o no coincide (deploy nuevo,
+    CSV copiado o editado a mano) se pone al día con actualizar_pares, que solo
+    agrega los sorteos nuevos.
+
+    Devuelve (cantidad de sorteos, estado).
+    """
+    info = validar_juego(juego)
+    archivo = get_pares_filename(juego)
+    try:
+        with np.load(archivo) as guardado:
+            if float(guardado['mtime']) == mtime_csv(juego):
+                n = int(guardado['sorteos'])
+                return n, {
+                    'ultima': guardado['ultima'],
+                    'demora_maxima': guardado['demora_maxima'],
+                    'subsorteos': n * len(info['modalidades'])
+                }
+    except (OSError, KeyError, ValueError):
+        pass
+    sorteos, estado = actualizar_pares(juego)
+    return len(sorteos), estado
+
+
+def omision_pares(estado):
+    """Sub-sorteos desde la última vez que cada par salió junto (subsorteos si nunca)."""
+    ultima = estado['ultima']
+    return np.where(ultima >= 0, estado['subsorteos'] - 1 - ultima, estado['subsorteos'])
+
+
+def pares_atrasados(juego, top=20):
+    """
+    Los `top` pares que hace más sub-sorteos que no salen juntos, leyendo el
+    estado persistido (sin leer el CSV si está al día). Para cada par informa también
+    su demora máxima histórica y si la omisión actual ya la supera.
+    """
+    info = validar_juego(juego)
+    if top < 1:
+        raise ValueError("top debe ser al menos 1")
+    sorteos_count, estado = cargar_pares(juego)
+    omision = omision_pares(estado)
+
+    a, b = np.triu_indices(info['maximo'] + 1, k=1)
+    validos = a >= info['minimo']
+    a, b = a[validos], b[validos]
+    orden = np.lexsort((b, a, -omision[a, b]))[:top]
+
+    return {
+        'sorteos_count': sorteos_count,
+        'subsorteos_count': int(estado['subsorteos']),
+        'pares_count': len(a),
+        'pares': [
+            {
+                'par': f"{a[i]}-{b[i]}",
+                'omision': int(omision[a[i], b[i]]),
+                'demora_maxima': int(estado['demora_maxima'][a[i], b[i]]),
+                'nunca': bool(estado['ultima'][a[i], b[i]] < 0),
+                'record': bool(omision[a[i], b[i]] > estado['demora_maxima'][a[i], b[i]])
+            }
+            for i in orden
+        ]
+    }
+
+
+def imprimir_pares_atrasados(juego, resultado):
+    """Imprime los pares más atrasados."""
+    info = validar_juego(juego)
+    unidad = 'sub-sorteos' if len(info['modalidades']) > 1 else 'sorteos'
+    print(f"\n=== TOP {len(resultado['pares'])} PARES MÁS ATRASADOS ({info['nombre'].upper()}, "
+          f"{resultado['pares_count']} pares) ===")
+    for p in resultado['pares']:
+        marca = " (nunca salieron juntos)" if p['nunca'] else (" ⚠️ récord" if p['record'] else "")
+        print(f"{p['par']:>6}: {p['omision']} {unidad} sin salir juntos "
+              f"(demora máxima {p['demora_maxima']}){marca}")
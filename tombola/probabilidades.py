@@ -0,0 +1,269 @@
+# tombola/probabilidades.py
+import math
+from fractions import Fraction
+import numpy as np
+from tombola.bitmask import a_bitmask, dtype_bitmask
+from tombola.espacio import histogramas_jugadas
+from tombola.matriz_sorteos import cargar_matriz, validar_juego
+
+# Tablas hipergeométricas ya calculadas: (juego, números por jugada) → tabla
+_TABLAS = {}
+# Esperado mínimo por categoría para que el chi-cuadrado sea confiable
+ESPERADO_MINIMO = 5
+
+
+def tabla_hipergeometrica(juego, tamano=None):
+    """
+    Probabilidad exacta de acertar k números (k = 0..picks) con una jugada de
+    `tamano` números (por defecto los picks del juego) en un sorteo:
+
+        P(k) = C(tamano, k) · C(rango - tamano, picks - k) / C(rango, picks)
+
+    Se calcula una sola vez por juego y tamaño con enteros exactos (Fraction) y
+    queda memorizada. Devuelve un dict con las fracciones, los floats y 1 en N.
+    """
+    info = validar_juego(juego)
+    picks = info['picks']
+    rango = info['maximo'] - info['minimo'] + 1
+    tamano = picks if tamano is None else tamano
+    if not picks <= tamano <= rango:
+        raise ValueError(f"La jugada debe tener entre {picks} y {rango} números")
+
+    clave = (juego, tamano)
+    if clave not in _TABLAS:
+        total = math.comb(rango, picks)
+        exactas = [
+            Fraction(math.comb(tamano, k) * math.comb(rango - tamano, picks - k), total)
+            for k in range(picks + 1)
+        ]
+        _TABLAS[clave] = {
+            'tamano': tamano,
+            'exactas': exactas,
+            'probabilidades': np.array([float(p) for p in exactas]),
+            'uno_en': [float(1 / p) if p else None for p in exactas]
+        }
+    return _TABLAS[clave]
+
+
+def aciertos_esperados(juego, jugadas, sorteos, tamano=None):
+    """
+    Cantidad esperada de eventos de k aciertos (k = 0..picks) para `jugadas`
+    jugadas contra `sorteos` sorteos (Quini 6: sub-sorteos, cada modalidad cuenta).
+    Es exacta por linealidad aunque las jugadas compartan números.
+    """
+    return jugadas * sorteos * tabla_hipergeometrica(juego, tamano)['probabilidades']
+
+
+def _suma_pmf(desde, n, p, paso):
+    """
+    Suma la pmf Binomial(n, p) desde `desde` en dirección `paso` (+1 / -1) hasta
+    que los términos se vuelven despreciables, en espacio logarítmico.
+    """
+    log_p, log_q = math.log(p), math.log1p(-p)
+    termino = (math.lgamma(n + 1) - math.lgamma(desde + 1) - math.lgamma(n - desde + 1)
+               + desde * log_p + (n - desde) * log_q)
+    total, x = 0.0, desde
+    while 0 <= x <= n:
+        valor = math.exp(termino)
+        total += valor
+        if valor < total * 1e-17:
+            break
+        # pmf(x + 1) / pmf(x) = (n - x) / (x + 1) · p / q
+        if paso > 0 and x < n:
+            termino += math.log(n - x) - math.log(x + 1) + log_p - log_q
+        elif paso < 0 and x > 0:
+            termino -= math.log(n - x + 1) - math.log(x) + log_p - log_q
+        x += paso
+    return total
+
+
+def cola_binomial(observado, n, p):
+    """
+    P(X >= observado) con X ~ Binomial(n, p). Suma la cola más corta (la de
+    arriba si observado supera la media, si no la de abajo y resta de 1), así
+    es estable y rápida para p muy chicas y n grandes.
+    """
+    if observado <= 0:
+        return 1.0
+    if observado > n or p <= 0:
+        return 0.0
+    if p >= 1:
+        return 1.0
+    if observado >= n * p:
+        return min(1.0, _suma_pmf(observado, n, p, 1))
+    return max(0.0, 1.0 - _suma_pmf(observado - 1, n, p, -1))
+
+
+def chi2_cola(estadistico, grados):
+    """
+    P(χ² >= estadistico) con `grados` grados de libertad enteros, por la forma
+    cerrada de la distribución chi-cuadrado (sin scipy). Los términos de la
+    serie se suman en escala logarítmica: con estadísticos grandes (x > ~700)
+    x^i / i! desborda a inf aunque la probabilidad sea chica pero finita.
+    """
+    if grados < 1:
+        return 1.0
+    if estadistico <= 0:
+        return 1.0
+    x = estadistico / 2
+    log_x = math.log(x)
+    if grados % 2 == 0:
+        # e^-x · Σ_{i < grados/2} x^i / i!
+        logs = [i * log_x - math.lgamma(i + 1) - x for i in range(grados // 2)]
+        base = 0.0
+    else:
+        # erfc(√x) + e^-x · Σ_{i < (grados-1)/2} x^(i+1/2) / Γ(i + 3/2)
+        logs = [(i + 0.5) * log_x - math.lgamma(i + 1.5) - x for i in range((grados - 1) // 2)]
+        base = math.erfc(math.sqrt(x))
+    if not logs:
+        return min(1.0, base)
+    maximo = max(logs)
+    serie = math.exp(maximo + math.log(sum(math.exp(t - maximo) for t in logs)))
+    return min(1.0, base + serie)
+
+
+def _agrupar_cola(esperado, observado, minimo=ESPERADO_MINIMO):
+    """
+    Junta las categorías de más aciertos (las improbables) hasta que cada grupo
+    tenga esperado >= minimo. Devuelve (esperado, observado, etiquetas).
+    """
+    esperado_g, observado_g, etiquetas = [], [], []
+    acumulado_e, acumulado_o, desde = 0.0, 0, None
+    for k in range(len(esperado) - 1, -1, -1):
+        acumulado_e += esperado[k]
+        acumulado_o += observado[k]
+        desde = k if desde is None else desde
+        if acumulado_e >= minimo or k == 0:
+            esperado_g.append(acumulado_e)
+            observado_g.append(acumulado_o)
+            etiquetas.append(str(k) if k == desde else f"{k}-{desde}")
+            acumulado_e, acumulado_o, desde = 0.0, 0, None
+    # Si el último grupo (el de menos aciertos) quedó corto, se une al anterior
+    if len(esperado_g) > 1 and esperado_g[-1] < minimo:
+        e, o, etiqueta = esperado_g.pop(), observado_g.pop(), etiquetas.pop()
+        esperado_g[-1] += e
+        observado_g[-1] += o
+        etiquetas[-1] = f"{etiqueta.split('-')[0]}-{etiquetas[-1].split('-')[-1]}"
+    return esperado_g[::-1], observado_g[::-1], etiquetas[::-1]
+
+
+def comparar_histograma(juego, observado, jugadas, sorteos, tamano=None):
+    """
+    Compara un histograma observado de aciertos (cuántas veces se acertaron
+    0..picks números, sumando todas las jugadas) con el esperado exacto.
+
+    - Por categoría: p-valor de obtener al menos lo observado (cola binomial).
+    - Global: chi-cuadrado de bondad de ajuste, agrupando las categorías
+      improbables hasta que cada una tenga esperado >= ESPERADO_MINIMO.
+
+    Los p-valores suponen comparaciones jugada-sorteo independientes; con
+    varias jugadas contra el mismo sorteo es una aproximación.
+    """
+    info = validar_juego(juego)
+    observado = np.asarray(observado, dtype=np.int64)
+    if len(observado) != info['picks'] + 1:
+        raise ValueError(f"El histograma debe tener {info['picks'] + 1} categorías (0 a {info['picks']} aciertos)")
+
+    tabla = tabla_hipergeometrica(juego, tamano)
+    esperado = aciertos_esperados(juego, jugadas, sorteos, tamano)
+    n = jugadas * sorteos
+
+    esperado_g, observado_g, etiquetas = _agrupar_cola(esperado, observado)
+    chi2 = sum((o - e) ** 2 / e for e, o in zip(esperado_g, observado_g) if e > 0)
+    grados = len(esperado_g) - 1
+
+    return {
+        'juego': juego,
+        'jugadas': jugadas,
+        'sorteos': sorteos,
+        'comparaciones': n,
+        'categorias': [
+            {
+                'aciertos': k,
+                'probabilidad': float(tabla['probabilidades'][k]),
+                'uno_en': tabla['uno_en'][k],
+                'esperado': float(esperado[k]),
+                'observado': int(observado[k]),
+                'p_valor': cola_binomial(int(observado[k]), n, float(tabla['probabilidades'][k]))
+            }
+            for k in range(info['picks'], -1, -1)
+        ],
+        'chi2': {
+            'estadistico': float(chi2),
+            'grados': grados,
+            'p_valor': chi2_cola(chi2, grados) if grados > 0 else None,
+            'grupos': etiquetas
+        }
+    }
+
+
+def probabilidades_payload(juego, tamano=None):
+    """Tabla hipergeométrica serializable: fracción exacta como texto, float y 1 en N por aciertos."""
+    info = validar_juego(juego)
+    tabla = tabla_hipergeometrica(juego, tamano)
+    return {
+        'juego': juego,
+        'tamano': tabla['tamano'],
+        'aciertos': [
+            {
+                'aciertos': k,
+                'exacta': f"{tabla['exactas'][k].numerator}/{tabla['exactas'][k].denominator}",
+                'probabilidad': float(tabla['probabilidades'][k]),
+                'uno_en': tabla['uno_en'][k]
+            }
+            for k in range(info['picks'], -1, -1)
+        ]
+    }
+
+
+def histograma_jugadas(juego, jugadas, matriz):
+    """Histograma total de aciertos (0..picks) de las jugadas contra todos los (sub-)sorteos de la matriz."""
+    info = validar_juego(juego)
+    jugadas = np.asarray(jugadas)
+    if jugadas.ndim != 2 or jugadas.shape[1] != info['picks']:
+        raise ValueError(f"Cada jugada debe tener {info['picks']} números")
+    if jugadas.size and (jugadas.min() < info['minimo'] or jugadas.max() > info['maximo']):
+        raise ValueError(f"Números fuera de rango ({info['minimo']}-{info['maximo']})")
+
+    tipo = dtype_bitmask(info['maximo'])
+    jugadas_bits = a_bitmask(jugadas, info['maximo']).astype(tipo)
+    sorteos_bits = a_bitmask(matriz.reshape(-1, info['picks']), info['maximo']).astype(tipo)
+    return histogramas_jugadas(jugadas_bits, sorteos_bits, info['picks']).sum(axis=0)
+
+
+def comparar_jugadas(juego, jugadas, fecha_limite=None, matriz=None):
+    """
+    Esperado vs observado de un conjunto de jugadas contra el histórico
+    (o contra la matriz indicada, ej. solo el último sorteo).
+    """
+    validar_juego(juego)
+    if matriz is None:
+        _, matriz = cargar_matriz(juego, fecha_limite)
+    observado = histograma_jugadas(juego, jugadas, matriz)
+    sorteos = int(np.prod(matriz.shape[:-1]))
+    return comparar_histograma(juego, observado, len(jugadas), sorteos)
+
+
+def imprimir_probabilidades(juego, tamano=None):
+    """Imprime la tabla hipergeométrica exacta del juego."""
+    info = validar_juego(juego)
+    tabla = tabla_hipergeometrica(juego, tamano)
+    print(f"\n=== PROBABILIDAD EXACTA POR ACIERTOS ({info['nombre'].upper()}, jugada de {tabla['tamano']} números) ===")
+    for k in range(info['picks'], -1, -1):
+        p = tabla['probabilidades'][k]
+        if p > 0:
+            print(f"{k:>2} aciertos → {p:.10f} (1 en {tabla['uno_en'][k]:,.1f})")
+
+
+def imprimir_comparacion(resultado):
+    """Imprime esperado vs observado de una comparación."""
+    print(f"\n=== ESPERADO VS OBSERVADO - {resultado['jugadas']} jugadas × {resultado['sorteos']} sorteos "
+          f"({resultado['comparaciones']:,} comparaciones) ===")
+    for c in resultado['categorias']:
+        if c['probabilidad'] > 0:
+            print(f"{c['aciertos']:>2} aciertos → esperado {c['esperado']:>12,.3f} | observado {c['observado']:>8,} "
+                  f"| p(≥ observado) = {c['p_valor']:.4f}")
+    chi2 = resultado['chi2']
+    if chi2['p_valor'] is not None:
+        print(f"\nχ² = {chi2['estadistico']:.2f} ({chi2['grados']} gl, grupos {', '.join(chi2['grupos'])}) "
+              f"→ p = {chi2['p_valor']:.4f}")
@@ -3,6 +3,7 @@ import csv
 from collections import Counter, defaultdict
 from itertools import combinations
 import random
+import numpy as np
 from .base_game import BaseGame
 from config import DATA_DIR
 
@@ -23,6 +24,14 @@ class Quini6(BaseGame):
         """Devuelve cuántos números se sortean."""
         return 6
 
+    def _draw_chunk(self, rng, n):
+        """
+        Lote de n sorteos completos como array (n, 4, 6): cada sorteo tiene las
+        4 modalidades (Tradicional, La Segunda, Revancha, Siempre Sale).
+        Con bitmask=True, draw_many devuelve (n, 4).
+        """
+        return super()._draw_chunk(rng, n * 4).reshape(n, 4, 6)
+
 
 def load_data(fecha_limite=None):
     """
@@ -130,17 +139,28 @@ def calcular_demora_maxima(numeros_por_sorteo):
     return demora_maxima
 
 
-def procesar_estadisticas(fecha_limite=None, use_cache=True):
+def procesar_estadisticas(fecha_limite=None, use_cache=True, ventana=None, modalidad=None):
     from tombola.stats_cache import load_cached_stats, save_stats_to_cache
+    from tombola.quini6_modalidades import filtrar_modalidad
     
-    # Intentar cargar desde caché
+    # Intentar cargar desde caché (si se pide una modalidad, el caché tiene que traer las porciones)
     if use_cache:
-        cached = load_cached_stats('quini6', fecha_limite)
-        if cached:
+        cached = load_cached_stats('quini6', fecha_limite, ventana)
+        if cached and (not modalidad or filtrar_modalidad(cached['stats'], modalidad)):
             print("📦 Cargando estadísticas desde caché...\n")
-            _print_quini6_stats(cached['stats'], fecha_limite)
+            _imprimir_estadisticas(cached['stats'], fecha_limite, modalidad)
             return
     
+    # Estadísticas de los últimos N sorteos
+    if ventana:
+        from tombola.ventana_stats import estadisticas_ventana
+        stats_data = estadisticas_ventana('quini6', ventana, fecha_limite)
+        print(f"\n=== VENTANA: ÚLTIMOS {stats_data['sorteos_count']} SORTEOS ===")
+        if use_cache:
+            save_stats_to_cache('quini6', fecha_limite, stats_data, ventana)
+        _imprimir_estadisticas(stats_data, fecha_limite, modalidad)
+        return
+    
     # Calcular estadísticas
     sorteos, numeros_por_sorteo = load_data(fecha_limite)
 
@@ -151,27 +171,56 @@ def procesar_estadisticas(fecha_limite=None, use_cache=True):
         print(f"📅 Filtrado: Solo sorteos anteriores a {fecha_limite}")
         print(f"   (útil para backtesting de estrategias)")
 
+    stats_data = calcular_estadisticas(sorteos, numeros_por_sorteo)
+    
+    # Guardar en caché
+    if use_cache:
+        save_stats_to_cache('quini6', fecha_limite, stats_data)
+    
+    # Imprimir estadísticas
+    _imprimir_estadisticas(stats_data, fecha_limite, modalidad)
+
+
+def calcular_estadisticas(sorteos, numeros_por_sorteo):
+    """
+    Payload completo de estadísticas: las de todos los sub-sorteos, las
+    transiciones entre sorteos consecutivos (misma modalidad) y las porciones
+    por modalidad con el solapamiento entre modalidades, calculadas en una
+    sola pasada sobre la matriz (sorteos, 4, 6).
+    """
+    from tombola.quini6_modalidades import estadisticas_modalidades
+    from tombola.transiciones import transiciones_payload
+    
     frec = calcular_frecuencias(numeros_por_sorteo)
     omision = calcular_omision(numeros_por_sorteo)
     cooc = calcular_coocurrencia(numeros_por_sorteo)
     demora_max = calcular_demora_maxima(numeros_por_sorteo)
+    matriz = np.array(numeros_por_sorteo, dtype=np.int8).reshape(len(sorteos), 4, 6)
     
-    # Preparar datos para caché
-    stats_data = {
+    return {
         'sorteos_count': len(sorteos),
         'subsorteos_count': len(numeros_por_sorteo),
         'frecuencias': dict(frec.most_common()),
         'omision': omision,
         'coocurrencia': {f"{a}-{b}": v for (a, b), v in cooc.most_common()},
-        'demora_maxima': demora_max
+        'demora_maxima': demora_max,
+        'transiciones': transiciones_payload(matriz, 'quini6'),
+        **estadisticas_modalidades(matriz)
     }
+
+
+def _imprimir_estadisticas(stats_data, fecha_limite, modalidad=None):
+    """Imprime todas las estadísticas o las de una modalidad, y el solapamiento entre modalidades."""
+    from tombola.quini6_modalidades import filtrar_modalidad, imprimir_solapamiento
     
-    # Guardar en caché
-    if use_cache:
-        save_stats_to_cache('quini6', fecha_limite, stats_data)
-    
-    # Imprimir estadísticas
+    if modalidad:
+        print(f"\n=== MODALIDAD: {modalidad.replace('_', ' ').upper()} ===")
+        stats_data = filtrar_modalidad(stats_data, modalidad)
     _print_quini6_stats(stats_data, fecha_limite)
+    if stats_data.get('transiciones'):
+        from tombola.transiciones import imprimir_transiciones
+        imprimir_transiciones(stats_data['transiciones'])
+    imprimir_solapamiento(stats_data)
 
 
 def _print_quini6_stats(stats, fecha_limite):
@@ -180,6 +229,8 @@ def _print_quini6_stats(stats, fecha_limite):
     omision = stats['omision']
     demora_max = stats['demora_maxima']
     cooc_data = stats.get('coocurrencia', {})
+    # Con una sola modalidad la unidad es el sorteo
+    unidad = 'sorteos' if stats.get('modalidad') else 'sub-sorteos'
     
     print("\n=== TOP 10 - NÚMEROS CALIENTES ===")
     top_freq = sorted(frec.items(), key=lambda x: x[1], reverse=True)[:10]
@@ -191,7 +242,7 @@ def _print_quini6_stats(stats, fecha_limite):
     for n, cant in bottom_freq:
         print(f"{int(n):02d} → {cant} apariciones")
 
-    print("\n=== OMISIÓN (sub-sorteos sin aparecer) ===")
+    print(f"\n=== OMISIÓN ({unidad} sin aparecer) ===")
     omision_ordenada = sorted(
         [(int(n), count) for n, count in omision.items() if count > 0],
         key=lambda x: x[1],
@@ -199,15 +250,15 @@ def _print_quini6_stats(stats, fecha_limite):
     )
     if omision_ordenada:
         for n, sorteos_omitidos in omision_ordenada[:15]:
-            print(f"{n:02d}: {sorteos_omitidos} sub-sorteos")
+            print(f"{n:02d}: {sorteos_omitidos} {unidad}")
     else:
-        print("Todos los números salieron en el último sub-sorteo")
+        print(f"Todos los números salieron en el último {unidad[:-1]}")
 
-    print("\n=== TOP 10 - DEMORA MÁXIMA (sub-sorteos sin aparecer) ===")
+    print(f"\n=== TOP 10 - DEMORA MÁXIMA ({unidad} sin aparecer) ===")
     demora_ordenada = sorted(demora_max.items(), key=lambda x: x[1], reverse=True)[:10]
     for n, sorteos_sin_salir in demora_ordenada:
         if sorteos_sin_salir > 0:
-            print(f"{int(n):02d}: {sorteos_sin_salir} sub-sorteos")
+            print(f"{int(n):02d}: {sorteos_sin_salir} {unidad}")
 
     print("\n=== TOP 10 PARES QUE MÁS SALEN JUNTOS ===")
     cooc_sorted = sorted(cooc_data.items(), key=lambda x: x[1], reverse=True)[:10]
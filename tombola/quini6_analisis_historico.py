@@ -1,8 +1,11 @@
 # tombola/quini6_analisis_historico.py
 import csv
 from datetime import datetime
-from collections import defaultdict
-from config import DATA_DIR
+from config import DATA_DIR, WORKERS
+from tombola.quini6_checkpoint import (
+    cargar_checkpoint, guardar_checkpoint, checkpoint_vacio, actualizar_checkpoint,
+    totales_por_aciertos, MODALIDADES_NOMBRES
+)
 
 MIS_JUGADAS_PATH = f"{DATA_DIR}/mis_jugadas_quini6.csv"
 SORTEOS_PATH = f"{DATA_DIR}/quini6.csv"
@@ -65,8 +68,15 @@ def contar_aciertos(jugada_numeros, sorteo_numeros):
     return len(aciertos), sorted(aciertos)
 
 
-def analizar_historico():
-    """Analiza todos los sorteos históricos en busca de 5 y 6 aciertos."""
+def analizar_historico(use_checkpoint=True, workers=None):
+    """
+    Analiza todos los sorteos históricos en busca de 5 y 6 aciertos.
+    
+    Con use_checkpoint=True los totales se acumulan en un checkpoint con una
+    fila por jugada, así cada corrida solo verifica los sorteos nuevos (y las
+    jugadas agregadas o editadas contra los sorteos ya verificados).
+    workers define cuántos procesos reparten las jugadas (por defecto config.WORKERS).
+    """
     print("🔍 ANÁLISIS HISTÓRICO DE ACIERTOS - QUINI 6\n")
     print("="*80)
     
@@ -81,43 +91,22 @@ def analizar_historico():
     print(f"📅 Rango de fechas: {sorteos[-1]['fecha']} hasta {sorteos[0]['fecha']}\n")
     print("="*80)
     
-    # Estructura para almacenar resultados
-    resultados_6 = defaultdict(list)  # {jugada_id: [(fecha, sorteo, modalidad, numeros_acertados)]}
-    resultados_5 = defaultdict(list)
-    
-    modalidades_info = [
-        ('tradicional', 'TRADICIONAL'),
-        ('segunda', 'LA SEGUNDA'),
-        ('revancha', 'REVANCHA'),
-        ('siempre_sale', 'SIEMPRE SALE')
-    ]
-    
-    # Analizar cada sorteo
-    for sorteo in sorteos:
-        for jugada in jugadas:
-            for modalidad_key, modalidad_nombre in modalidades_info:
-                numeros_sorteo = sorteo[modalidad_key]
-                cantidad_aciertos, numeros_acertados = contar_aciertos(
-                    jugada['numeros'],
-                    numeros_sorteo
-                )
-                
-                if cantidad_aciertos == 6:
-                    resultados_6[jugada['id']].append({
-                        'fecha': sorteo['fecha'],
-                        'sorteo': sorteo['sorteo'],
-                        'modalidad': modalidad_nombre,
-                        'numeros_acertados': numeros_acertados,
-                        'jugada_completa': jugada['numeros']
-                    })
-                elif cantidad_aciertos == 5:
-                    resultados_5[jugada['id']].append({
-                        'fecha': sorteo['fecha'],
-                        'sorteo': sorteo['sorteo'],
-                        'modalidad': modalidad_nombre,
-                        'numeros_acertados': numeros_acertados,
-                        'jugada_completa': jugada['numeros']
-                    })
+    # Cargar el checkpoint del conjunto de jugadas y procesar solo los sorteos nuevos
+    if use_checkpoint:
+        checkpoint = cargar_checkpoint(jugadas)
+    else:
+        checkpoint = checkpoint_vacio(jugadas)
+    
+    jugadas_nuevas = len(checkpoint['nuevas'])
+    nuevos = actualizar_checkpoint(checkpoint, jugadas, sorteos, workers or WORKERS)
+    print(f"🆕 Sorteos nuevos verificados: {len(nuevos)} (último verificado: {checkpoint['ultimo_sorteo']})")
+    
+    if use_checkpoint and (nuevos or jugadas_nuevas):
+        guardar_checkpoint(checkpoint)
+    
+    # {jugada_id: [(fecha, sorteo, modalidad, numeros_acertados)]}
+    resultados_6 = checkpoint['resultados_6']
+    resultados_5 = checkpoint['resultados_5']
     
     # Mostrar resultados de 6 aciertos
     print("\n🏆 RESULTADOS CON 6 ACIERTOS (¡PRIMER PREMIO!)")
@@ -184,6 +173,12 @@ def analizar_historico():
     print(f"Total de sorteos analizados: {len(sorteos)}")
     print(f"Jugadas con 6 aciertos: {len(resultados_6)} ({sum(len(a) for a in resultados_6.values())} ocurrencias)")
     print(f"Jugadas con 5 aciertos: {len(resultados_5)} ({sum(len(a) for a in resultados_5.values())} ocurrencias)")
+    
+    print("\nAciertos acumulados por modalidad (3 / 4 / 5 / 6):")
+    totales = totales_por_aciertos(checkpoint)
+    for modalidad_key, nombre in MODALIDADES_NOMBRES.items():
+        conteos = totales[modalidad_key]
+        print(f"  {nombre:<13} {conteos[3]} / {conteos[4]} / {conteos[5]} / {conteos[6]}")
     print("="*80)
 
 
@@ -0,0 +1,185 @@
+# tombola/quini6_checkpoint.py
+import json
+import os
+from datetime import datetime
+import numpy as np
+from config import CHECKPOINTS_DIR
+
+MODALIDADES = ['tradicional', 'segunda', 'revancha', 'siempre_sale']
+MODALIDADES_NOMBRES = {
+    'tradicional': 'TRADICIONAL',
+    'segunda': 'LA SEGUNDA',
+    'revancha': 'REVANCHA',
+    'siempre_sale': 'SIEMPRE SALE'
+}
+
+# Versión del formato del checkpoint: si cambia, se descarta el guardado
+VERSION_CHECKPOINT = 1
+
+
+def clave_jugada(jugada):
+    """Identificador estable de una jugada (id + números): si cambia, su historia se recalcula."""
+    numeros = ','.join(str(n) for n in sorted(jugada['numeros']))
+    return f"{jugada['id']}:{numeros}"
+
+
+def get_checkpoint_filename():
+    """Archivo del checkpoint del análisis histórico de las jugadas."""
+    os.makedirs(CHECKPOINTS_DIR, exist_ok=True)
+    return f"{CHECKPOINTS_DIR}/quini6_historico.npz"
+
+
+def checkpoint_vacio(jugadas):
+    """Crea un checkpoint sin sorteos verificados para el conjunto de jugadas."""
+    return {
+        'claves': [clave_jugada(j) for j in jugadas],
+        'ultimo_sorteo': None,
+        'sorteos_verificados': [],
+        # (jugadas, modalidades, 7): cantidad de sorteos con 0..6 aciertos
+        'histograma': np.zeros((len(jugadas), len(MODALIDADES), 7), dtype=np.int64),
+        # Índices de jugadas sin historia (agregadas o editadas desde el último guardado)
+        'nuevas': [],
+        'resultados_6': {},
+        'resultados_5': {}
+    }
+
+
+def cargar_checkpoint(jugadas):
+    """
+    Carga el checkpoint y lo alinea con las jugadas actuales: cada jugada que
+    ya estaba (misma clave) conserva su histograma y sus premios; las agregadas
+    o editadas quedan marcadas en 'nuevas' para verificarlas contra los sorteos
+    ya verificados. Si no existe o no se puede leer devuelve un checkpoint vacío.
+    """
+    checkpoint = checkpoint_vacio(jugadas)
+    checkpoint_file = get_checkpoint_filename()
+
+    if not os.path.exists(checkpoint_file):
+        return checkpoint
+
+    try:
+        with np.load(checkpoint_file) as guardado:
+            if int(guardado['version']) != VERSION_CHECKPOINT:
+                return checkpoint
+            claves = [str(c) for c in guardado['claves']]
+            histograma = guardado['histograma']
+            verificados = [int(s) for s in guardado['sorteos_verificados']]
+            resultados = json.loads(str(guardado['resultados']))
+    except Exception as e:
+        print(f"⚠️  Error al leer checkpoint: {e}")
+        return checkpoint
+
+    fila = {clave: i for i, clave in enumerate(claves)}
+    conservadas = set()
+    for t, clave in enumerate(checkpoint['claves']):
+        if clave in fila:
+            checkpoint['histograma'][t] = histograma[fila[clave]]
+            conservadas.add(jugadas[t]['id'])
+        else:
+            checkpoint['nuevas'].append(t)
+    # Los premios se guardan por id: los de un id editado se vuelven a buscar
+    conservadas -= {jugadas[t]['id'] for t in checkpoint['nuevas']}
+
+    checkpoint['sorteos_verificados'] = verificados
+    checkpoint['ultimo_sorteo'] = max(verificados) if verificados else None
+    for cantidad in ('5', '6'):
+        checkpoint[f'resultados_{cantidad}'] = {
+            jugada_id: ocurrencias for jugada_id, ocurrencias in resultados[cantidad].items()
+            if jugada_id in conservadas
+        }
+
+    print(f"✅ Usando checkpoint: {os.path.basename(checkpoint_file)} ({len(checkpoint['nuevas'])} jugadas nuevas)")
+    return checkpoint
+
+
+def guardar_checkpoint(checkpoint):
+    """Guarda el checkpoint en disco (npz, escritura atómica)."""
+    checkpoint_file = get_checkpoint_filename()
+
+    try:
+        temporal = checkpoint_file + '.tmp.npz'
+        np.savez(
+            temporal,
+            version=VERSION_CHECKPOINT,
+            claves=np.array(checkpoint['claves'], dtype=str),
+            histograma=checkpoint['histograma'],
+            sorteos_verificados=np.array(checkpoint['sorteos_verificados'], dtype=np.int64),
+            resultados=json.dumps({'5': checkpoint['resultados_5'], '6': checkpoint['resultados_6']},
+                                  ensure_ascii=False),
+            generated_at=datetime.now().isoformat()
+        )
+        os.replace(temporal, checkpoint_file)
+
+        print(f"💾 Checkpoint guardado: {os.path.basename(checkpoint_file)}")
+        return True
+    except Exception as e:
+        print(f"⚠️  Error al guardar checkpoint: {e}")
+        return False
+
+
+def sorteos_pendientes(checkpoint, sorteos):
+    """
+    Devuelve los sorteos que todavía no fueron verificados.
+    Se usa el conjunto de sorteos verificados (y no solo el último) para
+    contemplar sorteos históricos agregados por el scraping hacia atrás.
+    """
+    verificados = set(checkpoint['sorteos_verificados'])
+    return [s for s in sorteos if int(s['sorteo']) not in verificados]
+
+
+def actualizar_checkpoint(checkpoint, jugadas, sorteos, workers=1):
+    """
+    Verifica las jugadas solo contra los sorteos pendientes y acumula
+    los aciertos en el checkpoint. Costo: O(sorteos nuevos × jugadas), más
+    las jugadas nuevas contra los sorteos ya verificados.
+    Con workers > 1 las jugadas se reparten en un pool de procesos.
+
+    Devuelve la lista de sorteos procesados.
+    """
+    from tombola.quini6_paralelo import actualizar_checkpoint_vectorizado
+
+    if checkpoint['nuevas']:
+        verificados = set(checkpoint['sorteos_verificados'])
+        ya_verificados = [s for s in sorteos if int(s['sorteo']) in verificados]
+        nuevas = [jugadas[t] for t in checkpoint['nuevas']]
+        actualizar_checkpoint_vectorizado(checkpoint, nuevas, ya_verificados, workers, checkpoint['nuevas'])
+        checkpoint['nuevas'] = []
+
+    pendientes = sorteos_pendientes(checkpoint, sorteos)
+    actualizar_checkpoint_vectorizado(checkpoint, jugadas, pendientes, workers)
+
+    checkpoint['sorteos_verificados'].extend(int(s['sorteo']) for s in pendientes)
+    if checkpoint['sorteos_verificados']:
+        checkpoint['ultimo_sorteo'] = max(checkpoint['sorteos_verificados'])
+
+    return pendientes
+
+
+def actualizar_checkpoint_serial(checkpoint, jugadas, pendientes):
+    """
+    Referencia escalar de actualizar_checkpoint_vectorizado: recorre sorteo →
+    jugada → modalidad contando aciertos con conjuntos. Se usa para comprobar
+    que el núcleo vectorizado/paralelo da exactamente el mismo resultado.
+    """
+    histograma = checkpoint['histograma']
+    for sorteo in pendientes:
+        for t, jugada in enumerate(jugadas):
+            for m, modalidad_key in enumerate(MODALIDADES):
+                acertados = sorted(set(jugada['numeros']).intersection(sorteo[modalidad_key]))
+                histograma[t, m, len(acertados)] += 1
+
+                if len(acertados) >= 5:
+                    resultados = checkpoint[f'resultados_{len(acertados)}']
+                    resultados.setdefault(jugada['id'], []).append({
+                        'fecha': sorteo['fecha'],
+                        'sorteo': sorteo['sorteo'],
+                        'modalidad': MODALIDADES_NOMBRES[modalidad_key],
+                        'numeros_acertados': acertados,
+                        'jugada_completa': jugada['numeros']
+                    })
+
+
+def totales_por_aciertos(checkpoint):
+    """Suma los histogramas de todas las jugadas: {modalidad: [0..6 aciertos]}."""
+    totales = checkpoint['histograma'].sum(axis=0)
+    return {m: [int(c) for c in totales[i]] for i, m in enumerate(MODALIDADES)}
@@ -0,0 +1,117 @@
+# tombola/quini6_modalidades.py
+from itertools import combinations
+import numpy as np
+from tombola.matriz_sorteos import JUEGOS, matriz_incidencia
+
+MODALIDADES = JUEGOS['quini6']['modalidades']
+
+
+def calcular_modalidades(matriz):
+    """
+    Estadísticas de cada modalidad de Quini 6 y el solapamiento entre
+    modalidades del mismo sorteo, en una sola pasada sobre la incidencia
+    (N, 4, 46) de la matriz (N, 4, 6). En cada modalidad la unidad es el
+    sorteo (no el sub-sorteo):
+
+    - frecuencia (4, 46), omisión (4, 46), demora máxima (4, 46)
+    - co-ocurrencia (4, 46, 46)
+    - solapamiento (N, 4, 4): números en común entre dos modalidades de la misma fecha
+    """
+    incidencia = matriz_incidencia(matriz, 'quini6')
+    n = len(incidencia)
+    idx = np.arange(n)[:, None, None]
+
+    frecuencia = incidencia.sum(axis=0, dtype=np.int64)
+
+    # Último sorteo en que salió cada número en cada modalidad hasta t (-1 = nunca)
+    ultima = np.maximum.accumulate(np.where(incidencia, idx, -1), axis=0)
+    ultima_final = ultima[-1] if n else np.full(incidencia.shape[1:], -1)
+    omision = np.where(ultima_final >= 0, n - 1 - ultima_final, n)
+    anterior = np.concatenate([np.full((1,) + incidencia.shape[1:], -1), ultima[:-1]])
+    demora_maxima = np.where(incidencia & (anterior >= 0), idx - anterior - 1, 0).max(axis=0, initial=0)
+
+    flotante = incidencia.astype(np.float32)
+    coocurrencia = np.rint(np.einsum('tmx,tmy->mxy', flotante, flotante)).astype(np.int64)
+    solapamiento = np.rint(np.einsum('tax,tbx->tab', flotante, flotante)).astype(np.int64)
+
+    return {
+        'frecuencia': frecuencia,
+        'omision': omision,
+        'demora_maxima': demora_maxima,
+        'coocurrencia': coocurrencia,
+        'solapamiento': solapamiento
+    }
+
+
+def estadisticas_modalidades(matriz):
+    """
+    Formato serializable de calcular_modalidades para el payload de estadísticas:
+
+    - 'modalidades': {modalidad: {frecuencias, omision, coocurrencia, demora_maxima}},
+      con las mismas claves que las estadísticas completas
+    - 'solapamiento_modalidades': por cada par de modalidades, el promedio de números
+      en común del mismo sorteo y cuántos sorteos tuvieron 0, 1, 2... en común.
+      Con sorteos independientes el esperado es 6 · 6 / 46 ≈ 0,78.
+    """
+    datos = calcular_modalidades(matriz)
+    numeros = range(0, 46)
+
+    modalidades = {}
+    for m, modalidad in enumerate(MODALIDADES):
+        frecuencia, cooc = datos['frecuencia'][m], datos['coocurrencia'][m]
+        pares = sorted(
+            ((a, b) for a, b in combinations(numeros, 2) if cooc[a, b] > 0),
+            key=lambda p: -cooc[p]
+        )
+        modalidades[modalidad] = {
+            'frecuencias': {n: int(frecuencia[n]) for n in sorted(
+                (n for n in numeros if frecuencia[n] > 0), key=lambda n: -frecuencia[n]
+            )},
+            'omision': {n: int(datos['omision'][m][n]) for n in numeros},
+            'coocurrencia': {f"{a}-{b}": int(cooc[a, b]) for a, b in pares},
+            'demora_maxima': {n: int(datos['demora_maxima'][m][n]) for n in numeros}
+        }
+
+    solapamiento = {}
+    for a, b in combinations(range(len(MODALIDADES)), 2):
+        comunes = datos['solapamiento'][:, a, b]
+        solapamiento[f"{MODALIDADES[a]}-{MODALIDADES[b]}"] = {
+            'promedio': round(float(comunes.mean()), 4) if len(comunes) else 0.0,
+            'distribucion': {int(k): int(c) for k, c in enumerate(np.bincount(comunes, minlength=1)) if c}
+        }
+
+    return {
+        'modalidades': modalidades,
+        'solapamiento_modalidades': {'esperado': round(36 / 46, 4), 'pares': solapamiento}
+    }
+
+
+def filtrar_modalidad(stats_data, modalidad):
+    """
+    Estadísticas de una sola modalidad a partir del payload completo (que ya
+    trae las porciones por modalidad precalculadas), con el mismo formato.
+    Devuelve None si el payload no las tiene (caché de una versión anterior).
+    """
+    if modalidad not in MODALIDADES:
+        raise ValueError(f"Modalidad '{modalidad}' no válida. Disponibles: {', '.join(MODALIDADES)}")
+    porciones = stats_data.get('modalidades')
+    if not porciones:
+        return None
+    return {
+        'modalidad': modalidad,
+        'sorteos_count': stats_data['sorteos_count'],
+        **porciones[modalidad],
+        'transiciones': stats_data.get('transiciones'),
+        'solapamiento_modalidades': stats_data.get('solapamiento_modalidades')
+    }
+
+
+def imprimir_solapamiento(stats_data):
+    """Imprime el solapamiento entre modalidades del mismo sorteo."""
+    solapamiento = stats_data.get('solapamiento_modalidades')
+    if not solapamiento:
+        return
+    print(f"\n=== NÚMEROS EN COMÚN ENTRE MODALIDADES DEL MISMO SORTEO (esperado {solapamiento['esperado']:.2f}) ===")
+    for par, datos in solapamiento['pares'].items():
+        distribucion = ", ".join(f"{k}: {c}" for k, c in datos['distribucion'].items())
+        print(f"{par.replace('_', ' ')}: promedio {datos['promedio']:.2f} ({distribucion})")
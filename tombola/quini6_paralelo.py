@@ -0,0 +1,182 @@
+# tombola/quini6_paralelo.py
+import numpy as np
+from multiprocessing import Pool
+from tombola.bitmask import popcount
+from tombola.paralelo import (
+    compartir_array, inicializar_worker, array_compartido, liberar, rangos
+)
+from tombola.quini6_checkpoint import (
+    MODALIDADES, MODALIDADES_NOMBRES, checkpoint_vacio, actualizar_checkpoint_serial
+)
+
+# Jugadas por debajo de las cuales no conviene repartir en un pool
+SUB_BLOQUE = 4096
+# Memoria temporal por lote de jugadas dentro de un shard (mismo criterio que espacio.py):
+# el lote se achica a medida que crece el histórico, así cada worker usa RAM acotada
+MEMORIA_LOTE = 64 * 1024 * 1024
+
+
+def incidencia_sorteos(sorteos):
+    """Matriz booleana (sorteos, 4, 46) a partir de los dicts de sorteos."""
+    incidencia = np.zeros((len(sorteos), len(MODALIDADES), 46), dtype=bool)
+    for p, sorteo in enumerate(sorteos):
+        for m, modalidad_key in enumerate(MODALIDADES):
+            incidencia[p, m, sorteo[modalidad_key]] = True
+    return incidencia
+
+
+def bitmask_sorteos(incidencia):
+    """
+    Bitmasks (4*sorteos,) uint64 de la incidencia (sorteos, 4, 46), con la
+    modalidad como eje mayor: el sub-sorteo (p, m) queda en la posición m * sorteos + p.
+    """
+    bits = np.uint64(1) << np.arange(46, dtype=np.uint64)
+    por_modalidad = incidencia.transpose(1, 0, 2).reshape(-1, 46)
+    return np.bitwise_or.reduce(np.where(por_modalidad, bits, np.uint64(0)), axis=1)
+
+
+def bitmask_jugadas(jugadas):
+    """
+    Bitmask uint64 de cada jugada con la misma semántica de conjuntos que
+    contar_aciertos: un número repetido cuenta una vez y uno fuera de 0..45
+    no puede coincidir con ningún sorteo (no se marca).
+    """
+    return np.array(
+        [sum(1 << n for n in set(numeros) if 0 <= n <= 45) for numeros in jugadas],
+        dtype=np.uint64
+    )
+
+
+def aciertos_jugadas(sorteos_bits, jugadas_bits, inicio=0):
+    """
+    Núcleo vectorizado: verifica las jugadas (T,) contra todos los sub-sorteos
+    con un AND + popcount de bitmasks. sorteos_bits es la salida de bitmask_sorteos.
+
+    Devuelve:
+    - histograma (T, 4, 7): cantidad de sorteos con 0..6 aciertos por modalidad
+    - premios: lista de (indice_jugada, indice_sorteo, indice_modalidad, aciertos)
+      con 5 o más aciertos, ordenada por (jugada, modalidad, sorteo).
+      indice_jugada es absoluto (se suma `inicio`).
+    """
+    total = len(jugadas_bits)
+    n_modalidades = len(MODALIDADES)
+    n_sorteos = len(sorteos_bits) // n_modalidades
+    histograma = np.zeros((total, n_modalidades, 7), dtype=np.int32)
+    premios = []
+
+    # bytes por jugada: AND (8) + popcount (hasta 9 sin np.bitwise_count)
+    # + índices del bincount (8) + máscara de premios (1) por sub-sorteo
+    por_jugada = len(sorteos_bits) * (8 + 9 + 8 + 1)
+    lote = max(1, MEMORIA_LOTE // max(por_jugada, 1))
+    modalidad = np.arange(n_modalidades, dtype=np.int64)[None, :, None]
+
+    for a in range(0, total, lote):
+        bloque = jugadas_bits[a:a + lote]
+        # aciertos[t, m, p]
+        aciertos = popcount(bloque[:, None] & sorteos_bits[None, :])
+        aciertos = aciertos.reshape(len(bloque), n_modalidades, n_sorteos)
+
+        # Un solo bincount sobre el id combinado (jugada, modalidad, aciertos)
+        filas = np.arange(len(bloque), dtype=np.int64)[:, None, None] * n_modalidades + modalidad
+        conteo = np.bincount((filas * 7 + aciertos).ravel(), minlength=len(bloque) * n_modalidades * 7)
+        histograma[a:a + len(bloque)] = conteo.reshape(len(bloque), n_modalidades, 7)
+
+        for t, m, p in zip(*np.nonzero(aciertos >= 5)):
+            premios.append((inicio + a + int(t), int(p), int(m), int(aciertos[t, m, p])))
+
+    return histograma, premios
+
+
+def _procesar_shard(rango):
+    """Tarea del worker: recibe solo (inicio, fin); los arrays se leen de memoria compartida."""
+    inicio, fin = rango
+    sorteos_bits = array_compartido('sorteos')
+    jugadas_bits = array_compartido('jugadas')
+    histograma, premios = aciertos_jugadas(sorteos_bits, jugadas_bits[inicio:fin], inicio)
+    return inicio, histograma, premios
+
+
+def aciertos_jugadas_paralelo(incidencia, jugadas_bits, workers):
+    """
+    Igual que aciertos_jugadas pero reparte las jugadas en shards sobre un Pool.
+    La matriz de sorteos y las jugadas se comparten por memoria compartida,
+    así cada tarea solo serializa su rango y su histograma parcial.
+    """
+    sorteos_bits = bitmask_sorteos(incidencia)
+    if workers <= 1 or len(jugadas_bits) <= SUB_BLOQUE:
+        return aciertos_jugadas(sorteos_bits, jugadas_bits)
+
+    shm_sor, desc_sor = compartir_array(sorteos_bits)
+    shm_jug, desc_jug = compartir_array(jugadas_bits)
+
+    histograma = np.zeros((len(jugadas_bits), len(MODALIDADES), 7), dtype=np.int32)
+    premios = []
+
+    try:
+        descriptores = {'sorteos': desc_sor, 'jugadas': desc_jug}
+        with Pool(workers, initializer=inicializar_worker, initargs=(descriptores,)) as pool:
+            # imap conserva el orden de los shards: el resultado es idéntico al serial
+            for inicio, hist_shard, premios_shard in pool.imap(
+                    _procesar_shard, rangos(len(jugadas_bits), workers * 4)):
+                histograma[inicio:inicio + len(hist_shard)] = hist_shard
+                premios.extend(premios_shard)
+    finally:
+        liberar([shm_sor, shm_jug])
+
+    return histograma, premios
+
+
+def actualizar_checkpoint_vectorizado(checkpoint, jugadas, pendientes, workers=1, filas=None):
+    """
+    Versión vectorizada (y opcionalmente multi-proceso) de actualizar_checkpoint.
+    Acumula en el checkpoint exactamente los mismos histogramas y resultados,
+    también para jugadas con números repetidos o fuera de rango.
+
+    filas: fila del histograma del checkpoint de cada jugada (por defecto 0..T-1).
+    """
+    if not pendientes or not jugadas:
+        return
+
+    incidencia = incidencia_sorteos(pendientes)
+    jugadas_bits = bitmask_jugadas(j['numeros'] for j in jugadas)
+
+    histograma, premios = aciertos_jugadas_paralelo(incidencia, jugadas_bits, workers)
+    # Mismo orden que recorrer sorteo → jugada → modalidad
+    premios.sort(key=lambda x: (x[1], x[0], x[2]))
+
+    if filas is None:
+        checkpoint['histograma'] += histograma
+    else:
+        checkpoint['histograma'][np.asarray(filas, dtype=np.intp)] += histograma
+
+    for t, p, m, cantidad in premios:
+        jugada = jugadas[t]
+        sorteo = pendientes[p]
+        numeros_sorteo = set(sorteo[MODALIDADES[m]])
+        resultados = checkpoint[f'resultados_{cantidad}']
+        resultados.setdefault(jugada['id'], []).append({
+            'fecha': sorteo['fecha'],
+            'sorteo': sorteo['sorteo'],
+            'modalidad': MODALIDADES_NOMBRES[MODALIDADES[m]],
+            'numeros_acertados': sorted(numeros_sorteo.intersection(jugada['numeros'])),
+            'jugada_completa': jugada['numeros']
+        })
+
+
+def comprobar_equivalencia(jugadas, sorteos, workers=2):
+    """
+    Verifica las jugadas contra los sorteos con la referencia escalar, con el
+    núcleo vectorizado y con `workers` procesos, y compara los checkpoints
+    (histogramas y premios). Devuelve un dict {comparación: bool}.
+    """
+    serial = checkpoint_vacio(jugadas)
+    actualizar_checkpoint_serial(serial, jugadas, sorteos)
+
+    resultados = {}
+    for nombre, n in (('vectorizado', 1), ('paralelo', workers)):
+        checkpoint = checkpoint_vacio(jugadas)
+        actualizar_checkpoint_vectorizado(checkpoint, jugadas, sorteos, n)
+        resultados[nombre] = np.array_equal(checkpoint['histograma'], serial['histograma']) and all(
+            checkpoint[clave] == serial[clave] for clave in ('resultados_5', 'resultados_6')
+        )
+    return resultados
@@ -321,4 +321,7 @@ def save_to_csv(result):
         writer.writerows(sorteos)
     
     print(f"✔️ Sorteo {result['sorteo']} guardado en {CSV_PATH}")
+    
+    from tombola.derivados import actualizar_derivados
+    actualizar_derivados('quini6')
     return True
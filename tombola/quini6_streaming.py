@@ -0,0 +1,184 @@
+# tombola/quini6_streaming.py
+import csv
+import io
+import json
+import numpy as np
+from multiprocessing import Pool
+from tombola.quini6_checkpoint import MODALIDADES
+from tombola.paralelo import imap_acotado
+
+TAM_BLOQUE = 10000
+CAMPOS_SALIDA = ['id', 'modalidad', 'aciertos', 'numeros_acertados', 'jugada']
+
+
+def iterar_bloques_jugadas(f, tam_bloque=TAM_BLOQUE, resumen=None):
+    """
+    Lee un archivo de jugadas (jugada_id, n1..n6) en bloques de tamaño fijo.
+    Genera tuplas (ids, matriz) donde matriz es un array (bloque, 6).
+    Las filas vacías o inválidas se saltean (y se cuentan en resumen['invalidas']).
+    """
+    reader = csv.DictReader(f)
+    ids = []
+    numeros = []
+
+    for row in reader:
+        if not row.get('jugada_id'):  # Skip empty rows
+            continue
+        try:
+            nums = [int(row[f'n{i}']) for i in range(1, 7)]
+        except (ValueError, KeyError, TypeError):
+            if resumen is not None:
+                resumen['invalidas'] += 1
+            continue
+        if len(set(nums)) != 6 or min(nums) < 0 or max(nums) > 45:
+            if resumen is not None:
+                resumen['invalidas'] += 1
+            continue
+
+        ids.append(row['jugada_id'])
+        numeros.append(nums)
+
+        if len(ids) >= tam_bloque:
+            yield ids, np.array(numeros, dtype=np.int8)
+            ids = []
+            numeros = []
+
+    if ids:
+        yield ids, np.array(numeros, dtype=np.int8)
+
+
+def incidencia_sorteo(sorteo):
+    """Matriz booleana (4, 46): qué números salieron en cada modalidad."""
+    incidencia = np.zeros((len(MODALIDADES), 46), dtype=bool)
+    for idx, modalidad_key in enumerate(MODALIDADES):
+        incidencia[idx, sorteo[modalidad_key]] = True
+    return incidencia
+
+
+def resumen_vacio():
+    """Contadores que acumula iterar_ganadores mientras recorre el archivo."""
+    return {
+        'jugadas': 0,
+        'invalidas': 0,
+        'ganadores': 0,
+        'totales': {m: {'6': 0, '5': 0, '4': 0, '3': 0} for m in MODALIDADES}
+    }
+
+
+def ganadores_de_bloque(incidencia, ids, bloque, minimo_aciertos=3):
+    """Devuelve la lista de ganadores de un bloque de jugadas, en orden (modalidad, jugada)."""
+    # aciertos[m, j] = cantidad de números de la jugada j que salieron en la modalidad m
+    aciertos = incidencia[:, bloque].sum(axis=2)
+    ganadores = []
+
+    for m_idx, j_idx in zip(*np.nonzero(aciertos >= minimo_aciertos)):
+        jugada = bloque[j_idx]
+        ganadores.append({
+            'id': ids[j_idx],
+            'modalidad': MODALIDADES[m_idx],
+            'aciertos': int(aciertos[m_idx, j_idx]),
+            'numeros_acertados': sorted(int(n) for n in jugada[incidencia[m_idx, jugada]]),
+            'jugada': [int(n) for n in jugada]
+        })
+
+    return ganadores
+
+
+_INCIDENCIA_WORKER = {}
+
+
+def _inicializar_worker(incidencia, minimo_aciertos):
+    """La incidencia del sorteo se envía una sola vez por proceso, no por bloque."""
+    _INCIDENCIA_WORKER['incidencia'] = incidencia
+    _INCIDENCIA_WORKER['minimo'] = minimo_aciertos
+
+
+def _procesar_bloque(args):
+    ids, bloque = args
+    return len(ids), ganadores_de_bloque(
+        _INCIDENCIA_WORKER['incidencia'], ids, bloque, _INCIDENCIA_WORKER['minimo']
+    )
+
+
+def iterar_ganadores(f, sorteo, tam_bloque=TAM_BLOQUE, minimo_aciertos=3, resumen=None, workers=1):
+    """
+    Verifica un archivo de jugadas contra las 4 modalidades del sorteo, bloque a bloque.
+    Genera un dict por cada (jugada, modalidad) con minimo_aciertos o más.
+    La memoria usada depende solo de tam_bloque, no del tamaño del archivo.
+
+    Con workers > 1 los bloques se verifican en un pool de procesos; los resultados
+    se consumen en el orden de los bloques, así la salida es idéntica a la serial.
+    """
+    incidencia = incidencia_sorteo(sorteo)
+    bloques = iterar_bloques_jugadas(f, tam_bloque, resumen)
+
+    if workers > 1:
+        pool = Pool(workers, initializer=_inicializar_worker, initargs=(incidencia, minimo_aciertos))
+        # Como mucho 2 bloques por worker en vuelo: la memoria sigue acotada
+        resultados = imap_acotado(pool, _procesar_bloque, bloques, workers * 2)
+    else:
+        pool = None
+        resultados = (
+            (len(ids), ganadores_de_bloque(incidencia, ids, bloque, minimo_aciertos))
+            for ids, bloque in bloques
+        )
+
+    try:
+        for cantidad_jugadas, ganadores in resultados:
+            if resumen is not None:
+                resumen['jugadas'] += cantidad_jugadas
+                resumen['ganadores'] += len(ganadores)
+                for ganador in ganadores:
+                    totales = resumen['totales'][ganador['modalidad']]
+                    if str(ganador['aciertos']) in totales:
+                        totales[str(ganador['aciertos'])] += 1
+
+            yield from ganadores
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def formatear_ganador(ganador, formato):
+    """Serializa un ganador como línea CSV o JSON lines."""
+    if formato == 'jsonl':
+        return json.dumps(ganador, ensure_ascii=False) + '\n'
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerow([
+        ganador['id'],
+        ganador['modalidad'],
+        ganador['aciertos'],
+        '-'.join(str(n) for n in ganador['numeros_acertados']),
+        '-'.join(str(n) for n in ganador['jugada'])
+    ])
+    return buffer.getvalue()
+
+
+def iterar_lineas_salida(ganadores, formato):
+    """Genera las líneas de salida (con encabezado en CSV) a medida que llegan ganadores."""
+    if formato != 'jsonl':
+        yield ','.join(CAMPOS_SALIDA) + '\n'
+    for ganador in ganadores:
+        yield formatear_ganador(ganador, formato)
+
+
+def formato_por_extension(path):
+    """Devuelve 'jsonl' para archivos .jsonl/.ndjson y 'csv' para el resto."""
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def verificar_archivo(entrada_path, salida_path, sorteo, tam_bloque=TAM_BLOQUE, minimo_aciertos=3, workers=1):
+    """
+    Verifica un archivo de jugadas y escribe los ganadores de forma incremental
+    en salida_path (CSV o JSON lines según la extensión). Devuelve el resumen.
+    """
+    formato = formato_por_extension(salida_path)
+    resumen = resumen_vacio()
+
+    with open(entrada_path, newline='', encoding='utf-8', errors='replace') as entrada, \
+            open(salida_path, 'w', newline='', encoding='utf-8') as salida:
+        ganadores = iterar_ganadores(entrada, sorteo, tam_bloque, minimo_aciertos, resumen, workers)
+        for linea in iterar_lineas_salida(ganadores, formato):
+            salida.write(linea)
+
+    return resumen
@@ -0,0 +1,113 @@
+# tombola/series_stats.py
+import os
+import numpy as np
+from config import DATA_DIR
+from tombola.matriz_sorteos import cargar_matriz, matriz_incidencia, validar_juego
+
+ESTADISTICAS = ('frecuencia', 'omision', 'demora_maxima')
+
+# Series ya calculadas por juego: {juego: (mtime del CSV, sorteos, series)}
+_SERIES = {}
+
+
+def calcular_series(matriz, juego):
+    """
+    Frecuencia, omisión y demora máxima de cada número después de cada fecha,
+    en una sola pasada vectorizada sobre la incidencia del histórico.
+
+    Igual que las estadísticas de cada juego, Quini 6 cuenta sub-sorteos
+    (4 por fecha); el valor de la fecha t es el que tendrían las estadísticas
+    calculadas con los sorteos hasta t inclusive.
+
+    Devuelve {estadistica: array int32 (fechas, maximo + 1)} indexado por número.
+    """
+    incidencia = matriz_incidencia(matriz, juego)
+    fechas, modalidades, tam = incidencia.shape
+    sub = incidencia.reshape(fechas * modalidades, tam)
+    idx = np.arange(len(sub))[:, None]
+
+    # Último sub-sorteo en que salió cada número hasta s inclusive (-1 = nunca)
+    ultima = np.maximum.accumulate(np.where(sub, idx, -1), axis=0)
+    anterior = np.vstack([np.full((1, tam), -1), ultima[:-1]])
+
+    frecuencia = np.cumsum(sub, axis=0, dtype=np.int32)
+    omision = np.where(ultima >= 0, idx - ultima, idx + 1)
+    # Hueco que se cierra cada vez que el número sale (excluye ambos extremos)
+    huecos = np.where(sub & (anterior >= 0), idx - anterior - 1, 0)
+    demora_maxima = np.maximum.accumulate(huecos, axis=0)
+
+    fin_de_fecha = np.arange(1, fechas + 1) * modalidades - 1
+    return {
+        'frecuencia': frecuencia[fin_de_fecha],
+        'omision': omision[fin_de_fecha].astype(np.int32),
+        'demora_maxima': demora_maxima[fin_de_fecha].astype(np.int32)
+    }
+
+
+def obtener_series(juego):
+    """
+    Series del juego, recalculadas solo si cambió el CSV (mismo criterio que
+    indice_sorteos): una consulta con el CSV sin cambios no lo vuelve a leer.
+    Devuelve (sorteos, series).
+    """
+    validar_juego(juego)
+    mtime = os.path.getmtime(os.path.join(DATA_DIR, f"{juego}.csv"))
+
+    guardado = _SERIES.get(juego)
+    if guardado is None or guardado[0] != mtime:
+        sorteos, matriz = cargar_matriz(juego)
+        guardado = (mtime, sorteos, calcular_series(matriz, juego))
+        _SERIES[juego] = guardado
+    return guardado[1], guardado[2]
+
+
+def _indices_muestreo(total, paso=1, puntos=None):
+    """Índices de fechas a devolver: cada `paso` fechas (o ~`puntos` en total), siempre con la última."""
+    if total == 0:
+        return np.zeros(0, dtype=np.intp)
+    if puntos:
+        paso = max(paso, -(-total // puntos))
+    return np.arange(total - 1, -1, -max(1, paso))[::-1]
+
+
+def series_payload(juego, numeros=None, estadisticas=None, paso=1, puntos=None, desde=None, hasta=None):
+    """
+    Payload de la API de series.
+
+    - numeros: lista de números a incluir (todos por defecto)
+    - estadisticas: subconjunto de ESTADISTICAS
+    - paso / puntos: submuestreo (cada `paso` fechas o ~`puntos` puntos)
+    - desde / hasta: rango de fechas YYYY-MM-DD (inclusive)
+    """
+    info = validar_juego(juego)
+    sorteos, series = obtener_series(juego)
+
+    numeros = numeros or list(range(info['minimo'], info['maximo'] + 1))
+    for n in numeros:
+        if not info['minimo'] <= n <= info['maximo']:
+            raise ValueError(f"Número {n} fuera de rango ({info['minimo']}-{info['maximo']})")
+
+    estadisticas = estadisticas or list(ESTADISTICAS)
+    for e in estadisticas:
+        if e not in ESTADISTICAS:
+            raise ValueError(f"Estadística '{e}' no reconocida. Disponibles: {', '.join(ESTADISTICAS)}")
+
+    fechas = np.array([s['fecha'] for s in sorteos])
+    en_rango = np.ones(len(sorteos), dtype=bool)
+    if desde:
+        en_rango &= fechas >= desde
+    if hasta:
+        en_rango &= fechas <= hasta
+    base = np.flatnonzero(en_rango)
+    indices = base[_indices_muestreo(len(base), paso, puntos)]
+
+    return {
+        'sorteos_count': len(sorteos),
+        'puntos': len(indices),
+        'fechas': fechas[indices].tolist(),
+        'sorteos': [sorteos[i]['sorteo'] for i in indices],
+        'series': {
+            str(n): {e: series[e][indices, n].tolist() for e in estadisticas}
+            for n in numeros
+        }
+    }
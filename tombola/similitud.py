@@ -0,0 +1,261 @@
+# tombola/similitud.py
+import csv
+import os
+import time
+from multiprocessing import Pool
+import numpy as np
+from config import SIMILITUD_DIR
+from tombola.bitmask import a_bitmask, popcount
+from tombola.matriz_sorteos import cargar_matriz, validar_juego, version_matriz
+from tombola.paralelo import rangos
+from tombola.probabilidades import tabla_hipergeometrica
+
+# Vecinos por sub-sorteo que se devuelven por defecto
+TOP_DEFAULT = 10
+# Vecinos por sub-sorteo que se calculan y guardan: un `top` menor es un recorte
+TOP_MAXIMO = 50
+# Columnas (sub-sorteos) por bloque: cada fila mantiene su top-K mientras recorre los bloques
+COLUMNAS_BLOQUE = 8192
+# Memoria temporal por bloque (AND + popcount + claves int64): acota la RAM de cada worker
+MEMORIA_BLOQUE = 64 * 1024 * 1024
+
+# Vecinos ya cargados: {juego: (version, datos)}
+_VECINOS = {}
+
+
+def get_similitud_filename(juego):
+    """Archivo con los TOP_MAXIMO vecinos más parecidos de cada sub-sorteo."""
+    return os.path.join(SIMILITUD_DIR, f"{juego}_vecinos.npz")
+
+
+def validar_top(top):
+    """Lanza ValueError si `top` está fuera de 1..TOP_MAXIMO."""
+    if not 1 <= top <= TOP_MAXIMO:
+        raise ValueError(f"top debe estar entre 1 y {TOP_MAXIMO}")
+    return top
+
+
+def jaccard(comunes, picks):
+    """Jaccard entre dos sorteos de `picks` números con `comunes` en común: c / (2·picks − c)."""
+    return comunes / (2 * picks - comunes)
+
+
+def vecinos_tramo(bits, inicio, fin, top, picks):
+    """
+    Top-`top` vecinos de los sub-sorteos [inicio, fin) contra todo el histórico,
+    recorriendo la matriz de similitud por bloques (filas × COLUMNAS_BLOQUE) sin
+    armarla completa: cada bloque es un AND de bitmasks + popcount, y el top-K
+    de cada fila se actualiza con argpartition sobre (top-K actual + bloque).
+
+    Con sorteos del mismo tamaño, Jaccard (c / (2p − c)) y solapamiento (c / p)
+    son crecientes en los números en común c, así que alcanza con rankear por c.
+    A igualdad gana el sub-sorteo más reciente; el propio sub-sorteo se excluye.
+
+    Devuelve (vecinos int32 (filas, top), comunes uint8 (filas, top),
+    distribucion (picks + 1,) con cuántos pares i < j de las filas tienen 0..picks en común).
+    """
+    total = len(bits)
+    columnas = min(COLUMNAS_BLOQUE, total)
+    # Por fila: AND + popcount + clave del bloque, y candidatos (top + bloque) con sus índices
+    por_fila = columnas * (bits.itemsize + 1 + 8) + (top + columnas) * 16
+    lote = max(1, MEMORIA_BLOQUE // por_fila)
+
+    vecinos = np.empty((fin - inicio, top), dtype=np.int32)
+    comunes = np.empty((fin - inicio, top), dtype=np.uint8)
+    distribucion = np.zeros(picks + 1, dtype=np.int64)
+
+    for a in range(inicio, fin, lote):
+        b = min(a + lote, fin)
+        filas = np.arange(a, b)[:, None]
+        mejores = np.full((b - a, 0), -1, dtype=np.int64)
+        for c in range(0, total, columnas):
+            d = min(c + columnas, total)
+            en_comun = popcount(bits[a:b, None] & bits[None, c:d])
+            cols = np.arange(c, d)[None, :]
+
+            superior = cols > filas
+            distribucion += np.bincount(en_comun[superior], minlength=picks + 1)
+
+            # Clave única: coincidencias primero y, a igualdad, el más reciente
+            clave = en_comun.astype(np.int64) * total + cols
+            clave[cols == filas] = -1
+            candidatos = np.concatenate([mejores, clave], axis=1)
+            k = min(top, candidatos.shape[1])
+            mejores = np.take_along_axis(candidatos, np.argpartition(-candidatos, k - 1, axis=1)[:, :k], axis=1)
+
+        mejores = -np.sort(-mejores, axis=1)
+        vecinos[a - inicio:b - inicio] = mejores % total
+        comunes[a - inicio:b - inicio] = mejores // total
+    return vecinos, comunes, distribucion
+
+
+def _tarea_vecinos(tarea):
+    """Tarea de un worker: vecinos de un tramo de filas."""
+    bits, inicio, fin, top, picks = tarea
+    return inicio, vecinos_tramo(bits, inicio, fin, top, picks)
+
+
+def calcular_vecinos(juego, workers=1, forzar=False):
+    """
+    Los TOP_MAXIMO vecinos más parecidos de cada sorteo de Telekino / sub-sorteo de Quini 6
+    (índice fila × modalidades + modalidad), repartiendo tramos de filas entre
+    `workers` procesos. Se cachea en memoria y en disco por versión del dataset
+    y solo se recalcula cuando cambia el histórico (o con forzar=True).
+
+    Devuelve (sorteos, datos) con datos: vecinos, comunes, distribucion, segundos.
+    """
+    info = validar_juego(juego)
+    sorteos, matriz = cargar_matriz(juego)
+    version = version_matriz(matriz)
+    bits = a_bitmask(matriz.reshape(-1, info['picks']), info['maximo'])
+    total = len(bits)
+    if total < 2:
+        raise ValueError("Se necesitan al menos 2 sorteos")
+    top = min(TOP_MAXIMO, total - 1)
+
+    clave = juego
+    guardado = _VECINOS.get(clave)
+    if not forzar and guardado is not None and guardado[0] == version:
+        return sorteos, guardado[1]
+
+    archivo = get_similitud_filename(juego)
+    if not forzar and os.path.exists(archivo):
+        try:
+            with np.load(archivo) as cache:
+                if str(cache['version']) == version:
+                    datos = {k: cache[k] for k in ('vecinos', 'comunes', 'distribucion')}
+                    datos['segundos'] = float(cache['segundos'])
+                    _VECINOS[clave] = (version, datos)
+                    return sorteos, datos
+        except (OSError, KeyError, ValueError):
+            pass
+
+    vecinos = np.empty((total, top), dtype=np.int32)
+    comunes = np.empty((total, top), dtype=np.uint8)
+    distribucion = np.zeros(info['picks'] + 1, dtype=np.int64)
+    tareas = [(bits, a, b, top, info['picks']) for a, b in rangos(total, max(1, workers) * 4)]
+
+    inicio = time.perf_counter()
+    if workers > 1:
+        with Pool(workers) as pool:
+            resultados = list(pool.imap_unordered(_tarea_vecinos, tareas))
+    else:
+        resultados = [_tarea_vecinos(tarea) for tarea in tareas]
+    for a, (v, c, dist) in resultados:
+        vecinos[a:a + len(v)] = v
+        comunes[a:a + len(c)] = c
+        distribucion += dist
+    segundos = time.perf_counter() - inicio
+
+    os.makedirs(SIMILITUD_DIR, exist_ok=True)
+    temporal = archivo + '.tmp.npz'
+    np.savez(temporal, vecinos=vecinos, comunes=comunes, distribucion=distribucion,
+             version=version, segundos=segundos)
+    os.replace(temporal, archivo)
+
+    datos = {'vecinos': vecinos, 'comunes': comunes, 'distribucion': distribucion, 'segundos': segundos}
+    _VECINOS[clave] = (version, datos)
+    return sorteos, datos
+
+
+def _describir(sorteos, matriz, info, indice):
+    """Fecha, sorteo, modalidad y números del sub-sorteo `indice`."""
+    fila, m = divmod(int(indice), len(info['modalidades']))
+    return {
+        'fecha': sorteos[fila]['fecha'],
+        'sorteo': str(sorteos[fila]['sorteo']),
+        'modalidad': info['modalidades'][m],
+        'numeros': sorted(int(n) for n in matriz[fila, m])
+    }
+
+
+def similares_payload(juego, sorteo=None, modalidad=None, top=TOP_DEFAULT, workers=1):
+    """
+    Vista "sorteos parecidos": los `top` sub-sorteos históricos con más números
+    en común con un sorteo dado (por defecto el último; Quini 6: la modalidad
+    indicada, por defecto la primera), con Jaccard y los números compartidos.
+
+    Incluye la distribución de números en común sobre todos los pares de
+    sub-sorteos contra la esperada con sorteos independientes (hipergeométrica).
+    """
+    info = validar_juego(juego)
+    validar_top(top)
+    sorteos, datos = calcular_vecinos(juego, workers)
+    _, matriz = cargar_matriz(juego)
+
+    if sorteo is None:
+        fila = len(sorteos) - 1
+    else:
+        filas = [i for i, s in enumerate(sorteos) if str(s['sorteo']) == str(sorteo)]
+        if not filas:
+            raise ValueError(f"Sorteo {sorteo} no encontrado")
+        fila = filas[-1]
+    modalidad = modalidad or info['modalidades'][0]
+    if modalidad not in info['modalidades']:
+        raise ValueError(f"Modalidad '{modalidad}' no válida. Disponibles: {', '.join(info['modalidades'])}")
+    indice = fila * len(info['modalidades']) + info['modalidades'].index(modalidad)
+
+    origen = _describir(sorteos, matriz, info, indice)
+    similares = []
+    for j, c in zip(datos['vecinos'][indice, :top], datos['comunes'][indice, :top]):
+        vecino = _describir(sorteos, matriz, info, j)
+        vecino['comunes'] = int(c)
+        vecino['jaccard'] = round(jaccard(int(c), info['picks']), 4)
+        vecino['en_comun'] = sorted(set(origen['numeros']) & set(vecino['numeros']))
+        similares.append(vecino)
+
+    pares = int(datos['distribucion'].sum())
+    esperado = pares * tabla_hipergeometrica(juego)['probabilidades']
+    return {
+        'origen': origen,
+        'similares': similares,
+        'subsorteos_count': len(datos['vecinos']),
+        'distribucion': {
+            'pares': pares,
+            'observado': datos['distribucion'].tolist(),
+            'esperado': esperado.tolist()
+        }
+    }
+
+
+def exportar_vecinos(juego, salida, top=TOP_DEFAULT, workers=1):
+    """
+    Exporta el grafo de vecinos (una arista por sub-sorteo y vecino) a CSV para
+    clustering offline: origen, destino (sorteo/modalidad), comunes, jaccard.
+    """
+    info = validar_juego(juego)
+    validar_top(top)
+    sorteos, datos = calcular_vecinos(juego, workers)
+    vecinos, comunes = datos['vecinos'][:, :top], datos['comunes'][:, :top]
+    m = len(info['modalidades'])
+
+    def nombre(indice):
+        fila, mod = divmod(int(indice), m)
+        return f"{sorteos[fila]['sorteo']}/{info['modalidades'][mod]}"
+
+    with open(salida, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['origen', 'destino', 'comunes', 'jaccard'])
+        for i, (fila_vecinos, fila_comunes) in enumerate(zip(vecinos, comunes)):
+            for j, c in zip(fila_vecinos, fila_comunes):
+                writer.writerow([nombre(i), nombre(j), int(c), round(jaccard(int(c), info['picks']), 4)])
+    return vecinos.size
+
+
+def imprimir_similares(juego, payload):
+    """Imprime los sorteos más parecidos y la distribución de números en común."""
+    info = validar_juego(juego)
+    origen = payload['origen']
+    modalidad = f" ({origen['modalidad']})" if len(info['modalidades']) > 1 else ""
+    print(f"\n=== SORTEOS MÁS PARECIDOS AL {origen['sorteo']}{modalidad} DEL {origen['fecha']} ===")
+    print(f"Números: {' - '.join(f'{n:02d}' for n in origen['numeros'])}")
+    for s in payload['similares']:
+        modalidad = f" {s['modalidad']:<13}" if len(info['modalidades']) > 1 else ""
+        print(f"{s['fecha']} #{s['sorteo']}{modalidad} {s['comunes']:>2} en común (Jaccard {s['jaccard']:.3f}): "
+              f"{' - '.join(f'{n:02d}' for n in s['en_comun'])}")
+
+    dist = payload['distribucion']
+    print(f"\n=== NÚMEROS EN COMÚN ENTRE PARES DE SORTEOS ({dist['pares']:,} pares) ===")
+    for c, (o, e) in enumerate(zip(dist['observado'], dist['esperado'])):
+        if o or e >= 0.5:
+            print(f"{c:>2} en común: observado {o:>8} | esperado {e:>10.1f}")
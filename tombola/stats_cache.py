@@ -85,20 +85,24 @@ def get_cache_date_range(juego, query_date=None):
     return from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d')
 
 
-def get_cache_filename(juego, query_date=None):
-    """Genera el nombre del archivo de caché basado en el rango de fechas."""
+def get_cache_filename(juego, query_date=None, ventana=None):
+    """
+    Genera el nombre del archivo de caché basado en el rango de fechas.
+    Las estadísticas de los últimos N sorteos (ventana) tienen su propio archivo.
+    """
     os.makedirs(CACHE_DIR, exist_ok=True)
     
+    prefijo = f"{juego}_v{ventana}" if ventana else juego
     from_date, to_date = get_cache_date_range(juego, query_date)
     if from_date and to_date:
-        return f"{CACHE_DIR}/{juego}_{from_date}_to_{to_date}.json"
+        return f"{CACHE_DIR}/{prefijo}_{from_date}_to_{to_date}.json"
     else:
-        return f"{CACHE_DIR}/{juego}_stats_all.json"
+        return f"{CACHE_DIR}/{prefijo}_stats_all.json"
 
 
-def load_cached_stats(juego, fecha_limite=None):
+def load_cached_stats(juego, fecha_limite=None, ventana=None):
     """Carga estadísticas desde caché si existe para el rango de fechas apropiado."""
-    cache_file = get_cache_filename(juego, fecha_limite)
+    cache_file = get_cache_filename(juego, fecha_limite, ventana)
     
     if not os.path.exists(cache_file):
         return None
@@ -114,9 +118,9 @@ def load_cached_stats(juego, fecha_limite=None):
         return None
 
 
-def save_stats_to_cache(juego, fecha_limite, stats_data):
+def save_stats_to_cache(juego, fecha_limite, stats_data, ventana=None):
     """Guarda estadísticas en caché con el nombre basado en rango de fechas."""
-    cache_file = get_cache_filename(juego, fecha_limite)
+    cache_file = get_cache_filename(juego, fecha_limite, ventana)
     
     try:
         # Agregar metadata
@@ -127,6 +131,7 @@ def save_stats_to_cache(juego, fecha_limite, stats_data):
             'juego': juego,
             'valid_from': from_date,
             'valid_to': to_date,
+            'ventana': ventana,
             'stats': stats_data
         }
         
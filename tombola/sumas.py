@@ -0,0 +1,153 @@
+# tombola/sumas.py
+import os
+import numpy as np
+from config import SUMAS_DIR
+from tombola.features import cargar_features
+from tombola.matriz_sorteos import validar_juego
+
+# Distribuciones exactas ya cargadas: (juego, k) → (sumas, formas)
+_DISTRIBUCIONES = {}
+
+
+def get_sumas_filename(juego, k):
+    """Archivo con la distribución exacta de la suma de k números de un juego."""
+    return os.path.join(SUMAS_DIR, f"{juego}_k{k}.npz")
+
+
+def contar_sumas(numeros, k):
+    """
+    Cantidad de subconjuntos de k números distintos con cada suma, por
+    programación dinámica sobre (cantidad, suma): cada número x se agrega a
+    todos los subconjuntos de cantidad c - 1 para formar los de cantidad c.
+    O(len(numeros) · k · suma máxima) operaciones, sin enumerar combinaciones.
+
+    Devuelve un array int64 indexado por suma (0 .. suma máxima).
+    """
+    numeros = np.asarray(numeros, dtype=np.int64)
+    maximo = int(np.sort(numeros)[::-1][:k].sum())
+    formas = np.zeros((k + 1, maximo + 1), dtype=np.int64)
+    formas[0, 0] = 1
+    for x in numeros:
+        x = int(x)
+        if x > maximo:
+            continue
+        # Del lado derecho se lee la tabla antes de sumar: cada número se usa una vez
+        formas[1:, x:] = formas[1:, x:] + formas[:-1, :maximo + 1 - x]
+    return formas[k]
+
+
+def distribucion_sumas(juego, k=None):
+    """
+    Distribución exacta de la suma de k números distintos del rango del juego
+    (por defecto los picks): (sumas, formas), solo las sumas posibles.
+    Se calcula una vez y queda cacheada en disco y en memoria.
+    """
+    info = validar_juego(juego)
+    rango = info['maximo'] - info['minimo'] + 1
+    k = info['picks'] if k is None else k
+    if not 1 <= k <= rango:
+        raise ValueError(f"k debe estar entre 1 y {rango}")
+
+    clave = (juego, k)
+    if clave in _DISTRIBUCIONES:
+        return _DISTRIBUCIONES[clave]
+
+    archivo = get_sumas_filename(juego, k)
+    if os.path.exists(archivo):
+        try:
+            with np.load(archivo) as guardado:
+                _DISTRIBUCIONES[clave] = (guardado['sumas'], guardado['formas'])
+                return _DISTRIBUCIONES[clave]
+        except (OSError, KeyError, ValueError):
+            pass
+
+    formas = contar_sumas(range(info['minimo'], info['maximo'] + 1), k)
+    sumas = np.flatnonzero(formas)
+    formas = formas[sumas]
+
+    os.makedirs(SUMAS_DIR, exist_ok=True)
+    temporal = archivo + '.tmp.npz'
+    np.savez(temporal, sumas=sumas, formas=formas)
+    os.replace(temporal, archivo)
+    _DISTRIBUCIONES[clave] = (sumas, formas)
+    return sumas, formas
+
+
+def _resumen(sumas, pesos):
+    """Media y desvío de una distribución dada por valores y pesos."""
+    total = pesos.sum()
+    media = (sumas * pesos).sum() / total
+    return float(media), float(np.sqrt(((sumas - media) ** 2 * pesos).sum() / total))
+
+
+def sumas_payload(juego, fecha_limite=None, modalidad=None):
+    """
+    Distribución exacta de la suma de un sorteo junto al histograma observado,
+    lista para graficar: mismas etiquetas (todas las sumas posibles) para la
+    probabilidad, el esperado (probabilidad × sub-sorteos) y lo observado.
+    La media del sorteo es la suma / picks, así que el mismo payload sirve para
+    el gráfico de promedios (`medias`).
+
+    Quini 6: todas las modalidades juntas, o solo `modalidad` (nombre).
+    """
+    info = validar_juego(juego)
+    sumas, formas = distribucion_sumas(juego)
+    probabilidades = formas / formas.sum()
+
+    sorteos, features = cargar_features(juego)
+    n = int(np.searchsorted(features['fecha'], fecha_limite)) if fecha_limite else len(sorteos)
+    observadas = features['suma'][:n]
+    if modalidad is not None:
+        if modalidad not in info['modalidades']:
+            raise ValueError(f"Modalidad '{modalidad}' no válida. Disponibles: {', '.join(info['modalidades'])}")
+        observadas = observadas[:, info['modalidades'].index(modalidad)]
+    observadas = observadas.ravel().astype(np.int64)
+
+    conteo = np.bincount(observadas - sumas[0], minlength=len(sumas)) if len(observadas) else np.zeros(len(sumas), dtype=np.int64)
+    media, desvio = _resumen(sumas, probabilidades)
+    acumulada = np.cumsum(probabilidades)
+    bajo, alto = sumas[np.searchsorted(acumulada, 0.05)], sumas[np.searchsorted(acumulada, 0.95)]
+
+    return {
+        'modalidad': modalidad,
+        'sorteos_count': n,
+        'subsorteos_count': len(observadas),
+        'labels': sumas.tolist(),
+        'medias': [round(s / info['picks'], 4) for s in sumas.tolist()],
+        'probabilidad': probabilidades.tolist(),
+        'esperado': (probabilidades * len(observadas)).tolist(),
+        'observado': conteo.tolist(),
+        'exacta': {
+            'combinaciones': int(formas.sum()),
+            'media': media,
+            'desvio': desvio,
+            'intervalo_90': [int(bajo), int(alto)]
+        },
+        'observada': {
+            'media': float(observadas.mean()) if len(observadas) else None,
+            'desvio': float(observadas.std()) if len(observadas) else None,
+            'dentro_intervalo_90': float(((observadas >= bajo) & (observadas <= alto)).mean()) if len(observadas) else None
+        }
+    }
+
+
+def imprimir_sumas(juego, payload, ancho=10):
+    """Imprime la distribución exacta vs la observada, agrupando las sumas de a `ancho`."""
+    info = validar_juego(juego)
+    exacta, observada = payload['exacta'], payload['observada']
+    print(f"\n=== SUMA DE LOS {info['picks']} NÚMEROS ({info['nombre'].upper()}, {payload['subsorteos_count']} sorteos"
+          f"{', ' + payload['modalidad'] if payload['modalidad'] else ''}) ===")
+    print(f"Exacta: media {exacta['media']:.2f}, desvío {exacta['desvio']:.2f}, "
+          f"90% entre {exacta['intervalo_90'][0]} y {exacta['intervalo_90'][1]} ({exacta['combinaciones']:,} combinaciones)")
+    if observada['media'] is not None:
+        print(f"Observada: media {observada['media']:.2f}, desvío {observada['desvio']:.2f}, "
+              f"{observada['dentro_intervalo_90'] * 100:.1f}% dentro del intervalo del 90%")
+
+    labels = np.array(payload['labels'])
+    grupos = (labels - labels[0]) // ancho
+    esperado = np.bincount(grupos, weights=payload['esperado'])
+    observado = np.bincount(grupos, weights=payload['observado'])
+    print()
+    for g, (e, o) in enumerate(zip(esperado, observado)):
+        desde = labels[0] + g * ancho
+        print(f"{desde:>4}-{desde + ancho - 1:<4} esperado {e:>8.1f} | observado {int(o):>6}")
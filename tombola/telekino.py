@@ -2,6 +2,7 @@ import csv
 from collections import Counter, defaultdict
 from itertools import combinations
 import random
+import numpy as np
 from .base_game import BaseGame
 from config import DATA_DIR
 
@@ -130,17 +131,27 @@ def calcular_coocurrencia(numeros_por_sorteo):
     return pares
 
 
-def procesar_estadisticas(fecha_limite=None, use_cache=True):
+def procesar_estadisticas(fecha_limite=None, use_cache=True, ventana=None):
     from tombola.stats_cache import load_cached_stats, save_stats_to_cache
     
     # Intentar cargar desde caché
     if use_cache:
-        cached = load_cached_stats('telekino', fecha_limite)
+        cached = load_cached_stats('telekino', fecha_limite, ventana)
         if cached:
             print("📦 Cargando estadísticas desde caché...\n")
             _print_telekino_stats(cached['stats'], fecha_limite)
             return
     
+    # Estadísticas de los últimos N sorteos
+    if ventana:
+        from tombola.ventana_stats import estadisticas_ventana
+        stats_data = estadisticas_ventana('telekino', ventana, fecha_limite)
+        print(f"\n=== VENTANA: ÚLTIMOS {stats_data['sorteos_count']} SORTEOS ===")
+        if use_cache:
+            save_stats_to_cache('telekino', fecha_limite, stats_data, ventana)
+        _print_telekino_stats(stats_data, fecha_limite)
+        return
+    
     # Calcular estadísticas
     sorteos, numeros_por_sorteo = load_data(fecha_limite)
 
@@ -150,26 +161,35 @@ def procesar_estadisticas(fecha_limite=None, use_cache=True):
         print(f"📅 Filtrado: Solo sorteos anteriores a {fecha_limite}")
         print(f"   (útil para backtesting de estrategias)")
 
+    # Preparar datos para caché
+    stats_data = calcular_estadisticas(sorteos, numeros_por_sorteo)
+    
+    # Guardar en caché
+    if use_cache:
+        save_stats_to_cache('telekino', fecha_limite, stats_data)
+    
+    # Imprimir estadísticas
+    _print_telekino_stats(stats_data, fecha_limite)
+
+
+def calcular_estadisticas(sorteos, numeros_por_sorteo):
+    """Payload completo de estadísticas, incluidas las transiciones entre sorteos consecutivos."""
+    from tombola.transiciones import transiciones_payload
+    
     frec = calcular_frecuencias(numeros_por_sorteo)
     omision = calcular_omision(sorteos, numeros_por_sorteo)
     cooc = calcular_coocurrencia(numeros_por_sorteo)
     demora_max = calcular_demora_maxima(sorteos, numeros_por_sorteo)
+    matriz = np.array(numeros_por_sorteo, dtype=np.int8).reshape(len(sorteos), 1, 15)
     
-    # Preparar datos para caché
-    stats_data = {
+    return {
         'sorteos_count': len(sorteos),
         'frecuencias': dict(frec.most_common()),
         'omision': omision,
         'coocurrencia': {f"{a}-{b}": v for (a, b), v in cooc.most_common()},
-        'demora_maxima': demora_max
+        'demora_maxima': demora_max,
+        'transiciones': transiciones_payload(matriz, 'telekino')
     }
-    
-    # Guardar en caché
-    if use_cache:
-        save_stats_to_cache('telekino', fecha_limite, stats_data)
-    
-    # Imprimir estadísticas
-    _print_telekino_stats(stats_data, fecha_limite)
 
 
 def _print_telekino_stats(stats, fecha_limite):
@@ -216,6 +236,10 @@ def _print_telekino_stats(stats, fecha_limite):
     for pair_str, veces in cooc_sorted:
         print(f"{pair_str}: {veces} veces")
 
+    if stats.get('transiciones'):
+        from tombola.transiciones import imprimir_transiciones
+        imprimir_transiciones(stats['transiciones'])
+
 
 
 def check_repeated_combinations():
@@ -313,6 +313,9 @@ def save_to_csv(result):
         writer.writerows(sorteos)
     
     print(f"✔️ Sorteo {result['sorteo']} guardado en {CSV_PATH}")
+    
+    from tombola.derivados import actualizar_derivados
+    actualizar_derivados('telekino')
     return True
 
 
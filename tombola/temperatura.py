@@ -0,0 +1,145 @@
+# tombola/temperatura.py
+import math
+import os
+import numpy as np
+from config import TEMPERATURA_DIR
+from tombola.matriz_sorteos import cargar_matriz, matriz_incidencia, validar_juego, version_matriz
+
+# Vida media por defecto, en sorteos: el peso de un sorteo se reduce a la mitad cada 20 sorteos
+VIDA_MEDIA_DEFAULT = 20
+# Vidas medias que se persisten y se actualizan al guardar cada sorteo; el resto
+# se calcula por consulta sin escribir a disco
+VIDAS_MEDIAS = (10, 20, 50)
+
+
+def decaimiento_vida_media(vida_media):
+    """Factor por sorteo que reduce un peso a la mitad cada `vida_media` sorteos."""
+    if not math.isfinite(vida_media) or vida_media <= 0:
+        raise ValueError("La vida media debe ser un número finito mayor a 0")
+    return 0.5 ** (1 / vida_media)
+
+
+def get_temperatura_filename(juego, vida_media):
+    """Archivo con las temperaturas persistidas de un juego y vida media."""
+    return os.path.join(TEMPERATURA_DIR, f"{juego}_vm{vida_media:g}.npz")
+
+
+def extender_temperaturas(incidencia, decaimiento, previa=None):
+    """
+    Temperatura de cada número después de cada sorteo:
+        T(t) = decaimiento * T(t - 1) + apariciones en el sorteo t
+    Cada sorteo cuesta O(rango). Si se pasa `previa` (temperatura del último
+    sorteo ya calculado), continúa desde ahí.
+
+    Devuelve un array (sorteos, maximo + 1) indexado por número.
+    """
+    apariciones = incidencia.sum(axis=1, dtype=np.float64)
+    temperaturas = np.empty_like(apariciones)
+    actual = np.zeros(apariciones.shape[1]) if previa is None else previa.astype(np.float64)
+    for t, fila in enumerate(apariciones):
+        actual = actual * decaimiento + fila
+        temperaturas[t] = actual
+    return temperaturas
+
+
+def actualizar_temperaturas(juego, vida_media=VIDA_MEDIA_DEFAULT, datos=None):
+    """
+    Carga las temperaturas persistidas y calcula solo los sorteos nuevos.
+
+    El archivo guarda la temperatura después de cada sorteo (un checkpoint por
+    fecha) y la versión del dataset con la que se calculó. Si el histórico
+    actual empieza con esos mismos sorteos, solo se agregan los nuevos; si
+    cambió (ej. se insertó un sorteo viejo), se recalcula todo.
+
+    Solo para las vidas medias de VIDAS_MEDIAS (ValueError con otra).
+
+    Devuelve (sorteos, temperaturas).
+    """
+    validar_juego(juego)
+    if vida_media not in VIDAS_MEDIAS:
+        raise ValueError(f"Solo se persisten las vidas medias {', '.join(map(str, VIDAS_MEDIAS))}")
+    decaimiento = decaimiento_vida_media(vida_media)
+    sorteos, matriz = datos if datos is not None else cargar_matriz(juego)
+    archivo = get_temperatura_filename(juego, vida_media)
+
+    temperaturas = None
+    if os.path.exists(archivo):
+        try:
+            with np.load(archivo) as guardado:
+                n = len(guardado['temperaturas'])
+                if (float(guardado['vida_media']) == vida_media and n <= len(matriz)
+                        and str(guardado['version']) == version_matriz(matriz, n)):
+                    temperaturas = guardado['temperaturas']
+        except (OSError, KeyError, ValueError):
+            temperaturas = None
+
+    if temperaturas is not None and len(temperaturas) == len(matriz):
+        return sorteos, temperaturas
+
+    inicio = 0 if temperaturas is None else len(temperaturas)
+    previa = None if temperaturas is None or inicio == 0 else temperaturas[-1]
+    nuevas = extender_temperaturas(matriz_incidencia(matriz[inicio:], juego), decaimiento, previa)
+    temperaturas = nuevas if inicio == 0 else np.concatenate([temperaturas, nuevas])
+
+    os.makedirs(TEMPERATURA_DIR, exist_ok=True)
+    temporal = archivo + '.tmp.npz'
+    np.savez(temporal, temperaturas=temperaturas, version=version_matriz(matriz), vida_media=vida_media)
+    os.replace(temporal, archivo)
+    return sorteos, temperaturas
+
+
+def actualizar_vidas_medias(juego):
+    """Actualiza las temperaturas persistidas de todas las VIDAS_MEDIAS (una sola lectura del CSV)."""
+    datos = cargar_matriz(juego)
+    for vida_media in VIDAS_MEDIAS:
+        actualizar_temperaturas(juego, vida_media, datos)
+
+
+def temperatura_payload(juego, vida_media=VIDA_MEDIA_DEFAULT, fecha_limite=None):
+    """
+    Temperatura de cada número con los sorteos anteriores a fecha_limite
+    (el último sorteo si no se indica), ordenada de más caliente a más fría.
+    Las vidas medias de VIDAS_MEDIAS salen del archivo persistido; otra vida
+    media se calcula en el momento, sin guardar nada.
+    """
+    info = validar_juego(juego)
+    decaimiento = decaimiento_vida_media(vida_media)
+    if vida_media in VIDAS_MEDIAS:
+        sorteos, temperaturas = actualizar_temperaturas(juego, vida_media)
+    else:
+        sorteos, matriz = cargar_matriz(juego)
+        temperaturas = None
+
+    fechas = [s['fecha'] for s in sorteos]
+    n = len(fechas) if not fecha_limite else int(np.searchsorted(np.array(fechas), fecha_limite))
+    if n == 0:
+        raise ValueError("No hay sorteos anteriores a esa fecha")
+
+    numeros = range(info['minimo'], info['maximo'] + 1)
+    if temperaturas is None:
+        temperaturas = extender_temperaturas(matriz_incidencia(matriz[:n], juego), decaimiento)
+    actual = temperaturas[n - 1]
+    ranking = sorted(numeros, key=lambda x: (-actual[x], x))
+    return {
+        'vida_media': vida_media,
+        'fecha': fechas[n - 1],
+        'sorteo': sorteos[n - 1]['sorteo'],
+        'sorteos_count': n,
+        'temperatura': {x: round(float(actual[x]), 4) for x in numeros},
+        'ranking': ranking
+    }
+
+
+def imprimir_temperatura(juego, payload, top=10):
+    """Imprime los números más calientes y más fríos por temperatura."""
+    info = validar_juego(juego)
+    print(f"\n=== TEMPERATURA {info['nombre'].upper()} (vida media: {payload['vida_media']:g} sorteos) ===")
+    print(f"Después del sorteo {payload['sorteo']} ({payload['fecha']})")
+
+    print(f"\n=== TOP {top} - MÁS CALIENTES ===")
+    for n in payload['ranking'][:top]:
+        print(f"{n:02d} → {payload['temperatura'][n]:.2f}")
+
+    print(f"\n=== TOP {top} - MÁS FRÍOS ===")
+    for n in payload['ranking'][::-1][:top]:
+        print(f"{n:02d} → {payload['temperatura'][n]:.2f}")
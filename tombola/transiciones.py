@@ -0,0 +1,87 @@
+# tombola/transiciones.py
+import numpy as np
+from tombola.bitmask import a_bitmask, popcount
+from tombola.matriz_sorteos import validar_juego
+
+# Distancias (en sorteos) para las que se miden repetidos: t → t + 1, ..., t + LAG_MAXIMO
+LAG_MAXIMO = 5
+
+
+def calcular_transiciones(matriz, juego, lag_maximo=LAG_MAXIMO):
+    """
+    Transiciones entre sorteos sobre todo el histórico, con bitmasks: el
+    sorteo t de cada modalidad se compara con el t + k de la misma modalidad
+    con un AND entre el array de bitmasks y el mismo array corrido k lugares.
+
+    - repetidos[k]: array (sorteos - k, modalidades) con cuántos números del
+      sorteo t volvieron a salir en t + k (popcount del AND)
+    - reapariciones (maximo + 1,): cuántas veces cada número salió en t y
+      también en t + 1 (bit n del AND, sumado sobre sorteos y modalidades)
+    - base (maximo + 1,): cuántas veces salió cada número en un sorteo que tiene siguiente
+    """
+    info = validar_juego(juego)
+    bits = a_bitmask(matriz, info['maximo'])
+    numeros = np.arange(info['maximo'] + 1, dtype=bits.dtype)
+
+    repetidos = {}
+    for k in range(1, min(lag_maximo, len(bits) - 1) + 1):
+        repetidos[k] = popcount(bits[k:] & bits[:-k]).astype(np.int16)
+
+    def contar_bits(mascaras):
+        return ((mascaras[..., None] >> numeros) & 1).sum(axis=tuple(range(mascaras.ndim)), dtype=np.int64)
+
+    if len(bits) > 1:
+        reapariciones = contar_bits(bits[1:] & bits[:-1])
+        base = contar_bits(bits[:-1])
+    else:
+        reapariciones = base = np.zeros(len(numeros), dtype=np.int64)
+    return {'repetidos': repetidos, 'reapariciones': reapariciones, 'base': base}
+
+
+def transiciones_payload(matriz, juego, lag_maximo=LAG_MAXIMO):
+    """
+    Formato serializable para el payload de estadísticas:
+
+    - 'repetidos': por distancia k, promedio de números del sorteo t que
+      vuelven a salir en t + k y cuántas veces se repitieron 0, 1, 2...
+    - 'reaparicion': por número, la proporción de veces que, habiendo salido,
+      volvió a salir en el sorteo siguiente (misma modalidad)
+    - 'esperado': promedio de repetidos y tasa de reaparición con sorteos
+      independientes (picks² / rango y picks / rango)
+    """
+    info = validar_juego(juego)
+    datos = calcular_transiciones(matriz, juego, lag_maximo)
+    rango = info['maximo'] - info['minimo'] + 1
+    numeros = range(info['minimo'], info['maximo'] + 1)
+
+    return {
+        'repetidos': {
+            k: {
+                'promedio': round(float(r.mean()), 4),
+                'distribucion': {int(v): int(c) for v, c in enumerate(np.bincount(r.ravel())) if c}
+            }
+            for k, r in datos['repetidos'].items()
+        },
+        'reaparicion': {
+            n: round(float(datos['reapariciones'][n] / datos['base'][n]), 4) if datos['base'][n] else None
+            for n in numeros
+        },
+        'esperado': {
+            'repetidos': round(info['picks'] ** 2 / rango, 4),
+            'reaparicion': round(info['picks'] / rango, 4)
+        }
+    }
+
+
+def imprimir_transiciones(transiciones, top=5):
+    """Imprime los repetidos entre sorteos y los números que más (y menos) reaparecen."""
+    esperado = transiciones['esperado']
+    print(f"\n=== REPETIDOS ENTRE SORTEOS (esperado {esperado['repetidos']:.2f}) ===")
+    for k, datos in transiciones['repetidos'].items():
+        print(f"t → t+{k}: promedio {datos['promedio']:.2f}")
+
+    tasas = [(int(n), t) for n, t in transiciones['reaparicion'].items() if t is not None]
+    tasas.sort(key=lambda x: (-x[1], x[0]))
+    print(f"\n=== REAPARICIÓN EN EL SORTEO SIGUIENTE (esperado {esperado['reaparicion'] * 100:.1f}%) ===")
+    print("Más: " + ", ".join(f"{n:02d} ({t * 100:.1f}%)" for n, t in tasas[:top]))
+    print("Menos: " + ", ".join(f"{n:02d} ({t * 100:.1f}%)" for n, t in tasas[::-1][:top]))
@@ -0,0 +1,129 @@
+# tombola/ventana_stats.py
+import os
+import numpy as np
+from config import VENTANAS_DIR
+from tombola.backtest import EstadoHistorico
+from tombola.backtest_barrido import cargar_resultado, guardar_resultado
+from tombola.matriz_sorteos import cargar_matriz, matriz_incidencia, validar_juego, version_matriz
+from tombola.series_stats import calcular_series
+from tombola.transiciones import transiciones_payload
+
+# Ventanas cuyo estado se mantiene al guardar cada sorteo (las demás se arman por consulta)
+VENTANAS = (20, 50, 100)
+
+
+def get_ventana_filename(juego, ventana):
+    """Archivo con el estado de la ventana móvil de un juego."""
+    return os.path.join(VENTANAS_DIR, f"{juego}_v{ventana}.pkl")
+
+
+def iterar_ventana(juego, ventana, incidencia, estado=None):
+    """
+    Recorre los sorteos de `incidencia` manteniendo las estadísticas de los
+    últimos `ventana`: cada paso suma el sorteo nuevo y resta el que sale de la
+    ventana, un costo constante por sorteo que no depende del tamaño de la
+    ventana. Parte de `estado` (o de una ventana vacía) y genera el estado
+    después de cada sorteo.
+    """
+    estado = estado or EstadoHistorico(juego, ventana=ventana)
+    for fila in incidencia:
+        estado.agregar(fila)
+        yield estado
+
+
+def actualizar_ventanas(juego, datos=None, ventanas=VENTANAS):
+    """
+    Avanza el estado persistido de cada ventana de `ventanas` con los sorteos
+    nuevos: O(1) por sorteo agregado. Si el histórico cambió (versión del
+    prefijo) o el estado es de otra versión de EstadoHistorico, la ventana se
+    rearma con sus últimos sorteos. Se llama después de guardar cada sorteo.
+
+    Devuelve {ventana: estado}.
+    """
+    _, matriz = datos if datos is not None else cargar_matriz(juego)
+    incidencia = None
+    estados = {}
+    for ventana in ventanas:
+        archivo = get_ventana_filename(juego, ventana)
+        entrada = cargar_resultado(archivo)
+        if (entrada is not None and entrada['sorteos'] <= len(matriz)
+                and entrada.get('version_estado') == EstadoHistorico.VERSION
+                and entrada['version'] == version_matriz(matriz, entrada['sorteos'])):
+            estado, inicio = entrada['estado'], entrada['sorteos']
+        else:
+            estado, inicio = None, max(0, len(matriz) - ventana)
+
+        if estado is None or inicio < len(matriz):
+            if incidencia is None:
+                incidencia = matriz_incidencia(matriz, juego)
+            for estado in iterar_ventana(juego, ventana, incidencia[inicio:], estado):
+                pass
+            estado = estado or EstadoHistorico(juego, ventana=ventana)
+            guardar_resultado(archivo, {
+                'version': version_matriz(matriz),
+                'sorteos': len(matriz),
+                'estado': estado,
+                'version_estado': EstadoHistorico.VERSION
+            })
+        estados[ventana] = estado
+    return estados
+
+
+def estadisticas_ventana(juego, ventana, fecha_limite=None):
+    """
+    Frecuencia, omisión, co-ocurrencia y demora máxima de los últimos `ventana`
+    sorteos anteriores a fecha_limite, con el mismo formato que las estadísticas
+    completas del juego (Quini 6 cuenta sub-sorteos, 4 por sorteo).
+
+    Sin fecha_limite y con una ventana de VENTANAS, frecuencia, omisión y
+    co-ocurrencia salen del estado persistido (que se avanza al guardar cada
+    sorteo); si no, se arma la ventana recorriendo sus `ventana` sorteos. La
+    demora máxima, las transiciones y las porciones por modalidad se calculan
+    vectorizadas sobre las filas de la ventana.
+    """
+    info = validar_juego(juego)
+    if ventana < 1:
+        raise ValueError("La ventana debe ser de al menos 1 sorteo")
+
+    sorteos, matriz = cargar_matriz(juego, fecha_limite)
+
+    estado = None
+    if fecha_limite is None and ventana in VENTANAS:
+        estado = actualizar_ventanas(juego, (sorteos, matriz), (ventana,))[ventana]
+    else:
+        for estado in iterar_ventana(juego, ventana, matriz_incidencia(matriz[-ventana:], juego)):
+            pass
+
+    en_ventana = min(ventana, len(sorteos))
+    subsorteos = en_ventana * len(info['modalidades'])
+    numeros = range(info['minimo'], info['maximo'] + 1)
+
+    frecuencias = np.zeros(info['maximo'] + 1, dtype=np.int64)
+    coocurrencia = np.zeros((info['maximo'] + 1,) * 2, dtype=np.int64)
+    omision = np.full(info['maximo'] + 1, subsorteos, dtype=np.int64)
+    demora = np.zeros(info['maximo'] + 1, dtype=np.int64)
+    if en_ventana:
+        frecuencias = np.rint(estado.frecuencias).astype(np.int64)
+        coocurrencia = np.rint(estado.coocurrencia).astype(np.int64)
+        # Un número que no salió en la ventana tiene omisión = largo de la ventana
+        omision = np.minimum(estado.omision(), subsorteos)
+        demora = calcular_series(matriz[-en_ventana:], juego)['demora_maxima'][-1]
+
+    pares = [(a, b) for a in numeros for b in numeros if a < b and coocurrencia[a, b] > 0]
+    pares.sort(key=lambda p: -coocurrencia[p])
+    orden = sorted((n for n in numeros if frecuencias[n] > 0), key=lambda n: -frecuencias[n])
+
+    stats_data = {
+        'ventana': ventana,
+        'sorteos_count': en_ventana,
+        'frecuencias': {n: int(frecuencias[n]) for n in orden},
+        'omision': {n: int(omision[n]) for n in numeros},
+        'coocurrencia': {f"{a}-{b}": int(coocurrencia[a, b]) for a, b in pares},
+        'demora_maxima': {n: int(demora[n]) for n in numeros},
+        'transiciones': transiciones_payload(matriz[len(matriz) - en_ventana:], juego)
+    }
+    if juego == 'quini6':
+        from tombola.quini6_modalidades import estadisticas_modalidades
+        stats_data['subsorteos_count'] = subsorteos
+        stats_data.update(estadisticas_modalidades(matriz[len(matriz) - en_ventana:]))
+    return stats_data